@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami odczytu okładek zapisanych w plikach audio (ID3v2 APIC/PIC, blok PICTURE FLAC)
+i skalowania obrazków w procesie (Pillow, opcjonalnie)
+"""
+import io
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class ArtworkUtils:
+    """Klasa z funkcjami odczytu i skalowania okładek"""
+
+    ID3_HEADER = struct.Struct('>3sBBB4s')
+    FLAC_BLOCK_PICTURE = 6
+    # Typ obrazka ID3/FLAC: 3 = przednia okładka
+    FRONT_COVER = 3
+
+    @staticmethod
+    def has_pillow() -> bool:
+        """Czy Pillow jest dostępny (skalowanie w procesie zamiast ffmpeg)"""
+        return Image is not None
+
+    @staticmethod
+    def _syncsafe(data: bytes) -> int:
+        """Odczytaj liczbę syncsafe ID3v2 (7 bitów na bajt)"""
+        value = 0
+        for byte in data:
+            value = value << 7 | (byte & 0x7F)
+        return value
+
+    @staticmethod
+    def _skip_text(data: bytes, offset: int, encoding: int) -> int:
+        """Zwraca przesunięcie za tekstem zakończonym zerem (dwa bajty zerowe dla UTF-16)"""
+        if encoding in (1, 2):
+            while offset + 1 < len(data):
+                if data[offset] == 0 and data[offset + 1] == 0:
+                    return offset + 2
+                offset += 2
+            return len(data)
+        end = data.find(b'\0', offset)
+        return len(data) if end < 0 else end + 1
+
+    @staticmethod
+    def _parse_id3_picture(frame_id: bytes, body: bytes) -> Optional[Tuple[int, bytes]]:
+        """Sparsuj ramkę APIC (ID3v2.3/2.4) lub PIC (ID3v2.2); zwraca (typ obrazka, dane obrazka)"""
+        if len(body) < 5:
+            return None
+        encoding = body[0]
+        if frame_id == b'PIC':
+            # Kodowanie, format obrazka (3 znaki), typ obrazka, opis
+            picture_type, offset = body[4], 5
+        else:
+            # Kodowanie, typ MIME zakończony zerem, typ obrazka, opis
+            offset = body.find(b'\0', 1)
+            if offset < 0 or offset + 1 >= len(body):
+                return None
+            picture_type, offset = body[offset + 1], offset + 2
+        offset = ArtworkUtils._skip_text(body, offset, encoding)
+        data = body[offset:]
+        return (picture_type, data) if data else None
+
+    @staticmethod
+    def read_id3_pictures(f) -> List[Tuple[int, bytes]]:
+        """Odczytaj obrazki ze znacznika ID3v2 na początku pliku; zwraca listę (typ obrazka, dane obrazka)"""
+        f.seek(0)
+        header = f.read(ArtworkUtils.ID3_HEADER.size)
+        if len(header) < ArtworkUtils.ID3_HEADER.size:
+            return []
+        magic, version, revision, flags, size = ArtworkUtils.ID3_HEADER.unpack(header)
+        if magic != b'ID3' or version not in (2, 3, 4):
+            return []
+        tag = f.read(ArtworkUtils._syncsafe(size))
+        if flags & 0x80 and version < 4:
+            # Unsynchronizacja całego znacznika (ID3v2.2/2.3)
+            tag = tag.replace(b'\xff\x00', b'\xff')
+
+        offset = 0
+        if flags & 0x40 and version == 3 and len(tag) >= 4:
+            offset = 4 + struct.unpack('>I', tag[:4])[0]
+        elif flags & 0x40 and version == 4 and len(tag) >= 4:
+            offset = ArtworkUtils._syncsafe(tag[:4])
+
+        pictures = []
+        id_size, header_size = (3, 6) if version == 2 else (4, 10)
+        while offset + header_size <= len(tag):
+            frame_id = tag[offset:offset + id_size]
+            if not frame_id.strip(b'\0'):
+                # Wypełnienie zerami za ostatnią ramką
+                break
+            if version == 2:
+                frame_size, frame_flags = int.from_bytes(tag[offset + 3:offset + 6], 'big'), 0
+            elif version == 3:
+                frame_size, frame_flags = struct.unpack('>IH', tag[offset + 4:offset + 10])
+            else:
+                frame_size = ArtworkUtils._syncsafe(tag[offset + 4:offset + 8])
+                frame_flags = struct.unpack('>H', tag[offset + 8:offset + 10])[0]
+            body = tag[offset + header_size:offset + header_size + frame_size]
+            offset += header_size + frame_size
+            if frame_id not in (b'APIC', b'PIC'):
+                continue
+
+            if version == 3:
+                compressed, encrypted = frame_flags & 0x0080, frame_flags & 0x0040
+                if encrypted:
+                    continue
+                if frame_flags & 0x0020:
+                    body = body[1:]
+                if compressed:
+                    body = body[4:]
+            elif version == 4:
+                compressed, encrypted = frame_flags & 0x0008, frame_flags & 0x0004
+                if encrypted:
+                    continue
+                if frame_flags & 0x0040:
+                    body = body[1:]
+                if frame_flags & 0x0001:
+                    body = body[4:]
+                if frame_flags & 0x0002:
+                    body = body.replace(b'\xff\x00', b'\xff')
+            else:
+                compressed = False
+            if compressed:
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    continue
+
+            picture = ArtworkUtils._parse_id3_picture(frame_id, body)
+            if picture:
+                pictures.append(picture)
+        return pictures
+
+    @staticmethod
+    def read_flac_pictures(f) -> List[Tuple[int, bytes]]:
+        """Odczytaj bloki PICTURE z metadanych pliku FLAC; zwraca listę (typ obrazka, dane obrazka)"""
+        f.seek(0)
+        head = f.read(10)
+        start = 0
+        if head[:3] == b'ID3' and len(head) == 10:
+            start = 10 + ArtworkUtils._syncsafe(head[6:10]) + (10 if head[5] & 0x10 else 0)
+        f.seek(start)
+        if f.read(4) != b'fLaC':
+            return []
+
+        pictures = []
+        while True:
+            block_header = f.read(4)
+            if len(block_header) < 4:
+                break
+            is_last, block_type = block_header[0] & 0x80, block_header[0] & 0x7F
+            block_size = int.from_bytes(block_header[1:], 'big')
+            if block_type != ArtworkUtils.FLAC_BLOCK_PICTURE:
+                f.seek(block_size, io.SEEK_CUR)
+            else:
+                block = f.read(block_size)
+                try:
+                    picture_type, mime_size = struct.unpack_from('>II', block, 0)
+                    offset = 8 + mime_size
+                    description_size = struct.unpack_from('>I', block, offset)[0]
+                    # Opis, szerokość, wysokość, głębia kolorów, liczba kolorów palety
+                    offset += 4 + description_size + 16
+                    data_size = struct.unpack_from('>I', block, offset)[0]
+                    data = block[offset + 4:offset + 4 + data_size]
+                except struct.error:
+                    data = b''
+                if data:
+                    pictures.append((picture_type, data))
+            if is_last:
+                break
+        return pictures
+
+    @staticmethod
+    def read_embedded_picture(file_path: str) -> Optional[bytes]:
+        """
+        Odczytaj okładkę zapisaną w pliku audio bez ffmpeg (ID3v2 w MP3/AAC/FLAC, blok PICTURE w FLAC).
+        Zwraca dane obrazka (przednia okładka, jeśli jest) albo None.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                pictures = ArtworkUtils.read_id3_pictures(f) or ArtworkUtils.read_flac_pictures(f)
+        except OSError:
+            return None
+        if not pictures:
+            return None
+        for picture_type, data in pictures:
+            if picture_type == ArtworkUtils.FRONT_COVER:
+                return data
+        return pictures[0][1]
+
+    @staticmethod
+    def resize_image(data: bytes, size: int) -> Optional[bytes]:
+        """Przeskaluj obrazek do size x size (filtr Lanczos) i zwróć go jako PNG; None, gdy Pillow nie jest dostępny"""
+        if Image is None:
+            return None
+        with Image.open(io.BytesIO(data)) as image:
+            # Dekodowanie JPEG w zmniejszonej rozdzielczości (draft) przed dokładnym skalowaniem
+            image.draft('RGB', (size * 2, size * 2))
+            image = image.convert('RGBA')
+            resampling = getattr(Image, 'Resampling', Image).LANCZOS
+            output = io.BytesIO()
+            image.resize((size, size), resampling).save(output, format='PNG', optimize=True)
+        return output.getvalue()
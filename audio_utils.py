@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Biblioteka z funkcjami odczytu nagłówków plików audio (bez dekodowania i bez ffmpeg)
+"""
+import hashlib
+import os
+import struct
+import zlib
+from typing import Any, Dict, Optional
+
+
+# Odwrócenie kolejności bitów w bajcie - CRC strumienia Ogg nie odwraca bitów, w przeciwieństwie do zlib.crc32
+_BIT_REVERSE_TABLE = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+
+class AudioUtils:
+    """Klasa z funkcjami odczytu metadanych strumieni audio"""
+
+    OGG_CAPTURE_PATTERN = b'OggS'
+    OGG_PAGE_HEADER = struct.Struct('<4sBBqIIIB')
+    OGG_MAX_PAGE_SIZE = 27 + 255 + 255 * 255
+    OGG_TAIL_READ_SIZE = 8192
+    VORBIS_ID_HEADER = struct.Struct('<7sIBIiiiBB')
+    FORMAT_HEAD_READ_SIZE = 4096
+
+    @staticmethod
+    def _ogg_crc(data: bytes) -> int:
+        """
+        Policz sumę kontrolną strony Ogg (pole CRC musi być wyzerowane).
+        CRC-32 Ogg (0x04C11DB7, bez odwracania bitów, start 0) liczone przez zlib na odwróconych bitach.
+        """
+        raw = zlib.crc32(bytes(data).translate(_BIT_REVERSE_TABLE), 0xFFFFFFFF) ^ 0xFFFFFFFF
+        return int(f'{raw:032b}'[::-1], 2)
+
+    @staticmethod
+    def _parse_ogg_page(data: bytes, offset: int = 0, verify_crc: bool = True) -> Optional[Dict[str, Any]]:
+        """Sparsuj stronę Ogg zaczynającą się od `offset` lub zwróć None, jeśli jest niekompletna/uszkodzona"""
+        header_size = AudioUtils.OGG_PAGE_HEADER.size
+        if len(data) < offset + header_size:
+            return None
+        capture, version, header_type, granule, serial, sequence, crc, segments = \
+            AudioUtils.OGG_PAGE_HEADER.unpack_from(data, offset)
+        if capture != AudioUtils.OGG_CAPTURE_PATTERN or version != 0:
+            return None
+        body_offset = offset + header_size + segments
+        if len(data) < body_offset:
+            return None
+        body_size = sum(data[offset + header_size:body_offset])
+        end = body_offset + body_size
+        if len(data) < end:
+            return None
+        if verify_crc:
+            page = bytearray(data[offset:end])
+            page[22:26] = b'\0\0\0\0'
+            if AudioUtils._ogg_crc(page) != crc:
+                return None
+        return {
+            'header_type': header_type,
+            'granule': granule,
+            'serial': serial,
+            'sequence': sequence,
+            'body_offset': body_offset,
+            'end': end,
+        }
+
+    @staticmethod
+    def _find_last_ogg_page(f, file_size: int, serial: int) -> Optional[Dict[str, Any]]:
+        """Znajdź ostatnią poprawną stronę strumienia o danym numerze seryjnym, czytając tylko koniec pliku"""
+        for read_size in (AudioUtils.OGG_TAIL_READ_SIZE, AudioUtils.OGG_MAX_PAGE_SIZE * 2):
+            start = max(0, file_size - read_size)
+            f.seek(start)
+            tail = f.read(read_size)
+            position = len(tail)
+            while True:
+                position = tail.rfind(AudioUtils.OGG_CAPTURE_PATTERN, 0, position)
+                if position < 0:
+                    break
+                page = AudioUtils._parse_ogg_page(tail, position)
+                if page and page['serial'] == serial and page['granule'] >= 0:
+                    return page
+            if start == 0:
+                break
+        return None
+
+    @staticmethod
+    def read_ogg_vorbis_info(file_path: str) -> Dict[str, Any]:
+        """
+        Odczytaj parametry strumienia Ogg/Vorbis z nagłówka identyfikacyjnego i pozycji granule ostatniej strony.
+        Zwraca słownik z `samples`, `duration`, `sample_rate`, `channels`, `bitrate`, `nominal_bitrate`, `size`
+        albo z kluczem `error`.
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                head = f.read(4096)
+                first_page = AudioUtils._parse_ogg_page(head)
+                if not first_page:
+                    return {'error': "invalid or corrupt first Ogg page", 'size': file_size}
+                if not first_page['header_type'] & 0x02:
+                    return {'error': "first Ogg page is not a beginning of stream", 'size': file_size}
+
+                identification = head[first_page['body_offset']:first_page['end']]
+                if len(identification) < AudioUtils.VORBIS_ID_HEADER.size:
+                    return {'error': "missing Vorbis identification header", 'size': file_size}
+                packet_type, version, channels, sample_rate, bitrate_max, bitrate_nominal, bitrate_min, blocksizes, \
+                    framing = AudioUtils.VORBIS_ID_HEADER.unpack_from(identification)
+                if packet_type != b'\x01vorbis':
+                    return {'error': "stream is not Vorbis", 'size': file_size}
+                if version != 0 or not channels or not sample_rate or not framing & 0x01:
+                    return {'error': "invalid Vorbis identification header", 'size': file_size}
+
+                last_page = AudioUtils._find_last_ogg_page(f, file_size, first_page['serial'])
+        except OSError as e:
+            return {'error': f"cannot read file: {e}"}
+
+        if not last_page:
+            return {'error': "cannot find last Ogg page (truncated file?)", 'size': file_size}
+
+        samples = last_page['granule']
+        duration = samples / sample_rate
+        return {
+            'samples': samples,
+            'duration': duration,
+            'sample_rate': sample_rate,
+            'channels': channels,
+            'bitrate': int(file_size * 8 / duration) if duration else 0,
+            'nominal_bitrate': bitrate_nominal if bitrate_nominal > 0 else None,
+            'size': file_size,
+            'complete': bool(last_page['header_type'] & 0x04),
+        }
+
+    @staticmethod
+    def _skip_id3v2(head: bytes) -> int:
+        """Zwraca przesunięcie danych audio za znacznikiem ID3v2 (rozmiar zapisany jako syncsafe integer)"""
+        if len(head) < 10 or head[:3] != b'ID3':
+            return 0
+        size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+        offset = 10 + size + (10 if head[5] & 0x10 else 0)
+        # Część enkoderów dopisuje za znacznikiem wypełnienie zerami
+        while offset < len(head) and head[offset] == 0:
+            offset += 1
+        return offset
+
+    @staticmethod
+    def detect_audio_format(file_path: str) -> Optional[str]:
+        """
+        Rozpoznaj format pliku audio na podstawie nagłówka (nie rozszerzenia).
+        Zwraca `mp3`, `aac`, `m4a`, `flac`, `wav`, `vorbis`, `opus` albo None dla nieznanego formatu.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(AudioUtils.FORMAT_HEAD_READ_SIZE)
+                offset = AudioUtils._skip_id3v2(head)
+                if offset + 16 > len(head):
+                    # Duży znacznik ID3 (np. z okładką) - doczytaj nagłówek za nim
+                    f.seek(offset)
+                    head, offset = f.read(AudioUtils.FORMAT_HEAD_READ_SIZE).lstrip(b'\0'), 0
+        except OSError:
+            return None
+
+        if head[offset:offset + 4] == b'fLaC':
+            return 'flac'
+        if head[offset:offset + 4] == b'RIFF' and head[offset + 8:offset + 12] == b'WAVE':
+            return 'wav'
+        if head[offset + 4:offset + 8] == b'ftyp':
+            return 'm4a'
+        if head[offset:offset + 4] == AudioUtils.OGG_CAPTURE_PATTERN:
+            page = AudioUtils._parse_ogg_page(head, offset, verify_crc=False)
+            if not page:
+                return None
+            packet = head[page['body_offset']:page['end']]
+            if packet.startswith(b'\x01vorbis'):
+                return 'vorbis'
+            if packet.startswith(b'OpusHead'):
+                return 'opus'
+            if packet.startswith(b'\x7fFLAC'):
+                return 'flac'
+            return None
+        if len(head) >= offset + 2 and head[offset] == 0xFF and head[offset + 1] & 0xE0 == 0xE0:
+            # Synchronizacja ramki MPEG; warstwa 00 oznacza strumień AAC w kontenerze ADTS
+            return 'aac' if (head[offset + 1] >> 1) & 0x03 == 0 else 'mp3'
+        return None
+
+    @staticmethod
+    def audio_content_hash(file_path: str) -> str:
+        """
+        Policz sumę kontrolną samego dźwięku, niezależną od znaczników (tytuł, okładka):
+        dla FLAC podpis MD5 zdekodowanych próbek z bloku STREAMINFO, dla pozostałych plików MD5 danych
+        bez znacznika ID3v2 na początku i ID3v1 na końcu pliku.
+        """
+        file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            head = f.read(AudioUtils.FORMAT_HEAD_READ_SIZE)
+            start = AudioUtils._skip_id3v2(head)
+            f.seek(start)
+            flac_head = f.read(4 + 4 + 34)
+            # STREAMINFO jest zawsze pierwszym blokiem metadanych FLAC; zerowy podpis oznacza brak MD5
+            if len(flac_head) == 42 and flac_head[:4] == b'fLaC' and flac_head[4] & 0x7F == 0:
+                signature = flac_head[8 + 18:8 + 34]
+                if any(signature):
+                    return f"flac:{signature.hex()}"
+            end = file_size
+            if file_size - start >= 128:
+                f.seek(file_size - 128)
+                if f.read(3) == b'TAG':
+                    end -= 128
+            f.seek(start)
+            hash_md5 = hashlib.md5()
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(1048576, remaining))
+                if not chunk:
+                    break
+                hash_md5.update(chunk)
+                remaining -= len(chunk)
+        return hash_md5.hexdigest()
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """Sformatuj czas trwania jako m:ss"""
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        return f"{minutes}:{seconds:02d}"
+
+    @staticmethod
+    def duration_to_ticks(samples: int, sample_rate: int, ticks_per_second: int = 20) -> int:
+        """Przelicz liczbę próbek na ticki gry (20 ticków na sekundę)"""
+        return samples * ticks_per_second // sample_rate
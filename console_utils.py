@@ -3,8 +3,13 @@
 Biblioteka z funkcjami stylizacji konsoli dla skryptów
 """
 
+import heapq
+import itertools
+import re
 import sys
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Callable, Collection, Optional, Iterable, List
+
+ANSI_ESCAPE_PATTERN = re.compile(r"\033\[[0-9;]*m")
 
 
 def print_if_not_quiet(text):
@@ -13,6 +18,33 @@ def print_if_not_quiet(text):
         print(text)
 
 
+class Stat:
+    """Deferred statistics entry - label is styled and value formatted only when displayed"""
+
+    __slots__ = ('label', 'value', 'level', 'padding', 'icon')
+
+    def __init__(self, label: str, value: Any, level: str = "info", padding: int = 0, icon: Optional[str] = None):
+        self.label = label
+        self.value = value
+        self.level = level
+        self.padding = padding
+        self.icon = icon
+
+    def resolve(self) -> Any:
+        """Return the value, calling it first if it was given as a thunk"""
+        return self.value() if callable(self.value) else self.value
+
+    def render_label(self) -> Union[str, None]:
+        """Style the label with the console method matching its level"""
+        style = getattr(ConsoleStyle, self.level)
+        if self.icon is None:
+            return style(self.label, self.padding)
+        return style(self.label, self.padding, icon=self.icon)
+
+
+StatsTable = Union[Dict[str, Any], List[Stat]]
+
+
 class ConsoleStyle:
     """Class for console message styling"""
 
@@ -49,11 +81,52 @@ class ConsoleStyle:
     # Tryb cichy
     QUIET_MODE = False
 
+    # Odbiorca statystyk (np. raport JSON/JUnit), wywoływany również w trybie cichym
+    STATS_LISTENER: Optional[Callable[[str, StatsTable], None]] = None
+
+    # Maksymalna liczba elementów listy wypisywanych w statystykach
+    MAX_LIST_ITEMS = 50
+
     @staticmethod
     def set_quiet_mode(enabled: bool = True):
         """Set quiet mode"""
         ConsoleStyle.QUIET_MODE = enabled
 
+    @staticmethod
+    def set_stats_listener(listener: Optional[Callable[[str, StatsTable], None]]):
+        """Set a callback receiving every statistics table passed to print_stats"""
+        ConsoleStyle.STATS_LISTENER = listener
+
+    @staticmethod
+    def plain(text: Any) -> Any:
+        """Strip ANSI codes and highlight brackets from text (non-string values are returned as-is)"""
+        if not isinstance(text, str):
+            return text
+        return ANSI_ESCAPE_PATTERN.sub("", text).replace("[", "").replace("]", "")
+
+    @staticmethod
+    def format_list(items: Iterable[Any], limit: Optional[int] = MAX_LIST_ITEMS, sort: bool = True) -> str:
+        """Join items with commas, keeping only the first `limit` (smallest when sorted) and counting the rest; None shows all"""
+        items = list(items) if not isinstance(items, (list, tuple, set, frozenset, dict)) else items
+        if limit is None:
+            return ', '.join(str(item) for item in (sorted(items) if sort else items))
+        shown = heapq.nsmallest(limit, items) if sort else list(itertools.islice(items, limit))
+        text = ', '.join(str(item) for item in shown)
+        if len(items) > limit:
+            text += f", … (+{len(items) - limit} more)"
+        return text
+
+    @staticmethod
+    def format_count(items: Collection[Any], details: bool = True, parentheses: bool = True,
+                     limit: Optional[int] = MAX_LIST_ITEMS, sort: bool = True) -> str:
+        """Format `[count] (item, item, …)` for a collection, or `0` if it is empty"""
+        if not items:
+            return "0"
+        if not details:
+            return f"[{len(items)}]"
+        listing = ConsoleStyle.format_list(items, limit, sort)
+        return f"[{len(items)}] ({listing})" if parentheses else f"[{len(items)}] {listing}"
+
     @staticmethod
     def _colorize(color: str, text: str, padding: int = 0, icon: str = "", prefix: str = "", suffix: str = "") -> Union[
         str, None]:
@@ -127,15 +200,22 @@ class ConsoleStyle:
         return char * length
 
     @staticmethod
-    def print_stats(stats_dict: Dict[str, Any], title: str = "Statistics", divider_sign: str = "=", icon: str = "📊"):
-        """Display statistics in a nice table"""
+    def print_stats(stats_dict: StatsTable, title: str = "Statistics", divider_sign: str = "=", icon: str = "📊"):
+        """Display statistics in a nice table (a list of `Stat` entries is rendered lazily)"""
+        if ConsoleStyle.STATS_LISTENER and stats_dict:
+            ConsoleStyle.STATS_LISTENER(title, stats_dict)
         if ConsoleStyle.QUIET_MODE or not stats_dict:
             return
 
+        if isinstance(stats_dict, dict):
+            rows = list(stats_dict.items())
+        else:
+            rows = [(stat.render_label(), stat.resolve()) for stat in stats_dict]
+
         ConsoleStyle.print_section(title, divider_sign, icon=icon)
-        max_key_length = max(len(str(key)) for key in stats_dict.keys()) + 2
+        max_key_length = max(len(str(key)) for key, value in rows) + 2
 
-        for key, value in stats_dict.items():
+        for key, value in rows:
             key_padded = str(key).ljust(max_key_length)
             if type(value) == str:
                 value = value.replace("[", ConsoleStyle.COLOR_CYAN_HIGHLIGHT).replace("]", ConsoleStyle.COLOR_CYAN)
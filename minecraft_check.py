@@ -2,12 +2,37 @@
 """
 Biblioteka z funkcjami weryfikacji strukturę paczki Minecraft
 """
+import contextlib
+import functools
+import glob
 import json
+import mmap
 import os
+import re
+import struct
 import sys
-from typing import Any, Dict, List, Callable, Tuple
+import time
+import xml.etree.ElementTree as ElementTree
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Callable, Tuple, Optional, Iterator, FrozenSet
 
-from console_utils import ConsoleStyle, print_if_not_quiet
+from audio_utils import AudioUtils
+from console_utils import ConsoleStyle, Stat, StatsTable, print_if_not_quiet
+
+
+class VerificationAborted(Exception):
+    """Weryfikacja przerwana po pierwszym błędzie (tryb --fail-fast)"""
+
+
+def verification_step(func):
+    """Dekorator mierzący czas i zapisujący wynik podweryfikacji w raporcie"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return MinecraftUtils._run_step(func, *args, **kwargs)
+
+    return wrapper
 
 
 class MinecraftUtils:
@@ -16,8 +41,27 @@ class MinecraftUtils:
     namespace = None
     DATABASE_FILE_NAME = 'database.json'
 
+    # Formaty raportu weryfikacji
+    OUTPUT_FORMATS = ('text', 'json', 'junit')
+    FAIL_FAST = False
+    _report_stack: List[Dict[str, Any]] = []
+
     # Lista wbudowanych tekstur Minecraft Bedrock Edition
     BUILTIN_TEXTURES_FILE = 'minecraft_textures.json'
+
+    # Indeks nagłówków PNG (sygnatura + chunk IHDR), buforowany według mtime
+    TEXTURE_INDEX_CACHE_FILE = '.texture_index.json'
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+    PNG_HEADER_SIZE = 33
+    MAX_TEXTURE_SIZE = 1024
+    DISC_ICON_SIZE = (32, 32)
+
+    # Dźwięki płyt i ich metadane w skryptach
+    SOUNDS_DIR = 'RP/sounds/items'
+    SOUND_DEFINITIONS_FILE = 'RP/sounds/sound_definitions.json'
+    MUSIC_DISCS_FILE = 'BP/scripts/musicDisc/musicDiscs.js'
+    TICKS_PER_SECOND = 20
+    TICK_LENGTH_TOLERANCE = 20
     
     @staticmethod
     def _load_builtin_textures():
@@ -27,10 +71,10 @@ class MinecraftUtils:
             if data and 'builtin_textures' in data:
                 return set(data['builtin_textures'])
             else:
-                print(ConsoleStyle.warning(f"Invalid file structure [{MinecraftUtils.BUILTIN_TEXTURES_FILE}]"))
+                print_if_not_quiet(ConsoleStyle.warning(f"Invalid file structure [{MinecraftUtils.BUILTIN_TEXTURES_FILE}]"))
                 return set()
         except Exception as e:
-            print(ConsoleStyle.error(f"Error loading [{MinecraftUtils.BUILTIN_TEXTURES_FILE}]: {e}"))
+            print_if_not_quiet(ConsoleStyle.error(f"Error loading [{MinecraftUtils.BUILTIN_TEXTURES_FILE}]: {e}"))
             return set()
     
     @staticmethod
@@ -184,6 +228,120 @@ class MinecraftUtils:
 
         return all_png_files
 
+    @staticmethod
+    def _read_png_header(file_path: str) -> Dict[str, Any]:
+        """Odczytaj sygnaturę i chunk IHDR pliku PNG (33 bajty, bez dekodowania obrazu)"""
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    header = data[:MinecraftUtils.PNG_HEADER_SIZE]
+        except (OSError, ValueError) as e:
+            # mmap nie obsługuje pustych plików (ValueError)
+            return {'error': f"cannot read header: {e}"}
+
+        if len(header) < MinecraftUtils.PNG_HEADER_SIZE:
+            return {'error': f"truncated header ({len(header)} bytes)"}
+        if header[:8] != MinecraftUtils.PNG_SIGNATURE:
+            return {'error': "invalid PNG signature"}
+
+        length, chunk_type, width, height, bit_depth, color_type = struct.unpack('>I4sIIBB', header[8:26])
+        crc, = struct.unpack('>I', header[29:33])
+        if chunk_type != b'IHDR' or length != 13:
+            return {'error': "first chunk is not IHDR"}
+        if zlib.crc32(header[12:29]) != crc:
+            return {'error': "IHDR checksum mismatch"}
+        if width == 0 or height == 0:
+            return {'error': f"invalid dimensions {width}x{height}"}
+
+        return {'width': width, 'height': height, 'bit_depth': bit_depth, 'color_type': color_type}
+
+    @staticmethod
+    def _get_texture_index() -> Dict[str, Dict[str, Any]]:
+        """Zbuduj indeks nagłówków wszystkich PNG w RP/textures/ (równolegle, z buforem według mtime)"""
+        if hasattr(MinecraftUtils, '_texture_index_cache'):
+            return MinecraftUtils._texture_index_cache
+
+        try:
+            cache = MinecraftUtils.load_json_file(MinecraftUtils.TEXTURE_INDEX_CACHE_FILE)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cache = {}
+
+        index = {}
+        to_read = []
+        for root, dirs, files in os.walk("RP/textures/"):
+            for file in files:
+                if not file.endswith('.png'):
+                    continue
+                file_path = os.path.join(root, file)
+                texture_path = file_path.replace('RP/', '')
+                file_stat = os.stat(file_path)
+                cached = cache.get(texture_path)
+                if cached and cached.get('mtime') == file_stat.st_mtime_ns and cached.get('size') == file_stat.st_size:
+                    index[texture_path] = cached
+                else:
+                    index[texture_path] = {'mtime': file_stat.st_mtime_ns, 'size': file_stat.st_size}
+                    to_read.append((texture_path, file_path))
+
+        if to_read:
+            with ThreadPoolExecutor() as executor:
+                headers = executor.map(lambda item: MinecraftUtils._read_png_header(item[1]), to_read)
+                for (texture_path, file_path), header in zip(to_read, headers):
+                    index[texture_path].update(header)
+
+        if to_read or len(index) != len(cache):
+            try:
+                with open(MinecraftUtils.TEXTURE_INDEX_CACHE_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(index, f, indent=2, sort_keys=True)
+            except OSError as e:
+                print_if_not_quiet(ConsoleStyle.warning(f"Cannot save [{MinecraftUtils.TEXTURE_INDEX_CACHE_FILE}]: {e}"))
+
+        MinecraftUtils._texture_index_cache = index
+        MinecraftUtils._texture_index_reads = len(to_read)
+        return index
+
+    @staticmethod
+    def _get_sound_index() -> Dict[str, Dict[str, Any]]:
+        """Odczytaj nagłówki Ogg/Vorbis wszystkich plików w RP/sounds/items/ (równolegle)"""
+        if not os.path.isdir(MinecraftUtils.SOUNDS_DIR):
+            return {}
+        sound_files = sorted(file for file in os.listdir(MinecraftUtils.SOUNDS_DIR) if file.endswith('.ogg'))
+        paths = [os.path.join(MinecraftUtils.SOUNDS_DIR, file) for file in sound_files]
+        with ThreadPoolExecutor() as executor:
+            infos = executor.map(AudioUtils.read_ogg_vorbis_info, paths)
+            return {
+                f"sounds/items/{file[:-len('.ogg')]}": info for file, info in zip(sound_files, infos)
+            }
+
+    @staticmethod
+    def _get_music_disc_tick_lengths() -> Dict[str, int]:
+        """Pobierz tickLength dla każdego identyfikatora dźwięku z musicDiscs.js"""
+        try:
+            with open(MinecraftUtils.MUSIC_DISCS_FILE, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return {}
+        # Układ kolumnowy: `const discIdColumn = [...]` i `const tickLengthColumn = [...]` (literały JSON)
+        columns = {name: json.loads(values) for name, values in
+                   re.findall(r'^const (discId|tickLength)Column = (\[.*\]);$', content, re.MULTILINE)}
+        if 'discId' in columns and 'tickLength' not in columns:
+            # Katalog w modułach: `export const shard = "..."` (tekst JSON z kolumnami kolejnych płyt)
+            shard_files = glob.glob(os.path.join(os.path.dirname(MinecraftUtils.MUSIC_DISCS_FILE), 'musicDiscShard_*.js'))
+            columns['tickLength'] = []
+            for shard_file in sorted(shard_files, key=lambda file: int(re.sub(r'\D', '', os.path.basename(file)))):
+                with open(shard_file, 'r', encoding='utf-8') as f:
+                    shard = re.search(r'^export const shard = (".*");$', f.read(), re.MULTILINE)
+                if shard:
+                    columns['tickLength'].extend(json.loads(json.loads(shard.group(1)))['tickLength'])
+        if len(columns) == 2:
+            return {
+                f"record.{disc_id.split(':music_disc_', 1)[-1]}": int(tick_length)
+                for disc_id, tick_length in zip(columns['discId'], columns['tickLength'])
+            }
+        return {
+            sound_id: int(tick_length)
+            for sound_id, tick_length in re.findall(r'id:\s*"([^"]+)",\s*tickLength:\s*(\d+)', content)
+        }
+
     @staticmethod
     def _verify_material_instances(block_data):
         """Wspólna weryfikacja material_instances w bloku"""
@@ -282,6 +440,7 @@ class MinecraftUtils:
     # ===== SPECJALIZOWANE FUNKCJE WERYFIKACJI =====
 
     @staticmethod
+    @verification_step
     def _verify_block_structure_integrity():
         """1. Weryfikacja struktury bloków i modeli"""
         errors = []
@@ -299,20 +458,21 @@ class MinecraftUtils:
             if structure_errors:
                 blocks_with_errors.append(block_id)
 
-        ConsoleStyle.print_stats({
-            ConsoleStyle.info("Blocks loaded"): f"[{len(blocks_loaded)}]",
-            ConsoleStyle.error("Blocks with errors") if blocks_with_errors else ConsoleStyle.info("Blocks with errors"):
-                f"[{len(blocks_with_errors)}] ({', '.join(blocks_with_errors)})" if blocks_with_errors else "0",
-        }, "BLOCK STRUCTURE INTEGRITY", icon='🔳')
+        ConsoleStyle.print_stats([
+            Stat("Blocks loaded", f"[{len(blocks_loaded)}]"),
+            Stat("Blocks with errors", lambda: ConsoleStyle.format_count(blocks_with_errors, sort=False),
+                 "error" if blocks_with_errors else "info"),
+        ], "BLOCK STRUCTURE INTEGRITY", icon='🔳')
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_database_block_coverage(database_block_ids):
         """2. Weryfikacja czy zdefiniowane w bazie bloki istnieją"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         file_blocks_missing = set()
         file_blocks_found = 0
@@ -326,46 +486,49 @@ class MinecraftUtils:
                 else:
                     file_blocks_missing.add(block_id)
 
-        stats[ConsoleStyle.info("Found blocks")] = f"[{file_blocks_found}]"
-        stats[ConsoleStyle.info("Total in database")] = f"[{len(database_block_ids)}]"
-        stats[ConsoleStyle.error("Missing blocks") if file_blocks_missing else ConsoleStyle.info("Missing blocks")] = \
-            f"[{len(file_blocks_missing)}] ({', '.join(sorted(file_blocks_missing))})" if file_blocks_missing else "0"
+        stats.append(Stat("Found blocks", f"[{file_blocks_found}]"))
+        stats.append(Stat("Total in database", f"[{len(database_block_ids)}]"))
+        stats.append(Stat("Missing blocks", lambda: ConsoleStyle.format_count(file_blocks_missing),
+                          "error" if file_blocks_missing else "info"))
         if file_blocks_missing:
             errors.append(
-                f"Missing [{len(file_blocks_missing)}] file blocks: {', '.join(sorted(file_blocks_missing))}")
+                f"Missing [{len(file_blocks_missing)}] file blocks: {ConsoleStyle.format_list(file_blocks_missing, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "DATABASE BLOCK COVERAGE", icon="📄")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_extra_block_files(database_block_ids):
         """3. Weryfikacja czy są bloki niezdefiniowane w bazie"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         file_block_ids = MinecraftUtils._get_bp_blocks().keys()
         file_extra_blocks = file_block_ids - database_block_ids
 
-        stats[ConsoleStyle.info("Total file blocks")] = f"[{len(file_block_ids)}]"
-        stats[ConsoleStyle.info("Total database blocks")] = f"[{len(database_block_ids)}]"
+        stats.append(Stat("Total file blocks", f"[{len(file_block_ids)}]"))
+        stats.append(Stat("Total database blocks", f"[{len(database_block_ids)}]"))
         if database_block_ids:
-            stats[ConsoleStyle.warning("Extra blocks") if file_extra_blocks else ConsoleStyle.info("Extra blocks")] \
-                = f"[{len(file_extra_blocks)}] ({', '.join(sorted(file_extra_blocks))})" if file_extra_blocks else "0"
+            stats.append(Stat("Extra blocks", lambda: ConsoleStyle.format_count(file_extra_blocks),
+                              "warning" if file_extra_blocks else "info"))
             if file_extra_blocks:
-                warnings.append(f"Extra [{len(file_extra_blocks)}] file blocks: {', '.join(sorted(file_extra_blocks))}")
+                warnings.append(
+                    f"Extra [{len(file_extra_blocks)}] file blocks: {ConsoleStyle.format_list(file_extra_blocks, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "EXTRA BLOCK FILES", icon="📁")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_model_existence():
         """4. Weryfikacja czy zdefiniowane w blokach modele istnieją"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         model_dimensions = MinecraftUtils._get_rp_block_model_dimensions()
         missing_models = []
@@ -383,24 +546,25 @@ class MinecraftUtils:
                 if not actual_model_name:
                     missing_models.append(f"{block_id} (model: {model_name})")
 
-        stats[ConsoleStyle.info("Available models")] = f"[{len(model_dimensions)}]"
-        stats[ConsoleStyle.error("Missing models") if missing_models else ConsoleStyle.info("Missing models")] \
-            = f"[{len(missing_models)}] {', '.join(sorted(missing_models))}" if missing_models else "0"
+        stats.append(Stat("Available models", f"[{len(model_dimensions)}]"))
+        stats.append(Stat("Missing models", lambda: ConsoleStyle.format_count(missing_models, parentheses=False),
+                          "error" if missing_models else "info"))
         if missing_models:
             errors.append(f"Missing models: {len(missing_models)}")
-        stats[ConsoleStyle.info(
-            "Model dimensions")] = f"{', '.join([f'{name}({w}x{h})' for name, (w, h) in model_dimensions.items()])}"
+        stats.append(Stat("Model dimensions", lambda: ConsoleStyle.format_list(
+            (f'{name}({w}x{h})' for name, (w, h) in model_dimensions.items()), sort=False)))
 
         ConsoleStyle.print_stats(stats, "MODEL EXISTENCE", icon="🎲")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_model_usage():
         """5. Weryfikacja czy zdefiniowane modele są używane przez bloki"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         model_dimensions = MinecraftUtils._get_rp_block_model_dimensions()
         used_models = set()
@@ -420,48 +584,49 @@ class MinecraftUtils:
             if model_name not in used_models:
                 unused_models.add(model_name)
 
-        stats[ConsoleStyle.info("Total models")] = f"[{len(model_dimensions)}]"
-        stats[ConsoleStyle.info("Used models")] = f"[{len(used_models)}]"
-        stats[ConsoleStyle.warning("Unused models") if unused_models else ConsoleStyle.info("Unused models")] \
-            = f"[{len(unused_models)}] {', '.join(sorted(unused_models))}" if unused_models else "0"
+        stats.append(Stat("Total models", f"[{len(model_dimensions)}]"))
+        stats.append(Stat("Used models", f"[{len(used_models)}]"))
+        stats.append(Stat("Unused models", lambda: ConsoleStyle.format_count(unused_models, parentheses=False),
+                          "warning" if unused_models else "info"))
         if unused_models:
-            warnings.append(f"Unused [{len(unused_models)}] models: {', '.join(sorted(unused_models))}")
+            warnings.append(f"Unused [{len(unused_models)}] models: {ConsoleStyle.format_list(unused_models, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "MODEL USAGE", icon="🎲")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_texture_png_existence():
         """6. Weryfikacja czy zdefiniowane tekstury mają pliki PNG"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         # Użyj wspólnej funkcji do weryfikacji terrain_texture.json
         valid_textures, missing_textures, terrain_texture_mappings, item_texture_mappings = MinecraftUtils._verify_texture_mappings()
 
-        stats[ConsoleStyle.info(
-            "Total defined terrain textures")] = f"[{len(terrain_texture_mappings)}]" if terrain_texture_mappings else "0"
-        stats[ConsoleStyle.info(
-            "Total defined item textures")] = f"[{len(item_texture_mappings)}]" if item_texture_mappings else "0"
-        stats[ConsoleStyle.success("Valid textures")] = f"[{len(valid_textures)}]" if valid_textures else "0"
-        stats[ConsoleStyle.error("Missing PNG files") if missing_textures else ConsoleStyle.info("Missing PNG files")] \
-            = f"[{len(missing_textures)}] ({', '.join([f'{texture_id} -> {texture_name}' for texture_id, texture_name in missing_textures])})" if missing_textures else "0"
+        missing_texture_labels = [f'{texture_id} -> {texture_name}' for texture_id, texture_name in missing_textures]
+        stats.append(Stat("Total defined terrain textures", ConsoleStyle.format_count(terrain_texture_mappings, False)))
+        stats.append(Stat("Total defined item textures", ConsoleStyle.format_count(item_texture_mappings, False)))
+        stats.append(Stat("Valid textures", ConsoleStyle.format_count(valid_textures, False), "success"))
+        stats.append(Stat("Missing PNG files", lambda: ConsoleStyle.format_count(missing_texture_labels, sort=False),
+                          "error" if missing_textures else "info"))
         if missing_textures:
             errors.append(
-                f"Missing [{len(missing_textures)}] PNG files: {', '.join([f'{texture_id} -> {texture_name}' for texture_id, texture_name in missing_textures])}")
+                f"Missing [{len(missing_textures)}] PNG files: {ConsoleStyle.format_list(missing_texture_labels, limit=None, sort=False)}")
 
         ConsoleStyle.print_stats(stats, "TEXTURE PNG EXISTENCE", icon="🎨")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_png_definitions():
         """7. Weryfikacja czy pliki PNG mają definicje"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         all_png_files = MinecraftUtils._verify_png_files()
         valid_textures, missing_textures, terrain_texture_mappings, item_texture_mappings = MinecraftUtils._verify_texture_mappings()
@@ -475,25 +640,84 @@ class MinecraftUtils:
         # Znajdź nadmiarowe pliki PNG
         extra_png_files = all_png_files - texture_paths
 
-        stats[ConsoleStyle.info("Total PNG files")] = f"[{len(all_png_files)}]"
-        stats[ConsoleStyle.success("PNG files with definitions")] = f"[{len(all_png_files - extra_png_files)}]"
-        stats[ConsoleStyle.error("PNG files without definitions") if extra_png_files else ConsoleStyle.info(
-            "PNG files without definitions")] \
-            = f"[{len(extra_png_files)}] {', '.join(sorted(extra_png_files))}" if extra_png_files else "0"
+        stats.append(Stat("Total PNG files", f"[{len(all_png_files)}]"))
+        stats.append(Stat("PNG files with definitions", f"[{len(all_png_files) - len(extra_png_files)}]", "success"))
+        stats.append(Stat("PNG files without definitions",
+                          lambda: ConsoleStyle.format_count(extra_png_files, parentheses=False),
+                          "error" if extra_png_files else "info"))
         if extra_png_files:
             errors.append(
-                f"Missing [{len(extra_png_files)}] definitions for PNG files: {', '.join(sorted(extra_png_files))}")
+                f"Missing [{len(extra_png_files)}] definitions for PNG files: {ConsoleStyle.format_list(extra_png_files, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "PNG DEFINITIONS", icon="🎨")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
+    def _verify_png_headers():
+        """7a. Weryfikacja nagłówków PNG: poprawność, wymiary i ikony płyt"""
+        errors = []
+        warnings = []
+        stats = []
+
+        index = MinecraftUtils._get_texture_index()
+        corrupt = {}
+        non_power_of_two = []
+        oversized = []
+        wrong_icon_size = []
+        texture_memory = 0
+
+        for texture_path, header in index.items():
+            if 'error' in header:
+                corrupt[texture_path] = header['error']
+                continue
+            width, height = header['width'], header['height']
+            texture_memory += width * height * 4
+            if width & (width - 1) or height & (height - 1):
+                non_power_of_two.append(f"{texture_path}({width}x{height})")
+            if max(width, height) > MinecraftUtils.MAX_TEXTURE_SIZE:
+                oversized.append(f"{texture_path}({width}x{height})")
+            if os.path.basename(texture_path).startswith('music_disc_') and texture_path.startswith('textures/items/') \
+                    and (width, height) != MinecraftUtils.DISC_ICON_SIZE:
+                wrong_icon_size.append(f"{texture_path}({width}x{height})")
+
+        icon_size = 'x'.join(map(str, MinecraftUtils.DISC_ICON_SIZE))
+        stats.append(Stat("Indexed PNG headers", f"[{len(index)}]"))
+        stats.append(Stat("Read from disk", f"[{MinecraftUtils._texture_index_reads}]", padding=3))
+        stats.append(Stat("Texture memory (RGBA)", f"[{texture_memory / 1024:.1f}] KB"))
+        stats.append(Stat("Corrupt PNG files", lambda: ConsoleStyle.format_count(
+            [f"{path}: {error}" for path, error in corrupt.items()]), "error" if corrupt else "info"))
+        stats.append(Stat("Non power-of-two textures", lambda: ConsoleStyle.format_count(non_power_of_two),
+                          "warning" if non_power_of_two else "info"))
+        stats.append(Stat(f"Textures over {MinecraftUtils.MAX_TEXTURE_SIZE}px",
+                          lambda: ConsoleStyle.format_count(oversized), "warning" if oversized else "info"))
+        stats.append(Stat(f"Disc icons not {icon_size}", lambda: ConsoleStyle.format_count(wrong_icon_size),
+                          "error" if wrong_icon_size else "info"))
+
+        if corrupt:
+            errors.append(f"Corrupt [{len(corrupt)}] PNG files: {ConsoleStyle.format_list(corrupt, limit=None)}")
+        if wrong_icon_size:
+            errors.append(
+                f"Disc icons with size other than {icon_size} [{len(wrong_icon_size)}]: {ConsoleStyle.format_list(wrong_icon_size, limit=None)}")
+        if non_power_of_two:
+            warnings.append(
+                f"Non power-of-two [{len(non_power_of_two)}] textures: {ConsoleStyle.format_list(non_power_of_two, limit=None)}")
+        if oversized:
+            warnings.append(
+                f"Textures larger than {MinecraftUtils.MAX_TEXTURE_SIZE}px [{len(oversized)}]: {ConsoleStyle.format_list(oversized, limit=None)}")
+
+        ConsoleStyle.print_stats(stats, "PNG HEADERS", icon="🖼️")
+
+        return errors, warnings
+
+    @staticmethod
+    @verification_step
     def _verify_block_texture_definitions():
         """8. Weryfikacja czy użyte w blokach tekstury są zdefiniowane"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         block_textures = set()
         build_in_textures = set()
@@ -513,34 +737,34 @@ class MinecraftUtils:
         missing_in_terrain = block_textures - terrain_texture_keys
         unused_textures = terrain_texture_keys - block_textures
 
-        stats[ConsoleStyle.info(
-            "Build in block textures referenced")] = f"[{len(build_in_textures)}] {', '.join(sorted(build_in_textures))}" if build_in_textures else '0'
-        stats[ConsoleStyle.info(
-            "Custom block textures referenced")] = f"[{len(block_textures)}]" if block_textures else '0'
-        stats[ConsoleStyle.error("Missing from terrain_texture.json") if missing_in_terrain else ConsoleStyle.info(
-            "Missing from terrain_texture.json")] \
-            = f"[{len(missing_in_terrain)}] {', '.join(sorted(missing_in_terrain))}" if missing_in_terrain else "0"
+        stats.append(Stat("Build in block textures referenced",
+                          lambda: ConsoleStyle.format_count(build_in_textures, parentheses=False)))
+        stats.append(Stat("Custom block textures referenced", ConsoleStyle.format_count(block_textures, False)))
+        stats.append(Stat("Missing from terrain_texture.json",
+                          lambda: ConsoleStyle.format_count(missing_in_terrain, parentheses=False),
+                          "error" if missing_in_terrain else "info"))
         if missing_in_terrain:
             errors.append(
-                f"Missing [{len(missing_in_terrain)}] textures in terrain_texture.json: {', '.join(sorted(missing_in_terrain))}")
+                f"Missing [{len(missing_in_terrain)}] textures in terrain_texture.json: {ConsoleStyle.format_list(missing_in_terrain, limit=None)}")
 
-        stats[ConsoleStyle.warning("Unused in terrain_texture.json") if unused_textures else ConsoleStyle.info(
-            "Unused in terrain_texture.json")] \
-            = f"[{len(unused_textures)}] {', '.join(sorted(unused_textures))}" if unused_textures else "0"
+        stats.append(Stat("Unused in terrain_texture.json",
+                          lambda: ConsoleStyle.format_count(unused_textures, parentheses=False),
+                          "warning" if unused_textures else "info"))
         if unused_textures:
             warnings.append(
-                f"Unused [{len(unused_textures)}] textures in terrain_texture.json: {', '.join(sorted(unused_textures))}")
+                f"Unused [{len(unused_textures)}] textures in terrain_texture.json: {ConsoleStyle.format_list(unused_textures, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "BLOCK TEXTURE DEFINITIONS", icon="🔗")
 
         return errors, warnings
 
     @staticmethod
+    @verification_step
     def _verify_item_texture_definitions():
         """8. Weryfikacja czy użyte w itemach tekstury są zdefiniowane"""
         errors = []
         warnings = []
-        stats = {}
+        stats = []
 
         item_textures = set()
         build_in_textures = set()
@@ -558,28 +782,122 @@ class MinecraftUtils:
         missing_in_item = item_textures - item_texture_keys
         unused_textures = item_texture_keys - item_textures
 
-        stats[ConsoleStyle.info(
-            "Build in textures referenced")] = f"[{len(build_in_textures)}] {', '.join(sorted(build_in_textures))}" if build_in_textures else '0'
-        stats[
-            ConsoleStyle.info("Custom item textures referenced")] = f"[{len(item_textures)}]" if item_textures else '0'
-        stats[ConsoleStyle.error("Missing from item_texture.json") if missing_in_item else ConsoleStyle.info(
-            "Missing from item_texture.json")] \
-            = f"[{len(missing_in_item)}] {', '.join(sorted(missing_in_item))}" if missing_in_item else "0"
+        stats.append(Stat("Build in textures referenced",
+                          lambda: ConsoleStyle.format_count(build_in_textures, parentheses=False)))
+        stats.append(Stat("Custom item textures referenced", ConsoleStyle.format_count(item_textures, False)))
+        stats.append(Stat("Missing from item_texture.json",
+                          lambda: ConsoleStyle.format_count(missing_in_item, parentheses=False),
+                          "error" if missing_in_item else "info"))
         if missing_in_item:
             errors.append(
-                f"Missing [{len(missing_in_item)}] textures in item_texture.json: {', '.join(sorted(missing_in_item))}")
+                f"Missing [{len(missing_in_item)}] textures in item_texture.json: {ConsoleStyle.format_list(missing_in_item, limit=None)}")
 
-        stats[ConsoleStyle.warning("Unused in item_texture.json") if unused_textures else ConsoleStyle.info(
-            "Unused in item_texture.json")] \
-            = f"[{len(unused_textures)}] {', '.join(sorted(unused_textures))}" if unused_textures else "0"
+        stats.append(Stat("Unused in item_texture.json",
+                          lambda: ConsoleStyle.format_count(unused_textures, parentheses=False),
+                          "warning" if unused_textures else "info"))
         if unused_textures:
             warnings.append(
-                f"Unused [{len(unused_textures)}] textures in item_texture.json: {', '.join(sorted(unused_textures))}")
+                f"Unused [{len(unused_textures)}] textures in item_texture.json: {ConsoleStyle.format_list(unused_textures, limit=None)}")
 
         ConsoleStyle.print_stats(stats, "ITEM TEXTURE DEFINITIONS", icon="🔗")
 
         return errors, warnings
 
+    @staticmethod
+    @verification_step
+    def _verify_sound_streams(sound_index):
+        """9. Weryfikacja strumieni Ogg/Vorbis i budżetu audio"""
+        errors = []
+        warnings = []
+        stats = []
+
+        corrupt = {path: info['error'] for path, info in sound_index.items() if 'error' in info}
+        valid = {path: info for path, info in sound_index.items() if 'error' not in info}
+        incomplete = [path for path, info in valid.items() if not info['complete']]
+
+        total_duration = sum(info['duration'] for info in valid.values())
+        download_size = sum(info['size'] for info in sound_index.values() if 'size' in info)
+        # Zdekodowane PCM 16-bit (bez kompresji) - tyle zajmuje dźwięk ładowany w całości do pamięci
+        memory_size = sum(info['samples'] * info['channels'] * 2 for info in valid.values())
+
+        stats.append(Stat("Sound files", f"[{len(sound_index)}]"))
+        stats.append(Stat("Total duration", f"[{AudioUtils.format_duration(total_duration)}]"))
+        stats.append(Stat("Download size", f"[{download_size / 1024 / 1024:.2f}] MB"))
+        stats.append(Stat("Decoded memory (PCM 16-bit)", f"[{memory_size / 1024 / 1024:.2f}] MB"))
+        stats.append(Stat("Streams", lambda: ConsoleStyle.format_list((
+            f"{os.path.basename(path)} {AudioUtils.format_duration(info['duration'])} "
+            f"{info['sample_rate']}Hz {info['channels']}ch {info['bitrate'] // 1000}kbps"
+            for path, info in valid.items()), sort=False) or "0"))
+        stats.append(Stat("Corrupt sound files", lambda: ConsoleStyle.format_count(
+            [f"{path}: {error}" for path, error in corrupt.items()]), "error" if corrupt else "info"))
+        stats.append(Stat("Streams without end marker", lambda: ConsoleStyle.format_count(incomplete),
+                          "warning" if incomplete else "info"))
+
+        if corrupt:
+            errors.append(f"Corrupt [{len(corrupt)}] sound files: {ConsoleStyle.format_list(corrupt, limit=None)}")
+        if incomplete:
+            warnings.append(
+                f"Sound files without end of stream [{len(incomplete)}]: {ConsoleStyle.format_list(incomplete, limit=None)}")
+
+        ConsoleStyle.print_stats(stats, "SOUND STREAMS", icon="🎵")
+
+        return errors, warnings
+
+    @staticmethod
+    @verification_step
+    def _verify_sound_references(sound_index):
+        """10. Weryfikacja odwołań sound_definitions.json i tickLength w musicDiscs.js"""
+        errors = []
+        warnings = []
+        stats = []
+
+        try:
+            sound_definitions = MinecraftUtils.load_json_file(MinecraftUtils.SOUND_DEFINITIONS_FILE).get(
+                'sound_definitions', {})
+        except FileNotFoundError:
+            sound_definitions = {}
+        tick_lengths = MinecraftUtils._get_music_disc_tick_lengths()
+
+        referenced = {}
+        for sound_id, definition in sound_definitions.items():
+            for sound in definition.get('sounds', []):
+                name = sound.get('name', '') if isinstance(sound, dict) else sound
+                if name.startswith('sounds/items/'):
+                    referenced[name] = sound_id
+
+        missing_files = sorted(name for name in referenced if name not in sound_index)
+        unreferenced_files = sorted(name for name in sound_index if name not in referenced)
+        tick_mismatches = []
+        for name, sound_id in referenced.items():
+            info = sound_index.get(name)
+            if not info or 'error' in info or sound_id not in tick_lengths:
+                continue
+            expected = AudioUtils.duration_to_ticks(info['samples'], info['sample_rate'], MinecraftUtils.TICKS_PER_SECOND)
+            if abs(tick_lengths[sound_id] - expected) > MinecraftUtils.TICK_LENGTH_TOLERANCE:
+                tick_mismatches.append(f"{sound_id} ({tick_lengths[sound_id]} != {expected})")
+
+        stats.append(Stat("Referenced sound files", f"[{len(referenced)}]"))
+        stats.append(Stat("Discs with tickLength", f"[{len(tick_lengths)}]"))
+        stats.append(Stat("Missing sound files", lambda: ConsoleStyle.format_count(missing_files),
+                          "error" if missing_files else "info"))
+        stats.append(Stat("Unreferenced sound files", lambda: ConsoleStyle.format_count(unreferenced_files),
+                          "warning" if unreferenced_files else "info"))
+        stats.append(Stat("tickLength mismatches", lambda: ConsoleStyle.format_count(tick_mismatches),
+                          "warning" if tick_mismatches else "info"))
+
+        if missing_files:
+            errors.append(f"Missing [{len(missing_files)}] sound files: {ConsoleStyle.format_list(missing_files, limit=None)}")
+        if unreferenced_files:
+            warnings.append(
+                f"Unreferenced [{len(unreferenced_files)}] sound files: {ConsoleStyle.format_list(unreferenced_files, limit=None)}")
+        if tick_mismatches:
+            warnings.append(
+                f"tickLength differs from stream duration for [{len(tick_mismatches)}] discs: {ConsoleStyle.format_list(tick_mismatches, limit=None)}")
+
+        ConsoleStyle.print_stats(stats, "SOUND REFERENCES", icon="🔗")
+
+        return errors, warnings
+
     # ===== GŁÓWNE FUNKCJE WERYFIKACJI =====
 
     @staticmethod
@@ -649,6 +967,28 @@ class MinecraftUtils:
         errors.extend(png_def_errors)
         warnings.extend(png_def_warnings)
 
+        png_header_errors, png_header_warnings = MinecraftUtils._verify_png_headers()
+        errors.extend(png_header_errors)
+        warnings.extend(png_header_warnings)
+
+        return errors, warnings
+
+    @staticmethod
+    def verify_sounds():
+        """Verify OGG streams, their references and the audio budget"""
+        errors = []
+        warnings = []
+
+        sound_index = MinecraftUtils._get_sound_index()
+
+        stream_errors, stream_warnings = MinecraftUtils._verify_sound_streams(sound_index)
+        errors.extend(stream_errors)
+        warnings.extend(stream_warnings)
+
+        reference_errors, reference_warnings = MinecraftUtils._verify_sound_references(sound_index)
+        errors.extend(reference_errors)
+        warnings.extend(reference_warnings)
+
         return errors, warnings
 
     @staticmethod
@@ -662,7 +1002,7 @@ class MinecraftUtils:
             ("RP/manifest.json", "Resource Pack")
         ]
 
-        manifest_stats = {}
+        manifest_stats = []
 
         for file_path, pack_type in manifest_files:
             try:
@@ -689,16 +1029,16 @@ class MinecraftUtils:
                     if not isinstance(version, list) or len(version) != 3:
                         errors.append(f"{pack_type} version must be [major, minor, patch]")
                     else:
-                        manifest_stats[ConsoleStyle.success(pack_type)] = f"Version {'.'.join(map(str, version))}"
+                        manifest_stats.append(Stat(pack_type, f"Version {'.'.join(map(str, version))}", "success"))
 
-                manifest_stats[ConsoleStyle.success(f"{pack_type} JSON")] = "Valid"
+                manifest_stats.append(Stat(f"{pack_type} JSON", "Valid", "success"))
 
             except json.JSONDecodeError as e:
                 errors.append(f"{pack_type} manifest is invalid JSON: {e}")
-                manifest_stats[ConsoleStyle.error(pack_type)] = f"Invalid JSON: {e}"
+                manifest_stats.append(Stat(pack_type, f"Invalid JSON: {e}", "error"))
             except Exception as e:
                 errors.append(f"Error reading {pack_type} manifest: {e}")
-                manifest_stats[ConsoleStyle.error(pack_type)] = f"Error: {e}"
+                manifest_stats.append(Stat(pack_type, f"Error: {e}", "error"))
 
         # Print statistics
         ConsoleStyle.print_stats(manifest_stats, "MANIFESTS VERIFICATION", icon="📋")
@@ -723,13 +1063,13 @@ class MinecraftUtils:
 
             # Check required fields
             required_fields = ['type', 'name', 'namespace', 'targetVersion']
-            config_stats = {}
+            config_stats = []
 
             for field in required_fields:
                 if field in data:
-                    config_stats[ConsoleStyle.success(field)] = data[field]
+                    config_stats.append(Stat(field, data[field], "success"))
                 else:
-                    config_stats[ConsoleStyle.error(field)] = "Missing"
+                    config_stats.append(Stat(field, "Missing", "error"))
                     errors.append(f"config.json missing required field: {field}")
 
             # Check namespace consistency
@@ -746,12 +1086,12 @@ class MinecraftUtils:
                             break
 
                 if namespace_used:
-                    config_stats[ConsoleStyle.success("Namespace usage")] = "Found in blocks"
+                    config_stats.append(Stat("Namespace usage", "Found in blocks", "success"))
                 else:
-                    config_stats[ConsoleStyle.warning("Namespace usage")] = "Not found in blocks"
+                    config_stats.append(Stat("Namespace usage", "Not found in blocks", "warning"))
                     warnings.append(f"Namespace '{MinecraftUtils.namespace}' not found in block identifiers")
 
-            config_stats[ConsoleStyle.success("JSON format")] = "Valid"
+            config_stats.append(Stat("JSON format", "Valid", "success"))
 
             # Print statistics
             ConsoleStyle.print_stats(config_stats, "CONFIG VERIFICATION", icon="⚙️")
@@ -766,7 +1106,7 @@ class MinecraftUtils:
     @staticmethod
     def count_project_files():
         """Count files in the project"""
-        stats: Dict[str, Any] = {}
+        stats: List[Stat] = []
 
         total_files = 0
         # Count files by directory
@@ -779,7 +1119,7 @@ class MinecraftUtils:
             if rel_path == ".":
                 rel_path = ""
 
-            stats[ConsoleStyle.info(f"/{rel_path}", icon='📁')] = f"[{len(files)}] files"
+            stats.append(Stat(f"/{rel_path}", f"[{len(files)}] files", icon='📁'))
             total_files += len(files)
 
         ConsoleStyle.print_stats(stats, f"PROJECT FILES ([{total_files}])", icon="📦")
@@ -829,13 +1169,13 @@ class MinecraftUtils:
         errors = []
         warnings = []
 
-        item_stats = {}
+        item_stats = []
         for file_path, state in sorted(locations.items(), key=lambda item: item[0]):
             if os.path.exists(file_path):
-                item_stats[ConsoleStyle.success(file_path, icon=f'📁' if file_path.endswith(
-                    '/') else '📄')] = f"Found {state_name[state]}"
+                item_stats.append(Stat(file_path, f"Found {state_name[state]}", "success",
+                                       icon='📁' if file_path.endswith('/') else '📄'))
             else:
-                item_stats[ConsoleStyle.error(file_path)] = f"Missing {state_name[state]}"
+                item_stats.append(Stat(file_path, f"Missing {state_name[state]}", "error"))
                 if state == state_required:
                     errors.append(
                         f"Missing {state_name[state]} {'directory' if file_path.endswith('/') else 'file'}: {file_path}")
@@ -881,112 +1221,88 @@ class MinecraftUtils:
                         for block_id in database_file_content['categories'][category]['blocks']:
                             database_block_ids.add(block_id)
 
-                # Check if language files exist
-                for lang_name in languages_list:
-                    lang_path = f"RP/texts/{lang_name}.lang"
-                    lang_file_block_translations = set()
-                    lang_file_category_translations = set()
-                    stats = {}
-                    with open(lang_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and '=' in line:
-                                key = line.split('=', 1)[0].strip()
-                                if key.startswith(f'tile.{MinecraftUtils.namespace}:') and key.endswith(
-                                        '.name'):
-                                    block_name = key.replace(f'tile.{MinecraftUtils.namespace}:',
-                                                             '').replace('.name', '')
-                                    lang_file_block_translations.add(block_name)
-                                elif key.startswith(f'{MinecraftUtils.namespace}:'):
-                                    # Kategorie mają format `namespace:category_name`
-                                    category_name = key.replace(f'{MinecraftUtils.namespace}:', '')
-                                    lang_file_category_translations.add(category_name)
-
-                    # Wczytaj crafting catalog
-                    project_category_translations = set()
-                    try:
-                        with open('BP/item_catalog/crafting_item_catalog.json', 'r', encoding='utf-8') as f:
-                            catalog_data = json.load(f)
-                            for category in catalog_data['minecraft:crafting_items_catalog']['categories']:
-                                for group in category.get('groups', []):
-                                    if 'group_identifier' in group and 'name' in group['group_identifier']:
-                                        name = group['group_identifier']['name']
-                                        if name.startswith(f'{MinecraftUtils.namespace}:'):
-                                            category_name = name.replace(f'{MinecraftUtils.namespace}:', '')
-                                            project_category_translations.add(category_name)
-                    except Exception as e:
-                        print_if_not_quiet(ConsoleStyle.error(f"Error reading crafting catalog: {e}"))
-                        warnings.append(f"Error reading crafting catalog: {e}")
+                # Wczytaj crafting catalog (raz dla wszystkich języków)
+                try:
+                    project_category_translations = MinecraftUtils._get_catalog_categories()
+                except Exception as e:
+                    project_category_translations = frozenset()
+                    print_if_not_quiet(ConsoleStyle.error(f"Error reading crafting catalog: {e}"))
+                    warnings.append(f"Error reading crafting catalog: {e}")
+
+                # Przetwórz pliki językowe równolegle
+                lang_paths = [f"RP/texts/{lang_name}.lang" for lang_name in languages_list]
+                with ThreadPoolExecutor() as executor:
+                    lang_results = list(executor.map(MinecraftUtils._parse_lang_file, lang_paths))
+
+                for lang_name, (lang_file_block_translations, lang_file_category_translations, lang_error) in zip(
+                        languages_list, lang_results):
+                    if lang_error:
+                        errors.append(f"Cannot read [{lang_name}] lang file: {lang_error}")
+                        continue
+                    stats = []
 
-                    stats[ConsoleStyle.info("Items in lang file")] \
-                        = f"[{len(lang_file_category_translations) + len(lang_file_block_translations)}]"
+                    stats.append(Stat("Items in lang file",
+                                      f"[{len(lang_file_category_translations) + len(lang_file_block_translations)}]"))
 
-                    stats[ConsoleStyle.info("Categories in lang file", 3)] \
-                        = f"[{len(lang_file_category_translations)}]" if lang_file_category_translations else "0"
-                    stats[ConsoleStyle.info("Blocks in lang file", 3)] \
-                        = f"[{len(lang_file_block_translations)}]" if lang_file_block_translations else "0"
+                    stats.append(Stat("Categories in lang file",
+                                      ConsoleStyle.format_count(lang_file_category_translations, False), padding=3))
+                    stats.append(Stat("Blocks in lang file",
+                                      ConsoleStyle.format_count(lang_file_block_translations, False), padding=3))
 
-                    stats[ConsoleStyle.info("Items in project")] \
-                        = f"[{len(project_category_translations) + len(project_block_translations)}]" if project_category_translations and project_block_translations else "0"
-                    stats[ConsoleStyle.info("Categories in project", 3)] \
-                        = f"[{len(project_category_translations)}]" if project_category_translations else "0"
-                    stats[ConsoleStyle.info("Blocks in project", 3)] \
-                        = f"[{len(project_block_translations)}]" if project_block_translations else "0"
+                    stats.append(Stat("Items in project",
+                                      f"[{len(project_category_translations) + len(project_block_translations)}]" if project_category_translations and project_block_translations else "0"))
+                    stats.append(Stat("Categories in project",
+                                      ConsoleStyle.format_count(project_category_translations, False), padding=3))
+                    stats.append(Stat("Blocks in project",
+                                      ConsoleStyle.format_count(project_block_translations, False), padding=3))
 
                     lang_file_extra_categories = lang_file_category_translations - project_category_translations
-                    stats[ConsoleStyle.warning(
-                        "Extra categories in lang file") if lang_file_extra_categories else ConsoleStyle.info(
-                        "Extra categories in lang file")] \
-                        = f"[{len(lang_file_extra_categories)}] ({', '.join(sorted(lang_file_extra_categories))})" if lang_file_extra_categories else 0
+                    stats.append(Stat("Extra categories in lang file",
+                                      lambda items=lang_file_extra_categories: ConsoleStyle.format_count(items),
+                                      "warning" if lang_file_extra_categories else "info"))
                     if lang_file_extra_categories:
                         warnings.append(
                             f"Extra [{len(lang_file_extra_categories)}] categories in [{lang_name}] lang file")
 
                     lang_file_extra_blocks = lang_file_block_translations - project_block_translations
-                    stats[ConsoleStyle.warning(
-                        "Extra blocks in lang file") if lang_file_extra_blocks else ConsoleStyle.info(
-                        "Extra blocks in lang file")] \
-                        = f"[{len(lang_file_extra_blocks)}] ({', '.join(sorted(lang_file_extra_blocks))})" if lang_file_extra_blocks else 0
+                    stats.append(Stat("Extra blocks in lang file",
+                                      lambda items=lang_file_extra_blocks: ConsoleStyle.format_count(items),
+                                      "warning" if lang_file_extra_blocks else "info"))
                     if lang_file_extra_blocks:
                         warnings.append(
                             f"Extra [{len(lang_file_extra_blocks)}] blocks in [{lang_name}] lang file")
 
                     lang_file_missing_categories = project_category_translations - lang_file_category_translations
-                    stats[ConsoleStyle.error(
-                        "Missing categories defined in lang file") if lang_file_missing_categories else ConsoleStyle.info(
-                        "Missing categories defined in lang file")] \
-                        = f"[{len(lang_file_missing_categories)}] ({', '.join(sorted(lang_file_missing_categories))})" if lang_file_missing_categories else 0
+                    stats.append(Stat("Missing categories defined in lang file",
+                                      lambda items=lang_file_missing_categories: ConsoleStyle.format_count(items),
+                                      "error" if lang_file_missing_categories else "info"))
                     if lang_file_missing_categories:
                         errors.append(
                             f"Missing [{len(lang_file_missing_categories)}] categories defined in [{lang_name}] lang file")
 
                     lang_file_missing_blocks = project_block_translations - lang_file_block_translations
-                    stats[ConsoleStyle.error(
-                        "Missing blocks defined in lang file") if lang_file_missing_blocks else ConsoleStyle.info(
-                        "Missing blocks defined in lang file")] \
-                        = f"[{len(lang_file_missing_blocks)}] ({', '.join(sorted(lang_file_missing_blocks))})" if lang_file_missing_blocks else 0
+                    stats.append(Stat("Missing blocks defined in lang file",
+                                      lambda items=lang_file_missing_blocks: ConsoleStyle.format_count(items),
+                                      "error" if lang_file_missing_blocks else "info"))
                     if lang_file_missing_blocks:
                         errors.append(
                             f"Missing [{len(lang_file_missing_blocks)}] blocks defined in [{lang_name}] lang file")
 
                     if os.path.exists(MinecraftUtils.DATABASE_FILE_NAME):
-                        stats[ConsoleStyle.info("In database")] = len(database_categories) + len(
-                            database_block_ids)
-                        stats[ConsoleStyle.info("Categories in database", 3)] = len(database_categories)
-                        stats[ConsoleStyle.info("Blocks in database", 3)] = len(database_block_ids)
+                        stats.append(Stat("In database", len(database_categories) + len(database_block_ids)))
+                        stats.append(Stat("Categories in database", len(database_categories), padding=3))
+                        stats.append(Stat("Blocks in database", len(database_block_ids), padding=3))
                         database_missing_categories = database_categories - lang_file_category_translations
-                        stats[ConsoleStyle.error(
-                            "Missing categories from database") if database_missing_categories else ConsoleStyle.info(
-                            "Missing categories from database")] \
-                            = f"[{len(database_missing_categories)}] ({', '.join(sorted(database_missing_categories))})" if database_missing_categories else 0
+                        stats.append(Stat("Missing categories from database",
+                                          lambda items=database_missing_categories: ConsoleStyle.format_count(items),
+                                          "error" if database_missing_categories else "info"))
                         if database_missing_categories:
                             errors.append(
                                 f"Missing [{len(database_missing_categories)}] from database in [{lang_name}]")
                         database_missing_blocks = database_block_ids - project_block_translations
-                        stats[ConsoleStyle.error(
-                            "Missing blocks from database") if database_missing_blocks else ConsoleStyle.info(
-                            "Missing blocks from database")] \
-                            = f"[{len(database_missing_blocks)}] ({', '.join(sorted(database_missing_blocks))})" if database_missing_blocks else 0
+                        stats.append(Stat("Missing blocks from database",
+                                          lambda items=database_missing_blocks: ConsoleStyle.format_count(items),
+                                          "error" if database_missing_blocks else "info"))
                         if database_missing_blocks:
                             errors.append(
                                 f"Missing [{len(database_missing_blocks)}] from database in [{lang_name}]")
@@ -998,49 +1314,248 @@ class MinecraftUtils:
         return errors, warnings
 
     @staticmethod
-    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]]):
+    def _get_lang_key_pattern():
+        """Skompilowany wzorzec kluczy tłumaczeń bloków (`tile.ns:name.name`) i kategorii (`ns:category`)"""
+        namespace = re.escape(f"{MinecraftUtils.namespace}:")
+        return re.compile(rf"tile\.{namespace}(?P<block>.*)\.name|{namespace}(?P<category>.*)")
+
+    @staticmethod
+    def _iter_lang_keys(lang_path: str) -> Iterator[str]:
+        """Generator kluczy z pliku .lang (linie `klucz=wartość`)"""
+        with open(lang_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, separator, value = line.partition('=')
+                if separator:
+                    key = key.strip()
+                    if key:
+                        yield key
+
+    @staticmethod
+    def _parse_lang_file(lang_path: str) -> Tuple[FrozenSet[str], FrozenSet[str], Optional[str]]:
+        """Zwróć (tłumaczenia bloków, tłumaczenia kategorii, błąd) dla pliku .lang"""
+        pattern = MinecraftUtils._get_lang_key_pattern()
+        blocks = set()
+        categories = set()
+        try:
+            for match in filter(None, map(pattern.fullmatch, MinecraftUtils._iter_lang_keys(lang_path))):
+                if match.group('block') is not None:
+                    blocks.add(match.group('block'))
+                else:
+                    categories.add(match.group('category'))
+        except OSError as e:
+            return frozenset(), frozenset(), str(e)
+        return frozenset(blocks), frozenset(categories), None
+
+    @staticmethod
+    def _get_catalog_categories() -> FrozenSet[str]:
+        """Pobierz kategorie projektu z crafting_item_catalog.json"""
+        prefix = f'{MinecraftUtils.namespace}:'
+        catalog_data = MinecraftUtils.load_json_file('BP/item_catalog/crafting_item_catalog.json')
+        categories = set()
+        for category in catalog_data['minecraft:crafting_items_catalog']['categories']:
+            for group in category.get('groups', []):
+                name = group.get('group_identifier', {}).get('name', '')
+                if name.startswith(prefix):
+                    categories.add(name[len(prefix):])
+        return frozenset(categories)
+
+    # ===== RAPORT WERYFIKACJI =====
+
+    @staticmethod
+    def _new_report_node(name: str) -> Dict[str, Any]:
+        """Utwórz węzeł raportu dla weryfikacji"""
+        return {
+            'name': name,
+            'status': 'skipped',
+            'elapsed': 0.0,
+            'errors': [],
+            'warnings': [],
+            'stats': {},
+            'sub_checks': [],
+        }
+
+    @staticmethod
+    def _collect_messages(node: Dict[str, Any], kind: str) -> List[str]:
+        """Zbierz komunikaty danego rodzaju ('errors' lub 'warnings') z węzła raportu i jego podweryfikacji"""
+        messages = list(node[kind])
+        for child in node['sub_checks']:
+            messages.extend(MinecraftUtils._collect_messages(child, kind))
+        return messages
+
+    @staticmethod
+    def _record_stats(title: str, stats: StatsTable):
+        """Zapisz tabelę statystyk w aktualnie wykonywanej weryfikacji"""
+        if not MinecraftUtils._report_stack:
+            return
+        node = MinecraftUtils._report_stack[-1]
+        if isinstance(stats, dict):
+            rows = {ConsoleStyle.plain(key): ConsoleStyle.plain(value) for key, value in stats.items()}
+        else:
+            rows = {stat.label: ConsoleStyle.plain(stat.resolve()) for stat in stats}
+        node['stats'][ConsoleStyle.plain(title)] = rows
+
+    @staticmethod
+    def _run_step(func: Callable, *args, **kwargs) -> Tuple[List[str], List[str]]:
+        """Uruchom weryfikację, mierząc czas i zapisując wynik w raporcie"""
+        if not MinecraftUtils._report_stack:
+            return func(*args, **kwargs)
+
+        node = MinecraftUtils._new_report_node(func.__name__)
+        MinecraftUtils._report_stack[-1]['sub_checks'].append(node)
+        MinecraftUtils._report_stack.append(node)
+        start = time.perf_counter()
+        try:
+            errors, warnings = func(*args, **kwargs)
+        except VerificationAborted:
+            node['status'] = 'failed'
+            raise
+        except Exception as e:
+            node['status'] = 'failed'
+            node['errors'] = [str(e)]
+            raise
+        finally:
+            node['elapsed'] = time.perf_counter() - start
+            MinecraftUtils._report_stack.pop()
+
+        node['errors'] = [str(error) for error in errors]
+        node['warnings'] = [str(warning) for warning in warnings]
+        node['status'] = 'failed' if errors else 'warning' if warnings else 'passed'
+        if errors and MinecraftUtils.FAIL_FAST:
+            raise VerificationAborted(func.__name__)
+        return errors, warnings
+
+    @staticmethod
+    def _report_to_json(report: Dict[str, Any]) -> str:
+        """Zserializuj raport weryfikacji do JSON"""
+        return json.dumps(report, indent=2, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def _report_to_junit(report: Dict[str, Any]) -> str:
+        """Zserializuj raport weryfikacji do formatu JUnit XML"""
+        suite = ElementTree.Element('testsuite', name='verify_all')
+        counters = {'tests': 0, 'failures': 0, 'skipped': 0}
+
+        def add_case(node: Dict[str, Any], class_name: str):
+            counters['tests'] += 1
+            case = ElementTree.SubElement(suite, 'testcase', classname=class_name, name=node['name'],
+                                          time=f"{node['elapsed']:.6f}")
+            if node['status'] == 'skipped':
+                counters['skipped'] += 1
+                ElementTree.SubElement(case, 'skipped')
+            elif node['errors']:
+                counters['failures'] += 1
+                failure = ElementTree.SubElement(case, 'failure',
+                                                 message=f"{len(node['errors'])} error(s)")
+                failure.text = '\n'.join(node['errors'])
+            output = [f"WARNING: {warning}" for warning in node['warnings']]
+            for title, stats in node['stats'].items():
+                output.append(f"[{title}]")
+                output.extend(f"  {key}: {value}" for key, value in stats.items())
+            if output:
+                ElementTree.SubElement(case, 'system-out').text = '\n'.join(output)
+            for child in node['sub_checks']:
+                add_case(child, f"{class_name}.{node['name']}")
+
+        for check in report['checks']:
+            add_case(check, 'verify_all')
+
+        suite.set('tests', str(counters['tests']))
+        suite.set('failures', str(counters['failures']))
+        suite.set('skipped', str(counters['skipped']))
+        suite.set('errors', '0')
+        suite.set('time', f"{report['elapsed']:.6f}")
+        return ElementTree.tostring(suite, encoding='unicode')
+
+    @staticmethod
+    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]],
+                             output_format: str = 'text', fail_fast: bool = False):
+        if output_format not in MinecraftUtils.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        MinecraftUtils.FAIL_FAST = fail_fast
         verification_results = {
             'success': [],
             'warning': {},
             'error': {},
         }
-        for verify_func in verifications:
-            try:
-                errors, warnings = verify_func()
-                if errors or warnings:
-                    if errors:
-                        verification_results['error'][verify_func.__name__] = errors
-                    if warnings:
-                        verification_results['warning'][verify_func.__name__] = warnings
-                else:
-                    verification_results['success'].append(verify_func.__name__)
+        report = {
+            'status': 'passed',
+            'elapsed': 0.0,
+            'checks': [MinecraftUtils._new_report_node(verify_func.__name__) for verify_func in verifications],
+        }
 
-            except Exception as e:
-                verification_results['error'][{verify_func.__name__}].append(e)
+        ConsoleStyle.set_stats_listener(MinecraftUtils._record_stats)
+        quiet_mode = ConsoleStyle.QUIET_MODE
+        if output_format != 'text':
+            # Raport maszynowy trafia na stdout, więc komunikaty tekstowe nie są nawet formatowane
+            ConsoleStyle.set_quiet_mode(True)
+        started = time.perf_counter()
+        try:
+            with contextlib.ExitStack() as context:
+                if output_format != 'text':
+                    context.enter_context(contextlib.redirect_stdout(context.enter_context(open(os.devnull, 'w'))))
+                for verify_func, node in zip(verifications, report['checks']):
+                    MinecraftUtils._report_stack = [node]
+                    start = time.perf_counter()
+                    try:
+                        errors, warnings = verify_func()
+                    except VerificationAborted:
+                        errors = MinecraftUtils._collect_messages(node, 'errors')
+                        warnings = MinecraftUtils._collect_messages(node, 'warnings')
+                    except Exception as e:
+                        errors, warnings = [e], []
+                    node['elapsed'] = time.perf_counter() - start
+                    node['errors'] = [str(error) for error in errors]
+                    node['warnings'] = [str(warning) for warning in warnings]
+                    node['status'] = 'failed' if errors else 'warning' if warnings else 'passed'
+
+                    if errors or warnings:
+                        if errors:
+                            verification_results['error'][verify_func.__name__] = errors
+                        if warnings:
+                            verification_results['warning'][verify_func.__name__] = warnings
+                    else:
+                        verification_results['success'].append(verify_func.__name__)
+
+                    if errors and fail_fast:
+                        break
+        finally:
+            # Przywróć stan globalny również po KeyboardInterrupt/SystemExit zgłoszonym w trakcie weryfikacji
+            MinecraftUtils._report_stack = []
+            ConsoleStyle.set_stats_listener(None)
+            ConsoleStyle.set_quiet_mode(quiet_mode)
+        report['elapsed'] = time.perf_counter() - started
+        report['status'] = 'failed' if verification_results['error'] else 'passed'
+        status = 1 if verification_results['error'] else 0
+
+        if output_format == 'json':
+            print(MinecraftUtils._report_to_json(report))
+            sys.exit(status)
+        if output_format == 'junit':
+            print(MinecraftUtils._report_to_junit(report))
+            sys.exit(status)
 
         # Print summary statistics
-        success_details = ''.join([f'\n   • {name}' for name in verification_results['success']])
-        warning_details = ''.join(
-            [f'\n   • {name} ({len(details)})' + ''.join([f'\n      • {det}' for det in details]) for name, details in
-             verification_results['warning'].items()])
-        error_details = ''.join(
-            [f'\n   • {name} ({len(details)})' + ''.join([f'\n      • {det}' for det in details]) for name, details in
-             verification_results['error'].items()])
-
-        ConsoleStyle.print_stats({
-            ConsoleStyle.success("Passed checks"): f"[{len(verification_results['success'])}]{success_details}",
-            ConsoleStyle.warning("Checks with warnings"): f"[{len(verification_results['warning'])}]{warning_details}",
-            ConsoleStyle.error("Checks with errors"): f"[{len(verification_results['error'])}]{error_details}",
-        }, f"VERIFICATION SUMMARY ([{len(verifications)}])", icon='📊')
+        def details(results: Dict[str, List[str]]) -> str:
+            return ''.join([f'\n   • {name} ({len(items)})' + ''.join([f'\n      • {item}' for item in items])
+                            for name, items in results.items()])
+
+        ConsoleStyle.print_stats([
+            Stat("Passed checks", lambda: f"[{len(verification_results['success'])}]" + ''.join(
+                [f'\n   • {name}' for name in verification_results['success']]), "success"),
+            Stat("Checks with warnings", lambda: f"[{len(verification_results['warning'])}]" + details(
+                verification_results['warning']), "warning"),
+            Stat("Checks with errors", lambda: f"[{len(verification_results['error'])}]" + details(
+                verification_results['error']), "error"),
+            Stat("Elapsed time", f"[{report['elapsed']:.3f}] s"),
+        ], f"VERIFICATION SUMMARY ([{len(verifications)}])", icon='📊')
 
         # Exit with the appropriate code
         print_if_not_quiet(ConsoleStyle.divider('-'))
         if verification_results['error']:
             print_if_not_quiet(
                 ConsoleStyle.error(f"Verification failed with [{len(verification_results['error'])}] errors."))
-            status = 1
         else:
             print_if_not_quiet(ConsoleStyle.success("Verification passed! Project is ready for building.", icon="🎉"))
-            status = 0
         print_if_not_quiet(ConsoleStyle.divider('-'))
         sys.exit(status)
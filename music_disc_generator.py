@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Skrypt do automatyzacji procesu dodawania nowych muzycznych płyt do pakietu Minecraft.
-Konwertuje pliki MP3 z katalogu src/ na płyty muzyczne z odpowiednimi teksturami i dźwiękami.
+Konwertuje pliki audio (MP3, FLAC, WAV, M4A/AAC, Opus, OGG) z katalogu src/ na płyty muzyczne z odpowiednimi teksturami i dźwiękami.
 """
 
 import os
@@ -9,15 +9,116 @@ import sys
 import json
 import re
 import subprocess
-import shutil
 import hashlib
+import io
+import itertools
 import argparse
+import math
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from console_utils import ConsoleStyle
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from artwork_utils import ArtworkUtils
+from audio_utils import AudioUtils
+from console_utils import ConsoleStyle, Stat
+from output_transaction import OutputTransaction
+from run_metrics import RunMetrics
+from template_engine import TemplateEngine, TemplateError
+
+class DiscTrack:
+    """Stan płyty w bieżącym uruchomieniu - jeden zwarty rekord zamiast osobnego słownika dla każdej cechy"""
+    __slots__ = ("icon", "sound", "source_hash", "audio_key", "volume")
+
+    def __init__(self):
+        # Nazwa tekstury ikony, nazwa dźwięku (pliku OGG), suma kontrolna danych audio pliku źródłowego (liczona raz),
+        # klucz dźwięku i głośności (sound_definitions, musicDiscs.js)
+        self.icon: Optional[str] = None
+        self.sound: Optional[str] = None
+        self.source_hash: Optional[str] = None
+        self.audio_key: Optional[str] = None
+        self.volume: Optional[Tuple[float, float]] = None
+
 
 class MusicDiscGenerator:
-    def __init__(self, project_root: str):
+    # Ustawienia domyślne, nadpisywane sekcją "musicDiscGenerator" w config.json
+    DEFAULT_SETTINGS = {
+        "blockStateEncoding": "dense",
+        # sections: liczba płyt w sekcji (1-15, szesnastą wartością stanu jest "none")
+        "discsPerSection": 15,
+        # dense: liczba slotów w sekcji (2-16) lub "auto" - 16 slotów, planer wybiera liczbę sekcji i banków
+        "slotsPerSection": "auto",
+        # Maksymalna liczba permutacji bloku szafy grającej
+        "permutationBudget": 65536,
+        # shared: jedno przejście po graczach na tick gry dla wszystkich szaf; perBlock: zapytanie o gracze w każdej szafie
+        "jukeboxTickMode": "shared",
+        # Maksymalna liczba szaf obsłużonych w jednym ticku gry (0 = bez limitu), pozostałe czekają w kolejce na kolejne ticki
+        "jukeboxTickBudget": 0,
+        # Wyrównanie głośności płyt (EBU R128): soundDefinitions - głośność w sound_definitions.json,
+        # runtime - głośność odtwarzania w musicDiscs.js, encode - filtr loudnorm przy konwersji do OGG, off - bez zmian
+        "loudnessNormalization": "soundDefinitions",
+        # Docelowa głośność zintegrowana (LUFS)
+        "targetLoudness": -18.0,
+        # Głośność bazowa w sound_definitions.json i maksymalna głośność płyty po wyrównaniu
+        "soundVolume": 0.5,
+        "maxVolume": 1.0,
+        # Liczba płyt w jednym module z metadanymi (0 = wszystkie płyty w jednym module)
+        "catalogShardSize": 0,
+        # Ikony płyt: perDisc - plik PNG i wpis item_texture.json dla każdej płyty; shared - identyczne ikony
+        # (np. okładka albumu, domyślny obrazek) są jednym plikiem i jednym wpisem tekstury
+        "discIconMode": "perDisc",
+        # Profil kodowania OGG wszystkich płyt i profile wybrane dla pojedynczych płyt (nazwa płyty lub pliku -> profil)
+        "encodingProfile": "default",
+        "trackEncodingProfiles": {},
+        # Profile kodowania: quality (libvorbis -q:a, -1..10), mono, sampleRate (Hz), trimSilence (cisza na początku
+        # i końcu utworu); pusty profil to ustawienia domyślne ffmpeg. Profile z config.json uzupełniają te poniżej.
+        "encodingProfiles": {
+            "default": {},
+            "compact": {"quality": 2, "mono": True, "sampleRate": 32000, "trimSilence": True},
+            "high": {"quality": 6},
+        },
+        # Raport JSON przebiegu (czasy etapów, najwolniejsze utwory, CPU względem czasu rzeczywistego); "" = bez raportu
+        "runReport": ".generator_report.json",
+        # Liczba najwolniejszych utworów w raporcie
+        "runReportSlowestTracks": 10,
+    }
+    # dense: płyta zakodowana jako (disc_bank, disc_section, disc_slot); sections: jeden stan enum na sekcję płyt
+    BLOCK_STATE_ENCODINGS = ("dense", "sections")
+    JUKEBOX_TICK_MODES = ("shared", "perBlock")
+    LOUDNESS_NORMALIZATIONS = ("soundDefinitions", "runtime", "encode", "off")
+    DISC_ICON_MODES = ("perDisc", "shared")
+    # Pliki źródłowe w src/ - format jest rozpoznawany z nagłówka pliku, nie z rozszerzenia
+    SOURCE_EXTENSIONS = (".mp3", ".flac", ".wav", ".m4a", ".aac", ".opus", ".ogg", ".oga")
+    # Kilka plików tej samej płyty: wybierany jest gotowy Vorbis, potem źródła bezstratne, a na końcu stratne
+    SOURCE_FORMAT_PRIORITY = ("vorbis", "flac", "wav", "opus", "m4a", "aac", "mp3")
+    # Źródło Ogg/Vorbis w tych granicach trafia do paczki bez ponownego kodowania
+    VORBIS_COPY_MAX_CHANNELS = 2
+    VORBIS_COPY_MAX_SAMPLE_RATE = 48000
+    # Dozwolone opcje profilu kodowania: zakres wartości liczbowych lub typ
+    ENCODING_PROFILE_OPTIONS = {"quality": (-1, 10), "mono": bool, "sampleRate": (8000, 48000), "trimSilence": bool}
+    # Usuwa ciszę z początku strumienia; odwrócenie strumienia pozwala usunąć nim również ciszę z końca
+    TRIM_SILENCE_FILTER = "silenceremove=start_periods=1:start_threshold=-60dB:start_silence=0.1"
+    # Rozmiar ikony płyty (px)
+    ARTWORK_SIZE = 32
+    # Formaty, których okładkę odczytuje ArtworkUtils - bez okładki w pliku nie ma potrzeby uruchamiać ffmpeg
+    EMBEDDED_ARTWORK_FORMATS = ("mp3", "aac", "flac")
+    # Podsumowanie filtra ebur128 ffmpeg: "I: -16.3 LUFS" (ostatnie wystąpienie to wartość dla całego pliku)
+    LOUDNESS_PATTERN = re.compile(r"\bI:\s+(-?\d+(?:\.\d+)?) LUFS")
+    # Bedrock pozwala na maksymalnie 16 wartości jednego stanu bloku i 65536 permutacji bloku
+    MAX_STATE_VALUES = 16
+    MAX_BLOCK_PERMUTATIONS = 65536
+    # Przybliżona pamięć klienta zajmowana przez jedną permutację bloku (szacunek do raportu planera)
+    PERMUTATION_MEMORY_ESTIMATE = 1024
+    # Wartość disc_section == 0 oznacza pustą szafę grającą
+    DENSE_SECTIONS_PER_BANK = MAX_STATE_VALUES - 1
+    # Tablice z musicDiscs.js importowane przez jukeboxManager.js
+    MUSIC_DISC_LOOKUPS = ("getMusicDisc", "discStateLayout", "discIndex", "discStates", "discIdsByStateIndex")
+    # Podzbiór Molang używany w warunkach permutacji: q.block_state('...'), literały, ==, !=, !, &&, ||, nawiasy
+    MOLANG_TOKEN_PATTERN = re.compile(
+        r"\s*(?:q\.block_state\('(?P<state>[^']*)'\)|'(?P<string>[^']*)'|(?P<number>-?\d+(?:\.\d+)?)"
+        r"|(?P<boolean>true|false)|(?P<operator>==|!=|&&|\|\||!|\(|\)))")
+
+    def __init__(self, project_root: str, settings_overrides: Optional[Dict] = None):
         self.project_root = Path(project_root)
         self.src_dir = self.project_root / "src"
         self.bp_dir = self.project_root / "BP"
@@ -39,18 +140,156 @@ class MusicDiscGenerator:
         self.item_texture_file = self.rp_dir / "textures" / "item_texture.json"
         self.item_texture_dist_file = self.rp_template_dir / "textures" / "item_texture.dist.json"
         self.music_discs_file = self.bp_dir / "scripts" / "musicDisc" / "musicDiscs.js"
+        self.music_discs_dist_file = self.bp_template_dir / "scripts" / "musicDisc" / "musicDiscs.dist.js"
+        self.music_disc_shard_dist_file = self.bp_template_dir / "scripts" / "musicDisc" / "musicDiscShard.dist.js"
         self.jukebox_manager_file = self.bp_dir / "scripts" / "jukebox" / "jukeboxManager.js"
         self.jukebox_manager_dist_file = self.bp_template_dir / "scripts" / "jukebox" / "jukeboxManager.dist.js"
         
+        # Katalog plików tymczasowych transakcji zapisu (ten sam system plików co BP/ i RP/)
+        self.staging_dir = self.project_root / ".staging"
+        self.transaction: Optional[OutputTransaction] = None
+        
         # Plik z sumami kontrolnymi
         self.checksums_file = self.project_root / ".ogg_checksums.json"
+        # Plik z pomiarami głośności (nazwa pliku OGG -> rozmiar, mtime, LUFS)
+        self.loudness_file = self.project_root / ".loudness_cache.json"
+        # Plik z liczbą próbek plików OGG (nazwa pliku -> rozmiar, mtime, próbki, częstotliwość)
+        self.durations_file = self.project_root / ".duration_cache.json"
+        # Metadane płyt biblioteki z ostatniego przebiegu w kolejności indeksów (tytuł, artysta, głośność, tickLength)
+        self.catalog_file = self.project_root / ".disc_catalog.json"
+        # Stałe indeksy płyt kodowania dense (identyfikator -> indeks) i układ stanów - przetrwają usunięcie płyty
+        self.state_index_file = self.project_root / ".disc_state_index.json"
+        # Przeskalowane okładki (suma kontrolna obrazka -> PNG) - albumy mają wspólną okładkę
+        self.artwork_cache: Dict[str, Optional[bytes]] = {}
+        # Stan płyt w bieżącym uruchomieniu (ikona, wspólny dźwięk, klucz dźwięku, głośność)
+        self.tracks: Dict[str, DiscTrack] = {}
+        # Metadane płyt z poprzedniego przebiegu (.disc_catalog.json), wczytywane raz
+        self.previous_catalog: Optional[Dict[str, Dict]] = None
+        # Układ stanów dense i indeksy płyt bieżącego uruchomienia, wyliczane raz
+        self.state_plan: Optional[Tuple[Dict[str, int], Dict[str, int]]] = None
+        # Czasy etapów utworów i postęp bieżącego przebiegu
+        self.metrics = RunMetrics()
+        # Statystyki kodowania w bieżącym uruchomieniu (profil -> liczniki, rozmiary i czasy)
+        self.encoding_stats: Dict[str, Dict[str, float]] = {}
+        # Pliki źródłowe (nazwa płyty -> plik) i ich formaty rozpoznane w bieżącym uruchomieniu
+        self.source_files: Optional[Dict[str, Path]] = None
+        self.source_formats: Dict[Path, Optional[str]] = {}
         
         # Namespace
         self.namespace = "personal_music_compilation"
+
+        # Ustawienia generatora
+        self.settings = self._load_settings(settings_overrides)
+
+        # Pliki renderowane z szablonów (wyjście -> (szablon, kontekst)) i wyniki zapisu wygenerowanych plików
+        self.render_jobs = {}
+        self.output_changes = {}
+        # Wygenerowane pliki do usunięcia po renderowaniu (np. nadmiarowe moduły katalogu płyt)
+        self.stale_outputs = []
         
         # Utworzenie katalogów, jeśli nie istnieją
         self._create_directories()
     
+    def _load_settings(self, overrides: Optional[Dict] = None) -> Dict:
+        """Ładuje ustawienia generatora z config.json (sekcja "musicDiscGenerator") i argumentów CLI."""
+        settings = dict(self.DEFAULT_SETTINGS)
+        config_file = self.project_root / "config.json"
+        if config_file.exists():
+            try:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    settings.update(json.load(f).get("musicDiscGenerator", {}))
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading generator settings from [{config_file.name}]: {e}"))
+        if overrides:
+            settings.update({key: value for key, value in overrides.items() if value is not None})
+
+        if settings["blockStateEncoding"] not in self.BLOCK_STATE_ENCODINGS:
+            print(ConsoleStyle.warning(f"Unknown block state encoding [{settings['blockStateEncoding']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['blockStateEncoding']}]"))
+            settings["blockStateEncoding"] = self.DEFAULT_SETTINGS["blockStateEncoding"]
+        if settings["jukeboxTickMode"] not in self.JUKEBOX_TICK_MODES:
+            print(ConsoleStyle.warning(f"Unknown jukebox tick mode [{settings['jukeboxTickMode']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['jukeboxTickMode']}]"))
+            settings["jukeboxTickMode"] = self.DEFAULT_SETTINGS["jukeboxTickMode"]
+        if settings["loudnessNormalization"] not in self.LOUDNESS_NORMALIZATIONS:
+            print(ConsoleStyle.warning(f"Unknown loudness normalization [{settings['loudnessNormalization']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['loudnessNormalization']}]"))
+            settings["loudnessNormalization"] = self.DEFAULT_SETTINGS["loudnessNormalization"]
+        if settings["discIconMode"] not in self.DISC_ICON_MODES:
+            print(ConsoleStyle.warning(f"Unknown disc icon mode [{settings['discIconMode']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['discIconMode']}]"))
+            settings["discIconMode"] = self.DEFAULT_SETTINGS["discIconMode"]
+        valid_ranges = {
+            "discsPerSection": (1, self.MAX_STATE_VALUES - 1),
+            "slotsPerSection": (2, self.MAX_STATE_VALUES),
+            "permutationBudget": (2, self.MAX_BLOCK_PERMUTATIONS),
+            "jukeboxTickBudget": (0, 1000000),
+            "targetLoudness": (-70.0, 0.0),
+            "soundVolume": (0.01, 10.0),
+            "maxVolume": (0.01, 10.0),
+            "catalogShardSize": (0, 100000),
+            "runReportSlowestTracks": (0, 100000),
+        }
+        for key, (minimum, maximum) in valid_ranges.items():
+            value = settings[key]
+            if value == "auto" and key == "slotsPerSection":
+                continue
+            value_types = (int, float) if isinstance(minimum, float) else int
+            if not isinstance(value, value_types) or isinstance(value, bool) or not minimum <= value <= maximum:
+                print(ConsoleStyle.warning(f"Invalid [{key}] setting [{value}] (allowed {minimum}-{maximum}), "
+                                           f"using [{self.DEFAULT_SETTINGS[key]}]"))
+                settings[key] = self.DEFAULT_SETTINGS[key]
+        if not isinstance(settings["runReport"], str):
+            print(ConsoleStyle.warning(f"Invalid [runReport] setting [{settings['runReport']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['runReport']}]"))
+            settings["runReport"] = self.DEFAULT_SETTINGS["runReport"]
+        self._validate_encoding_profiles(settings)
+        return settings
+
+    def _validate_encoding_profiles(self, settings: Dict):
+        """Sprawdza profile kodowania i wybór profili; nieprawidłowe opcje i profile są pomijane z ostrzeżeniem."""
+        profiles = dict(self.DEFAULT_SETTINGS["encodingProfiles"])
+        if isinstance(settings["encodingProfiles"], dict):
+            profiles.update(settings["encodingProfiles"])
+        else:
+            print(ConsoleStyle.warning("Invalid [encodingProfiles] setting, using default profiles"))
+        for name, profile in list(profiles.items()):
+            if not isinstance(profile, dict):
+                print(ConsoleStyle.warning(f"Invalid encoding profile [{name}], skipping"))
+                del profiles[name]
+                continue
+            valid = {}
+            for option, value in profile.items():
+                allowed = self.ENCODING_PROFILE_OPTIONS.get(option)
+                if allowed is bool:
+                    is_valid = isinstance(value, bool)
+                elif allowed is not None:
+                    is_valid = value is None or isinstance(value, int) and not isinstance(value, bool) \
+                        and allowed[0] <= value <= allowed[1]
+                else:
+                    is_valid = False
+                if is_valid:
+                    valid[option] = value
+                else:
+                    print(ConsoleStyle.warning(f"Invalid option [{option}] = [{value}] of encoding profile [{name}], "
+                                               f"skipping"))
+            profiles[name] = valid
+        settings["encodingProfiles"] = profiles
+
+        if settings["encodingProfile"] not in profiles:
+            print(ConsoleStyle.warning(f"Unknown encoding profile [{settings['encodingProfile']}], "
+                                       f"using [{self.DEFAULT_SETTINGS['encodingProfile']}]"))
+            settings["encodingProfile"] = self.DEFAULT_SETTINGS["encodingProfile"]
+        track_profiles = {}
+        if isinstance(settings["trackEncodingProfiles"], dict):
+            for track, name in settings["trackEncodingProfiles"].items():
+                if name in profiles:
+                    # Klucz to nazwa płyty lub nazwa pliku źródłowego
+                    track_profiles[self._to_snake_case(track)] = name
+                else:
+                    print(ConsoleStyle.warning(f"Unknown encoding profile [{name}] for track [{track}], skipping"))
+        settings["trackEncodingProfiles"] = track_profiles
+
     def _create_directories(self):
         """Tworzy niezbędne katalogi, jeśli nie istnieją."""
         directories = [
@@ -83,63 +322,237 @@ class MusicDiscGenerator:
         # Konwertuj na małe litery
         return text.lower()
     
-    def _get_mp3_files(self, specific_file: Optional[str] = None) -> List[Path]:
-        """Zwraca listę plików MP3 z katalogu src/ lub konkretny plik."""
+    def _get_source_format(self, source_file: Path) -> Optional[str]:
+        """Zwraca format pliku źródłowego rozpoznany z nagłówka (None dla nieobsługiwanego formatu)."""
+        if source_file not in self.source_formats:
+            self.source_formats[source_file] = AudioUtils.detect_audio_format(str(source_file))
+        return self.source_formats[source_file]
+
+    def _get_source_priority(self, source_file: Path) -> int:
+        """Zwraca priorytet pliku źródłowego płyty (mniejszy = lepszy)."""
+        source_format = self._get_source_format(source_file)
+        if source_format in self.SOURCE_FORMAT_PRIORITY:
+            return self.SOURCE_FORMAT_PRIORITY.index(source_format)
+        return len(self.SOURCE_FORMAT_PRIORITY)
+
+    def _find_source_files(self) -> Dict[str, Path]:
+        """Zwraca pliki audio z src/ według nazwy płyty; dla kilku plików jednej płyty wybiera najlepsze źródło."""
+        if self.source_files is not None:
+            return self.source_files
+        candidates = {}
+        # Stała kolejność plików - od niej zależą indeksy płyt zapisane w stanach bloku
+        for source_file in sorted(self.src_dir.glob("*")):
+            if source_file.is_file() and source_file.suffix.lower() in self.SOURCE_EXTENSIONS:
+                candidates.setdefault(self._to_snake_case(source_file.name), []).append(source_file)
+        self.source_files = {}
+        for disc_name, files in candidates.items():
+            if len(files) > 1:
+                files.sort(key=self._get_source_priority)
+                print(ConsoleStyle.warning(f"Found [{len(files)}] source files for disc [{disc_name}], "
+                                           f"using [{files[0].name}]"))
+            self.source_files[disc_name] = files[0]
+        return self.source_files
+
+    def _get_source_files(self, specific_file: Optional[str] = None) -> List[Path]:
+        """Zwraca listę plików audio z katalogu src/ lub konkretny plik."""
         if specific_file:
             file_path = self.src_dir / specific_file
-            if file_path.exists() and file_path.suffix.lower() == '.mp3':
-                print(ConsoleStyle.info(f"Processing specific file [{specific_file}]"))
-                return [file_path]
+            if file_path.is_file() and file_path.suffix.lower() in self.SOURCE_EXTENSIONS:
+                # Ten sam plik źródłowy płyty co w pełnym przebiegu
+                source_file = self._find_source_files().get(self._to_snake_case(file_path.name), file_path)
+                if source_file != file_path:
+                    print(ConsoleStyle.warning(f"Using [{source_file.name}] instead of [{specific_file}]"))
+                print(ConsoleStyle.info(f"Processing specific file [{source_file.name}]"))
+                # Płyty ze wspólnym dźwiękiem są przetwarzane razem (zmiana pliku zmienia dźwięk wszystkich płyt)
+                catalog = self._load_catalog() or {}
+                disc_name = self._to_snake_case(source_file.name)
+                sound = catalog.get(disc_name, {}).get("sound", disc_name)
+                sharing = {name for name, entry in catalog.items() if name != disc_name and entry.get("sound", name) == sound}
+                if not sharing:
+                    return [source_file]
+                print(ConsoleStyle.info(f"Processing discs sharing audio with [{disc_name}]: "
+                                        f"{ConsoleStyle.format_list(sharing)}"))
+                return [library_file if name != disc_name else source_file
+                        for name, library_file in self._find_source_files().items() if name in sharing or name == disc_name]
             else:
-                print(ConsoleStyle.error(f"File [{specific_file}] does not exist or is not an MP3 file!"))
+                print(ConsoleStyle.error(f"File [{specific_file}] does not exist or is not a supported audio file!"))
                 return []
         
         if not self.src_dir.exists():
             print(ConsoleStyle.error(f"Katalog [{self.src_dir}] nie istnieje!"))
             return []
         
-        mp3_files = list(self.src_dir.glob("*.mp3"))
-        print(ConsoleStyle.info(f"Found [{len(mp3_files)}] MP3 files in [{self.src_dir}]"))
-        return mp3_files
+        source_files = list(self._find_source_files().values())
+        print(ConsoleStyle.info(f"Found [{len(source_files)}] audio files in [{self.src_dir}]"))
+        return source_files
+
+    def _get_library_disc_names(self, processed_disc_names: List[str] = ()) -> List[str]:
+        """
+        Zwraca płyty biblioteki w kolejności pełnego przebiegu: pliki audio z src/, które mają już plik OGG lub zostały
+        właśnie przetworzone. Pozwala zaktualizować pliki zbiorcze bez ponownej konwersji pozostałych płyt.
+        """
+        disc_names = []
+        for source_file in self._get_source_files():
+            disc_name = self._to_snake_case(source_file.name)
+            if disc_name in processed_disc_names or self._exists(self.sounds_dir / f"{self._get_disc_sound(disc_name)}.ogg"):
+                disc_names.append(disc_name)
+        return disc_names
     
-    def _extract_artwork(self, mp3_file: Path, output_file: Path) -> bool:
-        """Wyciąga artwork z pliku MP3 lub używa domyślnego obrazka."""
+    def _load_catalog(self) -> Optional[Dict[str, Dict]]:
+        """Zwraca metadane płyt z poprzedniego przebiegu (.disc_catalog.json) albo None, gdy pliku nie ma."""
+        if self.previous_catalog is None and self.catalog_file.exists():
+            try:
+                with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                    self.previous_catalog = json.load(f)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading disc catalog: {e}"))
+        return self.previous_catalog
+
+    def _get_audio_key(self, source_file: Path, disc_name: str) -> str:
+        """
+        Zwraca klucz dźwięku płyty: sumę kontrolną danych audio (bez znaczników) z filtrami i opcjami kodera profilu.
+        Płyty o tym samym kluczu dają identyczny plik OGG; ten sam klucz wskazuje wpis w .ogg_checksums.json.
+        Plik źródłowy jest czytany tylko przy pierwszym wywołaniu dla płyty - suma jest zapamiętywana w DiscTrack.
+        """
+        _, profile = self._get_encoding_profile(disc_name)
+        audio_filters, codec_options = self._get_encoding_options(profile)
+        audio_filter = ",".join(audio_filters)
+        track = self._get_track(disc_name)
+        if track.source_hash is None:
+            with self.metrics.stage("hash", disc_name):
+                track.source_hash = AudioUtils.audio_content_hash(str(source_file))
+        return ":".join([track.source_hash,
+                         *([audio_filter] if audio_filter else []), *codec_options])
+
+    def _get_track(self, disc_name: str) -> DiscTrack:
+        """Zwraca rekord stanu płyty w bieżącym uruchomieniu (tworzony przy pierwszym użyciu)."""
+        track = self.tracks.get(disc_name)
+        if track is None:
+            track = self.tracks[disc_name] = DiscTrack()
+        return track
+
+    def _get_disc_sound(self, disc_name: str) -> str:
+        """Zwraca nazwę dźwięku płyty (pliku OGG i wpisu record.*) - płyty z identycznym dźwiękiem mają wspólny."""
+        track = self.tracks.get(disc_name)
+        if track is not None and track.sound is not None:
+            return track.sound
+        return (self._load_catalog() or {}).get(disc_name, {}).get("sound", disc_name)
+
+    def _get_disc_audio_key(self, disc_name: str) -> Optional[str]:
+        """Zwraca klucz dźwięku płyty z bieżącego uruchomienia lub z poprzedniego przebiegu."""
+        track = self.tracks.get(disc_name)
+        if track is not None and track.audio_key is not None:
+            return track.audio_key
+        return (self._load_catalog() or {}).get(disc_name, {}).get("audio")
+
+    def _print_deduplication_report(self, disc_names: List[str]):
+        """Wypisuje, ile płyt korzysta z dźwięku innej płyty i ile miejsca oszczędza wspólny plik OGG."""
+        shared = [disc_name for disc_name in disc_names if self._get_disc_sound(disc_name) != disc_name]
+        if not shared:
+            return
+        saved_bytes = 0
+        for disc_name in shared:
+            ogg_file = self._resolve(self.sounds_dir / f"{self._get_disc_sound(disc_name)}.ogg")
+            if ogg_file.exists():
+                saved_bytes += ogg_file.stat().st_size
+        sounds = {self._get_disc_sound(disc_name) for disc_name in shared}
+        ConsoleStyle.print_stats([
+            Stat("Discs sharing audio", f"[{len(shared)}] discs -> [{len(sounds)}] sounds"),
+            Stat("OGG files saved", f"[{len(shared)}]"),
+            Stat("Size saved", f"[{saved_bytes / 1048576:.2f}] MB"),
+        ], "Audio deduplication")
+
+    def _resize_artwork(self, image_data: bytes) -> Optional[bytes]:
+        """
+        Skaluje obrazek do ikony płyty (PNG) w procesie przez Pillow lub - bez Pillow - przez ffmpeg (stdin -> stdout).
+        Wynik jest zapamiętywany według sumy kontrolnej obrazka, więc każda okładka jest skalowana raz.
+        """
+        key = hashlib.md5(image_data).hexdigest()
+        if key in self.artwork_cache:
+            return self.artwork_cache[key]
+        png = None
         try:
-            # Próbuj wyciągnąć artwork z MP3
-            cmd = [
-                "ffmpeg", "-y", "-i", str(mp3_file),
-                "-vf", "select=eq(n\\,0),scale=32:32", "-vframes", "1",
-                str(output_file)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0 and output_file.exists() and output_file.stat().st_size > 0:
-                print(ConsoleStyle.success(f"Extracted artwork from [{mp3_file.name}] (32x32px)"))
-                return True
+            if ArtworkUtils.has_pillow():
+                png = ArtworkUtils.resize_image(image_data, self.ARTWORK_SIZE)
             else:
-                # Użyj domyślnego obrazka
-                default_texture = self.rp_dir / "pack_icon.png"
-                if default_texture.exists():
-                    # Skopiuj i przeskaluj domyślny obrazek
-                    cmd = [
-                        "ffmpeg", "-y", "-i", str(default_texture),
-                        "-vf", "scale=32:32",
-                        str(output_file)
-                    ]
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                    if result.returncode == 0:
-                        print(ConsoleStyle.success(f"Used default image for [{mp3_file.name}] (32x32px)"))
-                        return True
-                    else:
-                        print(ConsoleStyle.warning(f"Cannot scale default image for [{mp3_file.name}]"))
-                        return False
-                else:
-                    print(ConsoleStyle.warning(f"Cannot find default image for [{mp3_file.name}]"))
-                    return False
-                    
+                result = subprocess.run([
+                    "ffmpeg", "-v", "error", "-i", "pipe:0",
+                    "-vf", f"scale={self.ARTWORK_SIZE}:{self.ARTWORK_SIZE}", "-vframes", "1",
+                    "-f", "image2pipe", "-vcodec", "png", "pipe:1"
+                ], input=image_data, capture_output=True)
+                if result.returncode == 0 and result.stdout:
+                    png = result.stdout
+        except Exception as e:
+            print(ConsoleStyle.warning(f"Cannot scale image: {e}"))
+        self.artwork_cache[key] = png
+        return png
+
+    def _save_disc_icon(self, disc_name: str, png: bytes):
+        """Zapisuje ikonę płyty; w trybie shared identyczne ikony są jednym plikiem nazwanym sumą kontrolną obrazka."""
+        if self.settings["discIconMode"] == "shared":
+            icon = f"music_disc_icon_{hashlib.md5(png).hexdigest()[:12]}"
+        else:
+            icon = f"music_disc_{disc_name}"
+        self._write_bytes(self.textures_dir / f"{icon}.png", png)
+        self._get_track(disc_name).icon = icon
+
+    def _get_disc_icon(self, disc_name: str) -> str:
+        """Zwraca nazwę tekstury ikony płyty (z bieżącego uruchomienia, z poprzedniego przebiegu lub z pliku itemu płyty)."""
+        track = self.tracks.get(disc_name)
+        if track is not None and track.icon is not None:
+            return track.icon
+        icon = (self._load_catalog() or {}).get(disc_name, {}).get("icon")
+        if icon:
+            return icon
+        item_file = self.items_dir / f"music_disc_{disc_name}.item.json"
+        if self._exists(item_file):
+            try:
+                with open(self._resolve(item_file), 'r', encoding='utf-8') as f:
+                    icon = json.load(f)["minecraft:item"]["components"]["minecraft:icon"]
+                if icon.startswith(f"{self.namespace}:"):
+                    return icon[len(self.namespace) + 1:]
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Cannot read icon of [{item_file.name}]: {e}"))
+        return f"music_disc_{disc_name}"
+
+    def _extract_artwork(self, source_file: Path, disc_name: str) -> bool:
+        """Wyciąga artwork z pliku audio lub używa domyślnego obrazka."""
+        try:
+            # Okładka z ID3 (APIC) lub bloku PICTURE FLAC jest odczytywana bez uruchamiania ffmpeg
+            png = None
+            picture = ArtworkUtils.read_embedded_picture(str(source_file))
+            if picture is not None:
+                png = self._resize_artwork(picture)
+            elif self._get_source_format(source_file) not in self.EMBEDDED_ARTWORK_FORMATS:
+                # Pozostałe formaty (M4A, Ogg) - okładka przez ffmpeg
+                result = subprocess.run([
+                    "ffmpeg", "-v", "error", "-i", str(source_file),
+                    "-vf", f"select=eq(n\\,0),scale={self.ARTWORK_SIZE}:{self.ARTWORK_SIZE}", "-vframes", "1",
+                    "-f", "image2pipe", "-vcodec", "png", "pipe:1"
+                ], capture_output=True)
+                if result.returncode == 0 and result.stdout:
+                    png = result.stdout
+
+            if png is not None:
+                self._save_disc_icon(disc_name, png)
+                print(ConsoleStyle.success(f"Extracted artwork from [{source_file.name}] ({self.ARTWORK_SIZE}x{self.ARTWORK_SIZE}px)"))
+                return True
+
+            # Użyj domyślnego obrazka (skalowanego tylko raz w całym przebiegu)
+            default_texture = self.rp_dir / "pack_icon.png"
+            if not default_texture.exists():
+                print(ConsoleStyle.warning(f"Cannot find default image for [{source_file.name}]"))
+                return False
+            png = self._resize_artwork(default_texture.read_bytes())
+            if png is None:
+                print(ConsoleStyle.warning(f"Cannot scale default image for [{source_file.name}]"))
+                return False
+            self._save_disc_icon(disc_name, png)
+            print(ConsoleStyle.success(f"Used default image for [{source_file.name}] ({self.ARTWORK_SIZE}x{self.ARTWORK_SIZE}px)"))
+            return True
+
         except Exception as e:
-            print(ConsoleStyle.error(f"Error extracting artwork from [{mp3_file.name}]: {e}"))
+            print(ConsoleStyle.error(f"Error extracting artwork from [{source_file.name}]: {e}"))
             return False
 
     @staticmethod
@@ -153,9 +566,9 @@ class MusicDiscGenerator:
 
     def _load_checksums(self) -> Dict[str, str]:
         """Ładuje sumy kontrolne z pliku."""
-        if self.checksums_file.exists():
+        if self._exists(self.checksums_file):
             try:
-                with open(self.checksums_file, 'r', encoding='utf-8') as f:
+                with open(self._resolve(self.checksums_file), 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
                 print(ConsoleStyle.warning(f"Error loading checksums: {e}"))
@@ -164,48 +577,362 @@ class MusicDiscGenerator:
     def _save_checksums(self, checksums: Dict[str, str]):
         """Zapisuje sumy kontrolne do pliku."""
         try:
-            with open(self.checksums_file, 'w', encoding='utf-8') as f:
-                json.dump(checksums, f, indent=4, ensure_ascii=False)
+            self._write_json(self.checksums_file, checksums)
         except Exception as e:
             print(ConsoleStyle.warning(f"Error saving checksums: {e}"))
     
-    def _convert_mp3_to_ogg(self, mp3_file: Path, ogg_file: Path) -> bool:
-        """Konwertuje plik MP3 do formatu OGG ze sprawdzaniem sum kontrolnych."""
+    def _get_encoding_profile(self, disc_name: str) -> Tuple[str, Dict]:
+        """Zwraca nazwę i opcje profilu kodowania płyty (profil płyty lub globalny)."""
+        name = self.settings["trackEncodingProfiles"].get(disc_name, self.settings["encodingProfile"])
+        return name, self.settings["encodingProfiles"][name]
+
+    def _get_encoding_options(self, profile: Dict) -> Tuple[List[str], List[str]]:
+        """Zwraca filtry audio i opcje kodera ffmpeg dla profilu kodowania."""
+        audio_filters = []
+        if profile.get("trimSilence"):
+            audio_filters += [self.TRIM_SILENCE_FILTER, "areverse", self.TRIM_SILENCE_FILTER, "areverse"]
+        if self.settings["loudnessNormalization"] == "encode":
+            audio_filters.append(f"loudnorm=I={self.settings['targetLoudness']}:TP=-1.5:LRA=11")
+        codec_options = []
+        if profile.get("quality") is not None:
+            codec_options += ["-q:a", str(profile["quality"])]
+        if profile.get("mono"):
+            codec_options += ["-ac", "1"]
+        if profile.get("sampleRate"):
+            codec_options += ["-ar", str(profile["sampleRate"])]
+        return audio_filters, codec_options
+
+    @staticmethod
+    def _describe_encoding_profile(profile: Dict) -> str:
+        """Zwraca krótki opis opcji profilu kodowania."""
+        parts = []
+        if profile.get("quality") is not None:
+            parts.append(f"quality {profile['quality']}")
+        if profile.get("mono"):
+            parts.append("mono")
+        if profile.get("sampleRate"):
+            parts.append(f"{profile['sampleRate']} Hz")
+        if profile.get("trimSilence"):
+            parts.append("trim silence")
+        return ", ".join(parts) or "ffmpeg defaults"
+
+    def _copy_vorbis_source(self, source_file: Path, ogg_file: Path, profile: Dict) -> bool:
+        """
+        Umieszcza źródło Ogg/Vorbis w paczce bez ponownego kodowania (twarde dowiązanie lub kopia).
+        Zwraca False, gdy plik jest niekompletny albo nie spełnia profilu kodowania (jakość, kanały, częstotliwość).
+        """
+        if profile.get("quality") is not None or profile.get("trimSilence"):
+            return False
+        info = AudioUtils.read_ogg_vorbis_info(str(source_file))
+        if 'error' in info or not info['complete']:
+            return False
+        max_channels = 1 if profile.get("mono") else self.VORBIS_COPY_MAX_CHANNELS
+        if info['channels'] > max_channels:
+            return False
+        if profile.get("sampleRate") and info['sample_rate'] != profile["sampleRate"] \
+                or info['sample_rate'] > self.VORBIS_COPY_MAX_SAMPLE_RATE:
+            return False
+        if ogg_file.exists():
+            ogg_file.unlink()
+        try:
+            # Plik w BP/RP jest zawsze podmieniany przez os.replace, więc dowiązany plik źródłowy nie jest nadpisywany
+            os.link(source_file, ogg_file)
+        except OSError:
+            shutil.copyfile(source_file, ogg_file)
+        return True
+
+    def _probe_audio(self, disc_name: str, ogg_file: Path) -> float:
+        """Odczytuje długość pliku OGG z nagłówków (etap probe) i dolicza ją do postępu przebiegu."""
+        with self.metrics.stage("probe", disc_name):
+            duration = AudioUtils.read_ogg_vorbis_info(str(ogg_file)).get('duration', 0.0)
+        self.metrics.add_audio(disc_name, duration)
+        return duration
+
+    def _record_encoding(self, profile_name: str, result: str, source_file: Optional[Path] = None,
+                         ogg_file: Optional[Path] = None, previous_size: Optional[int] = None, seconds: float = 0.0,
+                         audio_seconds: float = 0.0):
+        """Zapisuje wynik kodowania płyty (encoded, copied, skipped) do raportu profili kodowania."""
+        stats = self.encoding_stats.setdefault(profile_name, {
+            "encoded": 0, "copied": 0, "skipped": 0, "source_bytes": 0, "ogg_bytes": 0,
+            "replaced_bytes": 0, "previous_bytes": 0, "encode_seconds": 0.0, "audio_seconds": 0.0,
+        })
+        stats[result] += 1
+        if result == "skipped":
+            return
+        ogg_size = ogg_file.stat().st_size
+        stats["source_bytes"] += source_file.stat().st_size
+        stats["ogg_bytes"] += ogg_size
+        if previous_size is not None:
+            # Poprzednia wersja pliku OGG (np. z innym profilem) - różnica rozmiaru po zmianie profilu
+            stats["replaced_bytes"] += ogg_size
+            stats["previous_bytes"] += previous_size
+        if result == "encoded":
+            stats["encode_seconds"] += seconds
+            stats["audio_seconds"] += audio_seconds
+
+    def _print_encoding_report(self):
+        """Wypisuje raport profili kodowania: rozmiar przed i po kodowaniu oraz czas kodowania."""
+        for name, stats in self.encoding_stats.items():
+            profile = self.settings["encodingProfiles"][name]
+            table = [
+                Stat("Options", self._describe_encoding_profile(profile)),
+                Stat("Tracks", f"[{stats['encoded']}] encoded, [{stats['copied']}] copied, "
+                               f"[{stats['skipped']}] unchanged"),
+            ]
+            if stats["source_bytes"]:
+                delta = (stats["ogg_bytes"] - stats["source_bytes"]) / stats["source_bytes"] * 100
+                table.append(Stat("Source → OGG size", f"[{stats['source_bytes'] / 1048576:.2f}] MB → "
+                                                     f"[{stats['ogg_bytes'] / 1048576:.2f}] MB ([{delta:+.1f}]%)"))
+            if stats["previous_bytes"]:
+                delta = (stats["replaced_bytes"] - stats["previous_bytes"]) / stats["previous_bytes"] * 100
+                table.append(Stat("Previous → new OGG size", f"[{stats['previous_bytes'] / 1048576:.2f}] MB → "
+                                                           f"[{stats['replaced_bytes'] / 1048576:.2f}] MB "
+                                                           f"([{delta:+.1f}]%)"))
+            if stats["encoded"]:
+                speed = stats["audio_seconds"] / stats["encode_seconds"] if stats["encode_seconds"] else 0.0
+                table.append(Stat("Encode time", f"[{stats['encode_seconds']:.1f}] s ([{speed:.1f}]x realtime)"))
+            ConsoleStyle.print_stats(table, f"Encoding profile [{name}]")
+
+    def _convert_to_ogg(self, source_file: Path, ogg_file: Path) -> bool:
+        """Konwertuje plik audio do formatu OGG (wg profilu kodowania płyty) ze sprawdzaniem sum kontrolnych."""
         # Sprawdź, czy plik OGG już istnieje i ma tę samą sumę kontrolną
         checksums = self._load_checksums()
-        mp3_checksum = self._get_file_checksum(mp3_file)
-        
-        if ogg_file.exists() and mp3_checksum in checksums:
-            existing_checksum = self._get_file_checksum(ogg_file)
-            if existing_checksum == checksums[mp3_checksum]:
-                print(ConsoleStyle.info(f"Skipped conversion [{mp3_file.name}] (OGG file already exists)"))
+        disc_name = ogg_file.stem
+
+        # Klucz dźwięku (suma danych audio z filtrami, w tym loudnorm, i opcjami kodera) - bez ponownego czytania źródła
+        source_checksum = self._get_audio_key(source_file, disc_name)
+        profile_name, profile = self._get_encoding_profile(disc_name)
+        audio_filters, codec_options = self._get_encoding_options(profile)
+        audio_filter = ",".join(audio_filters)
+        print(ConsoleStyle.info(f"Encoding profile: [{profile_name}] ({self._describe_encoding_profile(profile)})"))
+
+        if ogg_file.exists() and source_checksum not in checksums:
+            # Wpisy z poprzedniej wersji są kluczowane sumą całego pliku - przenieś wpis jednorazowo
+            with self.metrics.stage("hash", disc_name):
+                legacy_checksum = ":".join([self._get_file_checksum(source_file),
+                                            *([audio_filter] if audio_filter else []), *codec_options])
+            if legacy_checksum in checksums:
+                checksums[source_checksum] = checksums.pop(legacy_checksum)
+                self._save_checksums(checksums)
+
+        if ogg_file.exists() and source_checksum in checksums:
+            with self.metrics.stage("hash", disc_name):
+                existing_checksum = self._get_file_checksum(ogg_file)
+            if existing_checksum == checksums[source_checksum]:
+                print(ConsoleStyle.info(f"Skipped conversion [{source_file.name}] (OGG file already exists)"))
+                self._probe_audio(disc_name, ogg_file)
+                self._record_encoding(profile_name, "skipped")
                 return True
         
+        previous_size = ogg_file.stat().st_size if ogg_file.exists() else None
         try:
+            # Zapis do pliku tymczasowego transakcji - przerwana konwersja nie zostawi obciętego pliku OGG
+            staged_ogg_file = self._target(ogg_file)
+
+            # Gotowy Ogg/Vorbis zgodny z profilem nie wymaga kodowania (filtry, np. loudnorm, wymagają)
+            with self.metrics.stage("convert", disc_name):
+                copied = not audio_filter and self._get_source_format(source_file) == "vorbis" \
+                    and self._copy_vorbis_source(source_file, staged_ogg_file, profile)
+            if copied:
+                with self.metrics.stage("hash", disc_name):
+                    checksums[source_checksum] = self._get_file_checksum(staged_ogg_file)
+                self._save_checksums(checksums)
+                print(ConsoleStyle.success(f"Copied [{source_file.name}] to [{ogg_file.name}] (Ogg/Vorbis, no re-encoding)"))
+                self._record_encoding(profile_name, "copied", source_file, staged_ogg_file, previous_size,
+                                      audio_seconds=self._probe_audio(disc_name, staged_ogg_file))
+                return True
+
+            # Plik może być dowiązaniem do pliku źródłowego z poprzedniej kopii - nie nadpisuj go w miejscu
+            if staged_ogg_file.exists():
+                staged_ogg_file.unlink()
+            # Źródła bezstratne (FLAC, WAV) są kodowane bezpośrednio do Vorbis
             cmd = [
-                "ffmpeg", "-y", "-i", str(mp3_file),
+                "ffmpeg", "-y", "-i", str(source_file),
                 "-vn", "-acodec", "libvorbis",
-                str(ogg_file)
+                *codec_options,
+                *(["-af", audio_filter] if audio_filter else []),
+                str(staged_ogg_file)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            started = time.perf_counter()
+            with self.metrics.stage("convert", disc_name):
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            encode_seconds = time.perf_counter() - started
             
-            if result.returncode == 0 and ogg_file.exists():
+            if result.returncode == 0 and staged_ogg_file.exists():
                 # Zapisz sumę kontrolną
-                ogg_checksum = self._get_file_checksum(ogg_file)
-                checksums[mp3_checksum] = ogg_checksum
+                with self.metrics.stage("hash", disc_name):
+                    ogg_checksum = self._get_file_checksum(staged_ogg_file)
+                checksums[source_checksum] = ogg_checksum
                 self._save_checksums(checksums)
                 
-                print(ConsoleStyle.success(f"Converted [{mp3_file.name}] to [{ogg_file.name}]"))
+                print(ConsoleStyle.success(f"Converted [{source_file.name}] to [{ogg_file.name}]"))
+                self._record_encoding(profile_name, "encoded", source_file, staged_ogg_file, previous_size,
+                                      encode_seconds, self._probe_audio(disc_name, staged_ogg_file))
                 return True
             else:
-                print(ConsoleStyle.error(f"Error converting [{mp3_file.name}]: {result.stderr}"))
+                print(ConsoleStyle.error(f"Error converting [{source_file.name}]: {result.stderr}"))
                 return False
                 
         except Exception as e:
-            print(ConsoleStyle.error(f"Error converting [{mp3_file.name}]: {e}"))
+            print(ConsoleStyle.error(f"Error converting [{source_file.name}]: {e}"))
             return False
     
+    def _measure_loudness(self, ogg_file: Path) -> Optional[float]:
+        """Mierzy głośność zintegrowaną pliku (EBU R128, filtr ebur128 ffmpeg) w LUFS."""
+        cmd = ["ffmpeg", "-hide_banner", "-nostats", "-i", str(ogg_file), "-af", "ebur128", "-f", "null", "-"]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except OSError:
+            return None
+        matches = self.LOUDNESS_PATTERN.findall(result.stderr)
+        if result.returncode != 0 or not matches:
+            return None
+        return float(matches[-1])
+
+    def _get_disc_volumes(self, disc_names: List[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Zwraca głośności płyt jako (głośność w sound_definitions.json, głośność odtwarzania w musicDiscs.js).
+        Pomiary są wykonywane równolegle i zapisywane według rozmiaru i mtime pliku OGG, więc niezmienione pliki nie są
+        ponownie mierzone ani odczytywane.
+        """
+        mode = self.settings["loudnessNormalization"]
+        sound_volume = self.settings["soundVolume"]
+        if mode in ("encode", "off"):
+            return {disc_name: (sound_volume, 1) for disc_name in disc_names}
+        pending = [disc_name for disc_name in disc_names if self._get_track(disc_name).volume is None]
+        if not pending:
+            return {disc_name: self.tracks[disc_name].volume for disc_name in disc_names}
+
+        # Pomiary z pliku i bieżącego uruchomienia
+        cache = {}
+        if self._exists(self.loudness_file):
+            try:
+                with open(self._resolve(self.loudness_file), 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading loudness cache: {e}"))
+        # Pomiar jest aktualny, gdy rozmiar i mtime pliku OGG się nie zmieniły (bez odczytu pliku)
+        measured = {}
+        missing = []
+        for disc_name in pending:
+            ogg_file = self._resolve(self.sounds_dir / f"{disc_name}.ogg")
+            try:
+                file_stat = ogg_file.stat()
+            except OSError:
+                continue
+            cached = cache.get(f"{disc_name}.ogg")
+            if isinstance(cached, dict) and cached.get('mtime') == file_stat.st_mtime_ns \
+                    and cached.get('size') == file_stat.st_size:
+                measured[disc_name] = cached['loudness']
+            else:
+                missing.append((disc_name, ogg_file, file_stat))
+
+        if missing:
+            # Pomiary w starszym formacie (suma kontrolna OGG -> LUFS) są przenoszone bez ponownego pomiaru
+            legacy = {key: value for key, value in cache.items() if not isinstance(value, dict)}
+            cache = {key: value for key, value in cache.items() if isinstance(value, dict)}
+            to_measure = []
+            for disc_name, ogg_file, file_stat in missing:
+                loudness = legacy.get(self._get_file_checksum(ogg_file)) if legacy else None
+                if loudness is None:
+                    to_measure.append((disc_name, ogg_file, file_stat))
+                    continue
+                measured[disc_name] = loudness
+                cache[f"{disc_name}.ogg"] = {'mtime': file_stat.st_mtime_ns, 'size': file_stat.st_size,
+                                              'loudness': loudness}
+
+            if to_measure:
+                ConsoleStyle.print_section("Measuring loudness")
+
+                def measure(item: Tuple[str, Path, os.stat_result]) -> Optional[float]:
+                    # Wątki robocze zgłaszają czas pomiaru jako etap probe płyty
+                    with self.metrics.stage("probe", item[0]):
+                        return self._measure_loudness(item[1])
+
+                with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                    results = executor.map(measure, to_measure)
+                    for (disc_name, ogg_file, file_stat), loudness in zip(to_measure, results):
+                        if loudness is None:
+                            print(ConsoleStyle.warning(f"Cannot measure loudness of [{disc_name}]"))
+                            continue
+                        measured[disc_name] = loudness
+                        cache[f"{disc_name}.ogg"] = {'mtime': file_stat.st_mtime_ns, 'size': file_stat.st_size,
+                                                      'loudness': loudness}
+                        print(ConsoleStyle.info(f"Measured [{disc_name}]: {loudness:.1f} LUFS"))
+            try:
+                self._write_json(self.loudness_file, cache)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error saving loudness cache: {e}"))
+
+        for disc_name in pending:
+            loudness = measured.get(disc_name)
+            # Wzmocnienie do docelowej głośności, ograniczone do maxVolume
+            gain = 1 if loudness is None else 10 ** ((self.settings["targetLoudness"] - loudness) / 20)
+            if mode == "soundDefinitions":
+                self.tracks[disc_name].volume = (round(min(sound_volume * gain, self.settings["maxVolume"]), 3), 1)
+            else:
+                self.tracks[disc_name].volume = (sound_volume, round(min(gain, self.settings["maxVolume"]), 3))
+        return {disc_name: self.tracks[disc_name].volume for disc_name in disc_names}
+
+    def _get_tick_lengths(self, disc_names: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Zwraca długość płyt w tickach z dokładnej liczby próbek (pozycja granule ostatniej strony Ogg) oraz listę błędów.
+        Wyniki są zapisywane według rozmiaru i mtime pliku, więc niezmienione pliki nie są ponownie odczytywane.
+        """
+        cache = {}
+        if self._exists(self.durations_file):
+            try:
+                with open(self._resolve(self.durations_file), 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading duration cache: {e}"))
+
+        errors = []
+        entries = {}
+        to_read = []
+        for disc_name in disc_names:
+            ogg_file = self._resolve(self.sounds_dir / f"{disc_name}.ogg")
+            try:
+                file_stat = ogg_file.stat()
+            except OSError:
+                errors.append(f"Cannot read length of [{disc_name}]: missing file [{disc_name}.ogg]")
+                continue
+            cached = cache.get(f"{disc_name}.ogg")
+            if cached and cached.get('mtime') == file_stat.st_mtime_ns and cached.get('size') == file_stat.st_size:
+                entries[disc_name] = cached
+            else:
+                to_read.append((disc_name, ogg_file, file_stat))
+
+        if to_read:
+            def read_info(item: Tuple[str, Path, os.stat_result]) -> Dict:
+                with self.metrics.stage("probe", item[0]):
+                    return AudioUtils.read_ogg_vorbis_info(str(item[1]))
+
+            with ThreadPoolExecutor() as executor:
+                infos = executor.map(read_info, to_read)
+                for (disc_name, ogg_file, file_stat), info in zip(to_read, infos):
+                    if 'error' in info:
+                        errors.append(f"Cannot read length of [{disc_name}]: {info['error']}")
+                        continue
+                    if not info['complete'] or info['samples'] <= 0:
+                        errors.append(f"Cannot read length of [{disc_name}]: Ogg stream has no end of stream page")
+                        continue
+                    entries[disc_name] = cache[f"{disc_name}.ogg"] = {
+                        'mtime': file_stat.st_mtime_ns,
+                        'size': file_stat.st_size,
+                        'samples': info['samples'],
+                        'sample_rate': info['sample_rate'],
+                    }
+            try:
+                self._write_json(self.durations_file, cache)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error saving duration cache: {e}"))
+
+        tick_lengths = {disc_name: AudioUtils.duration_to_ticks(entry['samples'], entry['sample_rate'])
+                        for disc_name, entry in entries.items()}
+        return tick_lengths, errors
+
     def _create_item_json(self, disc_name: str, display_name: str) -> Dict:
         """Tworzy JSON dla itemu płyty muzycznej."""
         return {
@@ -219,7 +946,7 @@ class MusicDiscGenerator:
                     }
                 },
                 "components": {
-                    "minecraft:icon": f"{self.namespace}:music_disc_{disc_name}",
+                    "minecraft:icon": f"{self.namespace}:{self._get_disc_icon(disc_name)}",
                     "minecraft:display_name": {
                         "value": f"§bPersonal Music Compilation\n§7{display_name}"
                     },
@@ -235,11 +962,9 @@ class MusicDiscGenerator:
             print(ConsoleStyle.error(f"File [{self.jukebox_dist_file}] does not exist!"))
             return False
         
-        # Skopiuj plik dist do głównego pliku
-        shutil.copy2(self.jukebox_dist_file, self.jukebox_file)
-        
         try:
-            with open(self.jukebox_file, 'r', encoding='utf-8') as f:
+            # Wczytaj szablon (plik docelowy zapisywany dopiero po sprawdzeniu układu stanów)
+            with open(self.jukebox_dist_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             # Usuń minecraft:cardinal_direction z traits i states
@@ -267,51 +992,37 @@ class MusicDiscGenerator:
                 del permutations[i]
             
             states = data["minecraft:block"]["description"]["states"]
+
+            if self.settings["blockStateEncoding"] == "dense":
+                num_sections = self._update_dense_disc_states(states, disc_names)
+            else:
+                # Aktualizuj sekcje vanilla_disc_X
+                self._update_vanilla_disc_sections(states)
+                num_sections = self._update_custom_disc_sections(states, disc_names)
+
+            # Sprawdź liczbę permutacji bloku
+            if not self._check_block_state_budget(states):
+                return False
+
+            # Zaktualizuj warunki w permutations i sprawdź, czy są równoważne wyglądowi z szablonu
+            empty_material, disc_material = (permutation["components"]["minecraft:material_instances"]
+                                             for permutation in permutations[:2])
+            self._update_permutations_conditions(data)
+            condition_errors = self._check_permutation_conditions(data, disc_names, empty_material, disc_material)
+            if condition_errors:
+                print(ConsoleStyle.error(f"Permutation conditions select a wrong texture for "
+                                         f"[{len(condition_errors)}] states: {', '.join(condition_errors[:10])}"))
+                return False
+            print(ConsoleStyle.success(f"Verified permutation condition with "
+                                       f"[{permutations[0]['condition'].count('q.block_state')}] clauses"))
             
-            # Aktualizuj sekcje vanilla_disc_X
-            self._update_vanilla_disc_sections(states)
-            
-            # Oblicz ile sekcji potrzeba (maksymalnie 15 płyt na sekcję)
-            discs_per_section = 15
-            num_sections = max(1, (len(disc_names) + discs_per_section - 1) // discs_per_section)
-            
-            print(ConsoleStyle.info(f"Creating [{num_sections}] sections for [{len(disc_names)}] discs"))
-            
-            # Usuń wszystkie istniejące sekcje custom_disc_X
-            keys_to_remove = []
-            for key in states.keys():
-                if key.startswith("personal_music_compilation:custom_disc_"):
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del states[key]
-            
-            # Utwórz dynamiczne sekcje
-            for section_num in range(1, num_sections + 1):
-                section_key = f"personal_music_compilation:custom_disc_{section_num}"
-                section_discs = ["none"]
-                
-                # Dodaj płyty do tej sekcji
-                start_idx = (section_num - 1) * discs_per_section
-                end_idx = min(start_idx + discs_per_section, len(disc_names))
-                
-                for i in range(start_idx, end_idx):
-                    disc_identifier = f"{self.namespace}:music_disc_{disc_names[i]}"
-                    section_discs.append(disc_identifier)
-                    print(ConsoleStyle.success(f"Added disc [{disc_identifier}] to jukebox in section {section_num}."))
-                
-                states[section_key] = section_discs
-            
-            # Zaktualizuj warunki w permutations
-            self._update_permutations_conditions(data, num_sections)
-            
-            with open(self.jukebox_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            print(ConsoleStyle.success(f"Updated [{self.jukebox_file}] with {num_sections} sections"))
+            if self._write_output(self.jukebox_file, data):
+                print(ConsoleStyle.success(f"Updated [{self.jukebox_file}] with {num_sections} sections"))
             
             # Zaktualizuj jukeboxManager.js
-            self._update_jukebox_manager_js(num_sections)
+            disc_states = [key.replace(f"{self.namespace}:", "") for key in states
+                           if key != f"{self.namespace}:playing_disc"]
+            self._update_jukebox_manager_js(disc_states)
             
             return True
             
@@ -319,6 +1030,218 @@ class MusicDiscGenerator:
             print(ConsoleStyle.error(f"Error updating [{self.jukebox_file}]: {e}"))
             return False
     
+    def _update_custom_disc_sections(self, states: Dict, disc_names: List[str]) -> int:
+        """Tworzy sekcje custom_disc_X (`discsPerSection` płyt na sekcję) i zwraca liczbę sekcji."""
+        # Oblicz ile sekcji potrzeba
+        discs_per_section = self.settings["discsPerSection"]
+        num_sections = max(1, (len(disc_names) + discs_per_section - 1) // discs_per_section)
+
+        print(ConsoleStyle.info(f"Creating [{num_sections}] sections for [{len(disc_names)}] discs"))
+
+        # Usuń wszystkie istniejące sekcje custom_disc_X
+        keys_to_remove = []
+        for key in states.keys():
+            if key.startswith("personal_music_compilation:custom_disc_"):
+                keys_to_remove.append(key)
+
+        for key in keys_to_remove:
+            del states[key]
+
+        # Utwórz dynamiczne sekcje
+        for section_num in range(1, num_sections + 1):
+            section_key = f"personal_music_compilation:custom_disc_{section_num}"
+            section_discs = ["none"]
+
+            # Dodaj płyty do tej sekcji
+            start_idx = (section_num - 1) * discs_per_section
+            end_idx = min(start_idx + discs_per_section, len(disc_names))
+
+            for i in range(start_idx, end_idx):
+                disc_identifier = f"{self.namespace}:music_disc_{disc_names[i]}"
+                section_discs.append(disc_identifier)
+                print(ConsoleStyle.success(f"Added disc [{disc_identifier}] to jukebox in section {section_num}."))
+
+            states[section_key] = section_discs
+
+        return num_sections
+
+    def _get_disc_identifiers(self, disc_names: List[str]) -> List[str]:
+        """Zwraca identyfikatory wszystkich płyt (vanilla + custom) w kolejności indeksów stanu bloku."""
+        identifiers = []
+        minecraft_discs_file = self.src_dir / "minecraft.music_disc.json"
+        if minecraft_discs_file.exists():
+            try:
+                with open(minecraft_discs_file, 'r', encoding='utf-8') as f:
+                    identifiers.extend(f"minecraft:music_disc_{disc_data['id']}" for disc_data in json.load(f))
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading [{minecraft_discs_file}]: {e}"))
+        identifiers.extend(f"{self.namespace}:music_disc_{disc_name}" for disc_name in disc_names)
+        return identifiers
+
+    def _get_dense_layout(self, disc_count: int, previous: Optional[Dict[str, int]] = None) -> Optional[Dict[str, int]]:
+        """
+        Rozmieszczenie płyt w stanach disc_bank/disc_section/disc_slot.
+        Indeks płyty = (bank * sectionsPerBank + section - 1) * slotsPerSection + slot.
+        Planer wybiera układ z najmniejszą liczbą permutacji (sekcje + 1) * sloty * banki; przy "auto" z pełnymi
+        sekcjami (16 slotów), a kilka banków tylko z pełnymi bankami, żeby układ mógł rosnąć do największej pojemności.
+        Z układem `previous` tylko go powiększa, nie zmieniając stanów zapisanych płyt: liczba slotów zostaje,
+        sekcji może przybyć tylko przy jednym banku, a banków - zawsze. Zwraca None, gdy układu nie da się powiększyć.
+        """
+        slot_options = [self.MAX_STATE_VALUES]
+        section_options = range(1, self.DENSE_SECTIONS_PER_BANK + 1)
+        min_banks = 1
+        if previous:
+            slot_options = [previous["slotsPerSection"]]
+            min_banks = previous["banks"]
+            if min_banks > 1:
+                section_options = [previous["sectionsPerBank"]]
+            else:
+                section_options = range(previous["sectionsPerBank"], self.DENSE_SECTIONS_PER_BANK + 1)
+        elif self.settings["slotsPerSection"] != "auto":
+            slot_options = [self.settings["slotsPerSection"]]
+
+        best = None
+        for slots_per_section in slot_options:
+            for sections_per_bank in section_options:
+                banks = max(min_banks, math.ceil(disc_count / (slots_per_section * sections_per_bank)))
+                if banks > self.MAX_STATE_VALUES or (banks > 1 and sections_per_bank < self.DENSE_SECTIONS_PER_BANK):
+                    continue
+                # Przy remisie mniej banków (mniej stanów), potem więcej slotów (mniej sekcji)
+                cost = ((sections_per_bank + 1) * slots_per_section * banks, banks, -slots_per_section)
+                if best is None or cost < best[0]:
+                    best = (cost, {
+                        "slotsPerSection": slots_per_section,
+                        "sectionsPerBank": sections_per_bank,
+                        "banks": banks,
+                    })
+        if best is None:
+            if previous:
+                return None
+            raise ValueError(f"Too many discs [{disc_count}] for dense block state encoding")
+        return best[1]
+
+    def _get_state_plan(self, disc_identifiers: List[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Zwraca układ stanów dense i stałe indeksy płyt (identyfikator -> indeks) zapisane w .disc_state_index.json.
+        Nowa płyta dostaje kolejny wolny indeks, usunięta zostawia lukę (jej indeks nie jest używany ponownie), a układ
+        jest tylko powiększany - płyta w postawionej szafie grającej nie zmienia się po dodaniu lub usunięciu innej płyty.
+        """
+        if self.state_plan is not None:
+            return self.state_plan
+
+        stored = {}
+        if self.state_index_file.exists():
+            try:
+                with open(self.state_index_file, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+            except Exception as e:
+                print(ConsoleStyle.warning(f"Error loading disc state indices: {e}"))
+        indices = dict(stored.get("discs", {}))
+        layout = stored.get("layout")
+        next_index = max(indices.values(), default=-1) + 1
+        for identifier in disc_identifiers:
+            if identifier not in indices:
+                indices[identifier] = next_index
+                next_index += 1
+
+        slots_per_section = self.settings["slotsPerSection"]
+        if layout and slots_per_section not in ("auto", layout["slotsPerSection"]):
+            print(ConsoleStyle.warning(f"Setting [slotsPerSection] changed from [{layout['slotsPerSection']}] to "
+                                       f"[{slots_per_section}] - jukeboxes placed with a disc will show another disc"))
+            layout = None
+        planned = self._get_dense_layout(next_index, layout) if layout else None
+        if not planned:
+            planned = self._get_dense_layout(next_index)
+            if layout:
+                print(ConsoleStyle.warning(f"Dense block state layout cannot grow to [{next_index}] disc indices - "
+                                           f"planned a new layout, jukeboxes placed with a disc will show another disc"))
+        layout = planned
+
+        self._write_json(self.state_index_file, {"layout": layout, "discs": indices})
+        self.state_plan = (layout, indices)
+        return self.state_plan
+
+    @staticmethod
+    def _count_block_permutations(states: Dict) -> int:
+        """Liczba permutacji bloku - iloczyn liczby wartości wszystkich stanów."""
+        permutations = 1
+        for values in states.values():
+            if isinstance(values, dict):
+                permutations *= values["values"]["max"] - values["values"]["min"] + 1
+            else:
+                permutations *= len(values)
+        return permutations
+
+    def _check_block_state_budget(self, states: Dict) -> bool:
+        """Wypisuje prognozę permutacji i pamięci dla układu stanów bloku; odrzuca układ ponad budżet."""
+        permutations = self._count_block_permutations(states)
+        budget = self.settings["permutationBudget"]
+        over_budget = permutations > budget
+        memory_kb = permutations * self.PERMUTATION_MEMORY_ESTIMATE / 1024
+
+        ConsoleStyle.print_stats([
+            Stat("Block state encoding", self.settings["blockStateEncoding"]),
+            Stat("Block states", ", ".join(
+                f"{key.split(':', 1)[-1]} [{self._count_block_permutations({key: values})}]"
+                for key, values in states.items())),
+            Stat("Projected permutations", f"[{permutations}]", "error" if over_budget else "success"),
+            Stat("Permutation budget", f"[{budget}]"),
+            Stat("Estimated client memory", f"~[{memory_kb:.0f}] KB"),
+        ], "Block state plan", '-', icon="🧮")
+
+        if over_budget:
+            print(ConsoleStyle.error(f"Jukebox block state layout needs [{permutations}] permutations, "
+                                     f"budget is [{budget}]. Use the dense encoding or a larger budget."))
+        return not over_budget
+
+    def _get_disc_states(self, disc_identifiers: List[str]) -> List[Dict]:
+        """Zwraca wartości stanów bloku dla każdego indeksu płyty (indeks → {stan: wartość})."""
+        disc_states = []
+        if self.settings["blockStateEncoding"] == "dense":
+            layout, indices = self._get_state_plan(disc_identifiers)
+            slots_per_section = layout["slotsPerSection"]
+            bank_size = layout["sectionsPerBank"] * slots_per_section
+            for identifier in disc_identifiers:
+                index = indices[identifier]
+                values = {
+                    f"{self.namespace}:disc_section": index % bank_size // slots_per_section + 1,
+                    f"{self.namespace}:disc_slot": index % slots_per_section,
+                }
+                if layout["banks"] > 1:
+                    values[f"{self.namespace}:disc_bank"] = index // bank_size
+                disc_states.append(values)
+        else:
+            # Ten sam podział co w _update_vanilla_disc_sections i _update_custom_disc_sections
+            discs_per_section = self.settings["discsPerSection"]
+            positions = {}
+            for identifier in disc_identifiers:
+                section_prefix = "vanilla_disc" if identifier.startswith("minecraft:") else "custom_disc"
+                position = positions.get(section_prefix, 0)
+                positions[section_prefix] = position + 1
+                disc_states.append({
+                    f"{self.namespace}:{section_prefix}_{position // discs_per_section + 1}": identifier
+                })
+        return disc_states
+
+    def _update_dense_disc_states(self, states: Dict, disc_names: List[str]) -> int:
+        """Zastępuje sekcje vanilla_disc_X/custom_disc_X stanami całkowitymi disc_section, disc_slot i disc_bank."""
+        for key in list(states.keys()):
+            if key.startswith((f"{self.namespace}:vanilla_disc_", f"{self.namespace}:custom_disc_",
+                               f"{self.namespace}:disc_")):
+                del states[key]
+
+        disc_identifiers = self._get_disc_identifiers(disc_names)
+        disc_count = len(disc_identifiers)
+        layout, _ = self._get_state_plan(disc_identifiers)
+        states[f"{self.namespace}:disc_section"] = {"values": {"min": 0, "max": layout["sectionsPerBank"]}}
+        states[f"{self.namespace}:disc_slot"] = {"values": {"min": 0, "max": layout["slotsPerSection"] - 1}}
+        if layout["banks"] > 1:
+            states[f"{self.namespace}:disc_bank"] = {"values": {"min": 0, "max": layout["banks"] - 1}}
+
+        print(ConsoleStyle.info(f"Encoding [{disc_count}] discs in [{layout['banks']}] banks of "
+                                f"[{layout['sectionsPerBank']}] sections with [{layout['slotsPerSection']}] slots"))
+        return layout["sectionsPerBank"] * layout["banks"]
+
     def _update_vanilla_disc_sections(self, states: Dict):
         """Aktualizuje sekcje vanilla_disc_1 i vanilla_disc_2 na podstawie minecraft.music_disc.json."""
         minecraft_discs_file = self.src_dir / "minecraft.music_disc.json"
@@ -340,8 +1263,8 @@ class MusicDiscGenerator:
             for key in keys_to_remove:
                 del states[key]
             
-            # Podziel płyty vanilla na sekcje (maksymalnie 15 na sekcję)
-            discs_per_section = 15
+            # Podziel płyty vanilla na sekcje (`discsPerSection` na sekcję)
+            discs_per_section = self.settings["discsPerSection"]
             vanilla_discs = []
             
             for disc_data in minecraft_discs_data:
@@ -373,32 +1296,130 @@ class MusicDiscGenerator:
             print(ConsoleStyle.error(f"Error updating vanilla sections: {e}"))
 
     @staticmethod
-    def _update_permutations_conditions(data: Dict, num_sections: int):
-        """Aktualizuje warunki w permutations, aby uwzględnić wszystkie sekcje custom_disc_X."""
-        permutations = data["minecraft:block"]["permutations"]
-
-        # Warunek dla pustego jukebox (wszystkie sekcje == 'none')
-        empty_condition_parts = [
-            "q.block_state('personal_music_compilation:vanilla_disc_1') == 'none'",
-            "q.block_state('personal_music_compilation:vanilla_disc_2') == 'none'"
-        ]
+    def _update_permutations_conditions(data: Dict):
+        """
+        Ustawia najtańszy warunek permutacji szafy z płytą i przenosi wygląd pustej szafy do komponentów bazowych.
+        Warunek sprawdza tylko stany przechowujące płytę: `disc_section` (dense) albo sekcje, w których są płyty.
+        """
+        block = data["minecraft:block"]
+        permutations = block["permutations"]
 
-        # Warunek dla grającego jukebox (przynajmniej jedna sekcja != 'none')
-        playing_condition_parts = [
-            "q.block_state('personal_music_compilation:vanilla_disc_1') != 'none'",
-            "q.block_state('personal_music_compilation:vanilla_disc_2') != 'none'"
-        ]
+        disc_condition_parts = []
+        for key, values in block["description"]["states"].items():
+            state_name = key.split(":", 1)[-1]
+            if state_name == "disc_section":
+                disc_condition_parts.append(f"q.block_state('{key}') != {values['values']['min']}")
+            elif state_name.startswith(("vanilla_disc_", "custom_disc_")) and len(values) > 1:
+                disc_condition_parts.append(f"q.block_state('{key}') != '{values[0]}'")
 
-        # Dodaj warunki dla wszystkich sekcji custom_disc_X
-        for section_num in range(1, num_sections + 1):
-            section_key = f"personal_music_compilation:custom_disc_{section_num}"
-            empty_condition_parts.append(f"q.block_state('{section_key}') == 'none'")
-            playing_condition_parts.append(f"q.block_state('{section_key}') != 'none'")
+        # Permutacja pustej szafy jest dopełnieniem permutacji z płytą - wystarczą komponenty bazowe
+        empty_permutation = permutations.pop(0)
+        block["components"].update(empty_permutation["components"])
+        permutations[0]["condition"] = " || ".join(disc_condition_parts) or "false"
+
+    @staticmethod
+    def _compile_condition(condition: str):
+        """Kompiluje warunek permutacji (podzbiór Molang) do funkcji przyjmującej słownik wartości stanów."""
+        tokens = []
+        position = 0
+        condition = condition.rstrip()
+        while position < len(condition):
+            match = MusicDiscGenerator.MOLANG_TOKEN_PATTERN.match(condition, position)
+            if not match:
+                raise ValueError(f"Unsupported condition syntax [{condition[position:]}]")
+            position = match.end()
+            if match.group("state") is not None:
+                tokens.append(("state", match.group("state")))
+            elif match.group("string") is not None:
+                tokens.append(("value", match.group("string")))
+            elif match.group("number") is not None:
+                tokens.append(("value", float(match.group("number"))))
+            elif match.group("boolean") is not None:
+                tokens.append(("value", match.group("boolean") == "true"))
+            else:
+                tokens.append(("operator", match.group("operator")))
+        tokens.append(("end", None))
+        index = 0
+
+        def accept(operator):
+            nonlocal index
+            if tokens[index] == ("operator", operator):
+                index += 1
+                return True
+            return False
 
-        # Zaktualizuj pierwsze dwa permutations (pusty i grający jukebox)
-        # if len(permutations) >= 2:
-        permutations[0]["condition"] = " && ".join(empty_condition_parts)
-        permutations[1]["condition"] = " || ".join(playing_condition_parts)
+        def parse_or():
+            operands = [parse_and()]
+            while accept("||"):
+                operands.append(parse_and())
+            return operands[0] if len(operands) == 1 else lambda values: any(o(values) for o in operands)
+
+        def parse_and():
+            operands = [parse_unary()]
+            while accept("&&"):
+                operands.append(parse_unary())
+            return operands[0] if len(operands) == 1 else lambda values: all(o(values) for o in operands)
+
+        def parse_unary():
+            if accept("!"):
+                operand = parse_unary()
+                return lambda values: not operand(values)
+            left = parse_primary()
+            if accept("=="):
+                right = parse_primary()
+                return lambda values: left(values) == right(values)
+            if accept("!="):
+                right = parse_primary()
+                return lambda values: left(values) != right(values)
+            return left
+
+        def parse_primary():
+            nonlocal index
+            if accept("("):
+                expression = parse_or()
+                if not accept(")"):
+                    raise ValueError(f"Missing closing parenthesis in [{condition}]")
+                return expression
+            kind, value = tokens[index]
+            index += 1
+            if kind == "state":
+                return lambda values: values[value]
+            if kind == "value":
+                return lambda values: value
+            raise ValueError(f"Unexpected token [{value}] in [{condition}]")
+
+        compiled = parse_or()
+        if tokens[index][0] != "end":
+            raise ValueError(f"Unexpected token [{tokens[index][1]}] in [{condition}]")
+        return compiled
+
+    def _check_permutation_conditions(self, data: Dict, disc_names: List[str],
+                                      empty_material: Dict, disc_material: Dict) -> List[str]:
+        """
+        Sprawdza równoważność warunków permutacji: dla każdego stanu, który może ustawić skrypt szafy
+        (pusta szafa oraz każda płyta, z `playing_disc` równym false i true), wybrany jest właściwy wygląd.
+        """
+        block = data["minecraft:block"]
+        states = block["description"]["states"]
+        defaults = {key: values["values"]["min"] if isinstance(values, dict) else values[0]
+                    for key, values in states.items()}
+        permutations = [(self._compile_condition(permutation["condition"]), permutation["components"])
+                        for permutation in block["permutations"]]
+
+        identifiers = self._get_disc_identifiers(disc_names)
+        reachable_states = [(None, {})] + list(zip(identifiers, self._get_disc_states(identifiers)))
+        errors = []
+        for identifier, disc_state in reachable_states:
+            expected_material = disc_material if identifier else empty_material
+            for playing in (False, True):
+                values = {**defaults, **disc_state, f"{self.namespace}:playing_disc": playing}
+                components = dict(block["components"])
+                for condition, permutation_components in permutations:
+                    if condition(values):
+                        components.update(permutation_components)
+                if components.get("minecraft:material_instances") != expected_material:
+                    errors.append(f"{identifier or 'empty jukebox'} (playing_disc={str(playing).lower()})")
+        return errors
 
     def _update_sound_definitions(self, disc_names: List[str]):
         """Aktualizuje sound_definitions.json, dodając nowe definicje dźwięków."""
@@ -407,21 +1428,22 @@ class MusicDiscGenerator:
             print(ConsoleStyle.error(f"File [{self.sound_definitions_dist_file}] does not exist!"))
             return False
         
-        # Skopiuj plik dist do głównego pliku
-        shutil.copy2(self.sound_definitions_dist_file, self.sound_definitions_file)
-        
         try:
-            with open(self.sound_definitions_file, 'r', encoding='utf-8') as f:
+            # Wczytaj plik dist (zapis tylko, gdy wynik się zmieni)
+            with open(self.sound_definitions_dist_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             sound_definitions = data["sound_definitions"]
             
+            # Jeden wpis dla każdego unikalnego dźwięku (płyty z identycznym dźwiękiem mają wspólny)
+            sounds = list(dict.fromkeys(self._get_disc_sound(disc_name) for disc_name in disc_names))
+
             # Usuń wszystkie istniejące wpisy 'record.' dla płyt personal_music_compilation:
             to_remove = []
             for key in sound_definitions.keys():
                 if key.startswith("record."):
                     disc_name = key.replace("record.", "")
-                    if disc_name not in disc_names:
+                    if disc_name not in sounds:
                         to_remove.append(key)
             
             for key in to_remove:
@@ -429,7 +1451,8 @@ class MusicDiscGenerator:
                 print(ConsoleStyle.delete(f"Removed sound definition [{key}]"))
             
             # Dodaj nowe wpisy
-            for disc_name in disc_names:
+            volumes = self._get_disc_volumes(sounds)
+            for disc_name in sounds:
                 sound_key = f"record.{disc_name}"
                 if sound_key not in sound_definitions:
                     sound_definitions[sound_key] = {
@@ -442,16 +1465,16 @@ class MusicDiscGenerator:
                                 "load_on_low_memory": True,
                                 "name": f"sounds/items/{disc_name}",
                                 "stream": True,
-                                "volume": 0.50
+                                "volume": volumes[disc_name][0]
                             }
                         ]
                     }
                     print(ConsoleStyle.success(f"Added sound definition [{sound_key}]"))
+                else:
+                    sound_definitions[sound_key]["sounds"][0]["volume"] = volumes[disc_name][0]
             
-            with open(self.sound_definitions_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            print(ConsoleStyle.success(f"Updated [{self.sound_definitions_file}]"))
+            if self._write_output(self.sound_definitions_file, data):
+                print(ConsoleStyle.success(f"Updated [{self.sound_definitions_file}]"))
             return True
             
         except Exception as e:
@@ -465,11 +1488,9 @@ class MusicDiscGenerator:
             print(ConsoleStyle.error(f"File [{self.item_texture_dist_file}] does not exist!"))
             return False
         
-        # Skopiuj plik dist do głównego pliku
-        shutil.copy2(self.item_texture_dist_file, self.item_texture_file)
-        
         try:
-            with open(self.item_texture_file, 'r', encoding='utf-8') as f:
+            # Wczytaj plik dist (zapis tylko, gdy wynik się zmieni)
+            with open(self.item_texture_dist_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             texture_data = data["texture_data"]
@@ -486,19 +1507,21 @@ class MusicDiscGenerator:
                 del texture_data[key]
                 print(ConsoleStyle.delete(f"Removed texture entry [{key}]"))
             
-            # Dodaj nowe wpisy
-            for disc_name in disc_names:
-                texture_key = f"{self.namespace}:music_disc_{disc_name}"
+            # Dodaj nowe wpisy (w trybie shared jeden wpis dla każdej unikalnej ikony)
+            icons = list(dict.fromkeys(self._get_disc_icon(disc_name) for disc_name in disc_names))
+            for icon in icons:
+                texture_key = f"{self.namespace}:{icon}"
                 if texture_key not in texture_data:
                     texture_data[texture_key] = {
-                        "textures": f"textures/items/music_disc_{disc_name}"
+                        "textures": f"textures/items/{icon}"
                     }
                     print(ConsoleStyle.success(f"Added texture definition [{texture_key}]"))
+            if len(icons) < len(disc_names):
+                print(ConsoleStyle.info(f"Shared [{len(icons)}] icon textures between [{len(disc_names)}] discs "
+                                        f"([{len(disc_names) - len(icons)}] files fewer)"))
 
-            with open(self.item_texture_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            print(ConsoleStyle.success(f"Updated [{self.item_texture_file}]"))
+            if self._write_output(self.item_texture_file, data):
+                print(ConsoleStyle.success(f"Updated [{self.item_texture_file}]"))
             return True
             
         except Exception as e:
@@ -509,20 +1532,21 @@ class MusicDiscGenerator:
         """Usuwa pliki dla płyt, które nie są przetworzone z src/."""
         ConsoleStyle.print_section("Cleaning old files")
 
-        # Sprawdź istniejące pliki dźwięków
+        # Sprawdź istniejące pliki dźwięków (plik wspólny dla kilku płyt zostaje, dopóki używa go któraś płyta)
         if self.sounds_dir.exists():
+            used_sounds = {self._get_disc_sound(disc_name) for disc_name in current_disc_names}
             for sound_file in self.sounds_dir.glob("*.ogg"):
                 sound_name = sound_file.stem
-                if sound_name not in current_disc_names:
-                    sound_file.unlink()
+                if sound_name not in used_sounds:
+                    self._remove_output(sound_file)
                     print(ConsoleStyle.delete(f"Removed old sound file [{sound_file.name}]."))
         
-        # Sprawdź istniejące tekstury
+        # Sprawdź istniejące tekstury (ikona wspólna dla kilku płyt zostaje, dopóki używa jej któraś płyta)
         if self.textures_dir.exists():
+            used_icons = {self._get_disc_icon(disc_name) for disc_name in current_disc_names}
             for texture_file in self.textures_dir.glob("music_disc_*.png"):
-                texture_name = texture_file.stem.replace("music_disc_", "")
-                if texture_name not in current_disc_names:
-                    texture_file.unlink()
+                if texture_file.stem not in used_icons:
+                    self._remove_output(texture_file)
                     print(ConsoleStyle.delete(f"Removed old texture [{texture_file.name}]."))
         
         # Usuń nadmiarowe pliki itemów
@@ -530,135 +1554,284 @@ class MusicDiscGenerator:
             for item_file in self.items_dir.glob("music_disc_*.item.json"):
                 item_name = item_file.stem.replace("music_disc_", "").replace(".item", "")
                 if item_name not in current_disc_names:
-                    item_file.unlink()
+                    self._remove_output(item_file)
                     print(ConsoleStyle.delete(f"Removed redundant item file [{item_file.name}]."))
 
-    def _update_jukebox_manager_js(self, num_sections: int):
-        """Aktualizuje `jukeboxManager.js` z dynamicznymi sekcjami `custom_disc_X`."""
+    def _update_jukebox_manager_js(self, disc_states: List[str]):
+        """Dodaje `jukeboxManager.js` ze stanami bloku przechowującymi płytę do plików renderowanych z szablonów."""
         if not self.jukebox_manager_dist_file.exists():
             print(ConsoleStyle.error(f"Template file [{self.jukebox_manager_dist_file}] does not exist!"))
             return
         
-        # Wczytaj szablon
-        with open(self.jukebox_manager_dist_file, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # Generuj definicje `custom_disc_X`
-        custom_disc_states = []
-        custom_disc_states_array = []
-        
-        for i in range(1, num_sections + 1):
-            custom_disc_states.append(f'    JukeboxStates["Custom_Disc_{i}"] = "{self.namespace}:custom_disc_{i}";')
-            custom_disc_states_array.append(f'    JukeboxStates.Custom_Disc_{i}')
+        # Definicje stanów (`vanilla_disc_X`/`custom_disc_X` lub `disc_section`/`disc_slot`/`disc_bank`)
+        dense_encoding = self.settings["blockStateEncoding"] == "dense"
+        disc_state_definitions = [{
+            "enumName": '_'.join(part.capitalize() for part in state.split('_')),
+            "state": f"{self.namespace}:{state}",
+        } for state in disc_states]
         
-        # Zastąp placeholdery
-        template_content = template_content.replace('{{CUSTOM_DISC_STATES}}', '\n'.join(custom_disc_states))
-
-        # Zastąp placeholdery
-        if num_sections == 0:
-            template_content = template_content.replace('{{CUSTOM_DISC_STATES_ARRAY}}', '')
-        else:
-            template_content = template_content.replace('{{CUSTOM_DISC_STATES_ARRAY}}', ',\n' + ',\n'.join(custom_disc_states_array))
-        
-        # Zapisz wygenerowany plik
-        with open(self.jukebox_manager_file, 'w', encoding='utf-8') as f:
-            f.write(template_content)
-        
-        print(ConsoleStyle.success(f"Updated [{self.jukebox_manager_file}] with {num_sections} custom_disc_X sections"))
-
-    def _update_music_discs_js(self, disc_names: List[str]):
-        """Aktualizuje musicDiscs.js z nowymi płytami."""
-        ConsoleStyle.print_section("Updating disc list")
+        self.render_jobs[self.jukebox_manager_file] = (self.jukebox_manager_dist_file, {
+            "MUSIC_DISC_LOOKUPS": self.MUSIC_DISC_LOOKUPS,
+            "DISC_STATES": disc_state_definitions,
+            "DISC_STATES_ARRAY": [] if dense_encoding else [state["enumName"] for state in disc_state_definitions],
+            "DENSE_ENCODING": dense_encoding,
+            "SHARED_PLAYER_PASS": self.settings["jukeboxTickMode"] == "shared",
+            "JUKEBOX_TICK_BUDGET": self.settings["jukeboxTickBudget"],
+        })
 
+    def _iter_vanilla_discs(self) -> Iterator[Tuple]:
+        """Płyty vanilla z minecraft.music_disc.json jako (identyfikator, tytuł, artysta, głośność, tickLength, None)."""
         # Ścieżka do pliku minecraft.music_disc.json
         minecraft_discs_file = self.src_dir / "minecraft.music_disc.json"
+        if not minecraft_discs_file.exists():
+            print(ConsoleStyle.warning(f"File [{minecraft_discs_file}] does not exist, skipping vanilla discs"))
+            return
+        try:
+            with open(minecraft_discs_file, 'r', encoding='utf-8') as f:
+                minecraft_discs_data = json.load(f)
+        except Exception as e:
+            print(ConsoleStyle.error(f"Error loading [{minecraft_discs_file}]: {e}"))
+            return
+
+        # Dodaj płytę vanilla z pliku JSON
+        for disc_data in minecraft_discs_data:
+            disc_id = disc_data["id"]
+            music_name = disc_data["musicName"]
+            artist = disc_data["artist"]
+            tick_length = disc_data["tickLength"]
+
+            print(ConsoleStyle.success(f"Added disc [minecraft:music_disc_{disc_id}] ({artist} - {music_name}) to list."))
+            yield f"minecraft:music_disc_{disc_id}", music_name, artist, 1, tick_length, None
+
+    def _iter_catalog_entries(self, disc_names: List[str], catalog: Optional[Dict[str, Dict]],
+                              volumes: Dict[str, Tuple[float, float]],
+                              tick_lengths: Dict[str, int]) -> Iterator[Tuple[str, Dict]]:
+        """Metadane płyt biblioteki (wpisy .disc_catalog.json) wyliczane kolejno dla każdej płyty."""
+        for disc_name in disc_names:
+            if catalog is not None:
+                yield disc_name, catalog[disc_name]
+                continue
+            # Wyciągnij artystę i tytuł z nazwy pliku źródłowego
+            artist, title = self._get_artist_and_title(disc_name)
+            sound = self._get_disc_sound(disc_name)
+            yield disc_name, {
+                "title": title,
+                "artist": artist,
+                "volume": volumes[sound][1],
+                "tickLength": tick_lengths[sound],
+                "icon": self._get_disc_icon(disc_name),
+                "sound": sound,
+                "audio": self._get_disc_audio_key(disc_name),
+            }
+
+    @staticmethod
+    def _dump_catalog(f: TextIO, entries: Iterable[Tuple[str, Dict]]):
+        """Zapisuje wpisy katalogu płyt kolejno jako obiekt JSON (ten sam wynik co json.dump z indent=4)."""
+        separator = "{\n    "
+        for disc_name, entry in entries:
+            f.write(separator)
+            f.write(json.dumps(disc_name, ensure_ascii=False))
+            f.write(": ")
+            f.write(json.dumps(entry, indent=4, ensure_ascii=False).replace("\n", "\n    "))
+            separator = ",\n    "
+        f.write("{}" if separator.startswith("{") else "\n}")
+
+    def _iter_disc_records(self, disc_names: List[str],
+                           entries: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple]:
+        """Płyty vanilla i biblioteki jako (identyfikator, tytuł, artysta, głośność, tickLength, wspólny dźwięk lub None)."""
+        yield from self._iter_vanilla_discs()
+        for disc_name, entry in entries:
+            # Dźwięk innej płyty (identyczne audio) - w przeciwnym razie record.<nazwa płyty>
+            sound = entry.get("sound", disc_name)
+
+            print(ConsoleStyle.success(f"Added disc [personal_music_compilation:music_disc_{disc_name}] ({entry['artist']} - {entry['title']}) to list."))
+            yield (f"{self.namespace}:music_disc_{disc_name}", entry["title"], entry["artist"],
+                   entry["volume"], entry["tickLength"], None if sound == disc_name else sound)
+
+    def _update_music_discs_js(self, disc_names: List[str], catalog: Optional[Dict[str, Dict]] = None):
+        """
+        Aktualizuje musicDiscs.js z nowymi płytami (układ kolumnowy z tablicą artystów).
+        Z `catalog` (metadane z .disc_catalog.json) nie odczytuje ponownie plików MP3 ani OGG.
+        Wpisy katalogu są wyliczane raz i zasilają .disc_catalog.json oraz moduły z metadanymi; każdy moduł jest
+        zapisywany zaraz po zebraniu swoich płyt, więc tekst modułów nie jest składany dla całej biblioteki naraz.
+        """
+        ConsoleStyle.print_section("Updating disc list")
 
         try:
-            minecraft_discs_array = []
-            custom_disc_array = []
-            
-            # Wczytaj dane z minecraft.music_disc.json
-            if minecraft_discs_file.exists():
-                try:
-                    with open(minecraft_discs_file, 'r', encoding='utf-8') as f:
-                        minecraft_discs_data = json.load(f)
-                    
-                    # Dodaj płytę vanilla z pliku JSON
-                    for disc_data in minecraft_discs_data:
-                        disc_id = disc_data["id"]
-                        music_name = disc_data["musicName"]
-                        artist = disc_data["artist"]
-                        tick_length = disc_data["tickLength"]
-                        
-                        minecraft_discs_array.append(f'    "minecraft:music_disc_{disc_id}": {{\n'
-                                                   f'        musicName: "{music_name}",\n'
-                                                   f'        artist: "{artist}",\n'
-                                                   f'        sound: {{\n'
-                                                   f'            volume: 1,\n'
-                                                   f'            id: "record.{disc_id}",\n'
-                                                   f'            tickLength: {tick_length}\n'
-                                                   f'        }}\n'
-                                                   f'    }}')
-                        
-                        print(ConsoleStyle.success(f"Added disc [minecraft:music_disc_{disc_id}] ({artist} - {music_name}) to list."))
-                        
-                except Exception as e:
-                    print(ConsoleStyle.error(f"Error loading [{minecraft_discs_file}]: {e}"))
-            else:
-                print(ConsoleStyle.warning(f"File [{minecraft_discs_file}] does not exist, skipping vanilla discs"))
-            
-            # Dodaj nowe wpisy personal_music_compilation:
-            for disc_name in disc_names:
-                # Wyciągnij artystę i tytuł z nazwy pliku MP3
-                artist, title = self._get_artist_and_title_from_mp3(disc_name)
-                
-                # Oblicz tickLength z pliku OGG
-                ogg_file = self.sounds_dir / f"{disc_name}.ogg"
-                tick_length = 3000  # domyślna wartość
-                
-                if ogg_file.exists():
-                    try:
-                        # Użyj ffprobe do pobrania długości
-                        cmd = [
-                            "ffprobe", "-v", "quiet", "-show_entries", 
-                            "format=duration", "-of", "csv=p=0", str(ogg_file)
-                        ]
-                        result = subprocess.run(cmd, capture_output=True, text=True)
-                        if result.returncode == 0:
-                            duration = float(result.stdout.strip())
-                            # Konwertuj sekundy na ticki (20 ticków na sekundę)
-                            tick_length = int(duration * 20)
-                    except Exception as e:
-                        print(ConsoleStyle.warning(f"Cannot calculate duration for [{disc_name}]: {e}"))
-                
-                # Dodaj nowy wpis
-                custom_disc_array.append(f'    "personal_music_compilation:music_disc_{disc_name}": {{\n'
-                                         f'        musicName: "{title}",\n'
-                                         f'        artist: "{artist}",\n'
-                                         f'        sound: {{\n'
-                                         f'            volume: 1,\n'
-                                         f'            id: "record.{disc_name}",\n'
-                                         f'            tickLength: {tick_length}\n'
-                                         f'        }}\n'
-                                         f'    }}')
-
-                print(ConsoleStyle.success(f"Added disc [personal_music_compilation:music_disc_{disc_name}] ({artist} - {title}) to list."))
-
-            # Połącz wszystkie płyty (vanilla + custom)
-            all_discs = minecraft_discs_array + custom_disc_array
-            
-            # Zapisz wygenerowany plik
-            with open(self.music_discs_file, 'w', encoding='utf-8') as f:
-                all_discs_string = '\n'.join(all_discs)
-                newline = '\n'
-                content = f"export const musicDiscs = {{{newline}{all_discs_string}{newline}}};"
-                f.write(content)
-
-            print(ConsoleStyle.success(f"Updated [{self.music_discs_file}]"))
+            volumes, tick_lengths = {}, {}
+            if catalog is None:
+                sounds = list(dict.fromkeys(self._get_disc_sound(disc_name) for disc_name in disc_names))
+                volumes = self._get_disc_volumes(sounds)
+                tick_lengths, tick_errors = self._get_tick_lengths(sounds)
+                if tick_errors:
+                    for error in tick_errors:
+                        print(ConsoleStyle.error(error))
+                    print(ConsoleStyle.error(f"Cannot update [{self.music_discs_file}] without exact disc lengths"))
+                    return False
+            # Wpisy katalogu wyliczane raz (artysta i tytuł, ikona, dźwięk) dla .disc_catalog.json i modułów z metadanymi
+            entries = list(self._iter_catalog_entries(disc_names, catalog, volumes, tick_lengths))
+            self._write_stream(self.catalog_file, lambda f: self._dump_catalog(f, entries))
+
+            # Metadane w modułach po catalogShardSize kolejnych płyt, zapisanych jako tekst JSON parsowany przy pierwszym użyciu
+            records = self._iter_disc_records(disc_names, entries)
+            shard_size = self.settings["catalogShardSize"]
+            disc_identifiers = []
+            shards = []
+            shard_files = set()
+            while True:
+                shard_discs = list(itertools.islice(records, shard_size)) if shard_size else list(records)
+                if not shard_discs:
+                    break
+                first_index = len(disc_identifiers)
+                disc_identifiers.extend(disc[0] for disc in shard_discs)
+                # Internowanie artystów - każdy artysta zapisany raz w module, w kolumnie tylko indeks
+                artists = {}
+                for disc in shard_discs:
+                    artists.setdefault(disc[2], len(artists))
+                columns = {
+                    "artists": list(artists),
+                    "musicName": [disc[1] for disc in shard_discs],
+                    "artist": [artists[disc[2]] for disc in shard_discs],
+                    "volume": [disc[3] for disc in shard_discs],
+                    "tickLength": [disc[4] for disc in shard_discs],
+                }
+                # Kolumna dźwięków tylko w modułach z płytami korzystającymi z dźwięku innej płyty
+                if any(disc[5] for disc in shard_discs):
+                    columns["sound"] = [disc[5] for disc in shard_discs]
+                shard_file = self.music_discs_file.with_name(f"musicDiscShard_{len(shards)}.js")
+                self._render_output(shard_file, self.music_disc_shard_dist_file, {
+                    "FIRST_INDEX": first_index,
+                    "LAST_INDEX": first_index + len(shard_discs) - 1,
+                    "COLUMNS": json.dumps(columns, ensure_ascii=False, separators=(',', ':')),
+                })
+                shard_files.add(shard_file)
+                shards.append({"module": shard_file.stem})
+                if not shard_size:
+                    break
+
+            # Stany bloku jako pary (indeks nazwy stanu, wartość); układ stanów i stałe indeksy tylko dla kodowania dense
+            layout, state_indices = None, None
+            if self.settings["blockStateEncoding"] == "dense":
+                layout, indices = self._get_state_plan(disc_identifiers)
+                state_indices = [indices[identifier] for identifier in disc_identifiers]
+            state_names = {}
+            disc_state_pairs = []
+            for values in self._get_disc_states(disc_identifiers):
+                pairs = []
+                for state, value in values.items():
+                    pairs.extend((state_names.setdefault(state, len(state_names)), value))
+                disc_state_pairs.append(pairs)
+
+            self.render_jobs[self.music_discs_file] = (self.music_discs_dist_file, {
+                "SHARDS": shards,
+                "SHARD_SIZE": shard_size or max(len(disc_identifiers), 1),
+                "STATE_NAMES": list(state_names),
+                "DISC_IDS": disc_identifiers,
+                "DISC_STATE_PAIRS": disc_state_pairs,
+                "DISC_STATE_LAYOUT": layout,
+                "DISC_STATE_INDICES": state_indices,
+            })
+            self.stale_outputs.extend(
+                shard_file for shard_file in self.music_discs_file.parent.glob("musicDiscShard_*.js")
+                if shard_file not in shard_files)
+            print(ConsoleStyle.success(f"Prepared [{self.music_discs_file.name}] with [{len(disc_identifiers)}] discs "
+                                       f"in [{len(shards)}] shards"))
+            return True
             
         except Exception as e:
             print(ConsoleStyle.error(f"Error updating [{self.music_discs_file}]: {e}"))
+            return False
     
+    def _target(self, path: Path) -> Path:
+        """Ścieżka zapisu nowej wersji pliku (plik tymczasowy bieżącej transakcji)."""
+        return self.transaction.target(path) if self.transaction else path
+
+    def _resolve(self, path: Path) -> Path:
+        """Ścieżka odczytu pliku z uwzględnieniem wersji przygotowanej w bieżącej transakcji."""
+        return self.transaction.resolve(path) if self.transaction else path
+
+    def _exists(self, path: Path) -> bool:
+        """Czy plik istnieje (lub będzie istniał po zatwierdzeniu bieżącej transakcji)."""
+        return self.transaction.exists(path) if self.transaction else path.exists()
+
+    def _write_text(self, path: Path, content: str) -> bool:
+        """Zapisuje plik tekstowy (w transakcji, jeśli jest otwarta), jeśli jego treść się zmieniła."""
+        if self.transaction:
+            with self.metrics.stage("write", self.metrics.current_track):
+                return self.transaction.write_text(path, content)
+        return TemplateEngine.write_if_changed(path, content)
+
+    def _write_stream(self, path: Path, produce: Callable[[TextIO], None]) -> bool:
+        """Zapisuje plik tekstowy fragmentami przez `produce(f)` (w transakcji, jeśli jest otwarta), jeśli treść się zmieniła."""
+        if self.transaction:
+            with self.metrics.stage("write", self.metrics.current_track):
+                return self.transaction.write_stream(path, produce)
+        content = io.StringIO()
+        produce(content)
+        return TemplateEngine.write_if_changed(path, content.getvalue())
+
+    def _write_json(self, path: Path, data) -> bool:
+        """Zapisuje plik JSON strumieniowo (json.dump), jeśli jego treść się zmieniła."""
+        return self._write_stream(path, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+
+    def _write_bytes(self, path: Path, content: bytes) -> bool:
+        """Zapisuje plik binarny (w transakcji, jeśli jest otwarta), jeśli jego treść się zmieniła."""
+        if self.transaction:
+            with self.metrics.stage("write", self.metrics.current_track):
+                return self.transaction.write_bytes(path, content)
+        if path.exists() and path.read_bytes() == content:
+            return False
+        path.write_bytes(content)
+        return True
+
+    def _remove_output(self, path: Path):
+        """Usuwa wygenerowany plik (przy zatwierdzeniu transakcji, jeśli jest otwarta)."""
+        if self.transaction:
+            self.transaction.remove(path)
+        else:
+            path.unlink()
+
+    def _write_output(self, output_file: Path, data: Dict) -> bool:
+        """Zapisuje wygenerowany plik JSON, jeśli jego treść się zmieniła; zwraca True przy zapisie."""
+        changed = self._write_json(output_file, data)
+        self.output_changes[output_file] = changed
+        if not changed:
+            print(ConsoleStyle.info(f"Unchanged [{output_file}]"))
+        return changed
+
+    def _render_output(self, output_file: Path, template_file: Path, context: Dict) -> bool:
+        """Renderuje plik z szablonu fragmentami prosto do pliku wyjściowego; zwraca True, jeśli treść się zmieniła."""
+        changed = self._write_stream(output_file, lambda f: TemplateEngine.render_to(template_file, context, f.write))
+        self.output_changes[output_file] = changed
+        if changed:
+            print(ConsoleStyle.success(f"Rendered [{output_file}]"))
+        else:
+            print(ConsoleStyle.info(f"Unchanged [{output_file}]"))
+        return changed
+
+    def _render_outputs(self) -> bool:
+        """Renderuje wszystkie pliki z szablonów i podsumowuje, które wygenerowane pliki się zmieniły."""
+        ConsoleStyle.print_section("Rendering templates")
+        try:
+            for output_file, (template_file, context) in self.render_jobs.items():
+                self._render_output(output_file, template_file, context)
+        except (OSError, TemplateError) as e:
+            print(ConsoleStyle.error(f"Error rendering templates: {e}"))
+            return False
+        finally:
+            self.render_jobs = {}
+        for output_file in self.stale_outputs:
+            if self._exists(output_file):
+                self._remove_output(output_file)
+                self.output_changes[output_file] = True
+                print(ConsoleStyle.delete(f"Removed stale file [{output_file}]"))
+        self.stale_outputs = []
+
+        changed_files = [output_file.name for output_file, changed in self.output_changes.items() if changed]
+        print(ConsoleStyle.info(f"Changed generated files: [{len(changed_files)}/{len(self.output_changes)}]"
+                                + (f" ({', '.join(changed_files)})" if changed_files else "")))
+        return True
+
     def clear_all(self, specific_file: Optional[str] = None):
         """Usuwa wszystkie wygenerowane pliki lub konkretny plik."""
         if specific_file:
@@ -669,12 +1842,13 @@ class MusicDiscGenerator:
             return self._clear_all_files()
     
     def _remove_config_files(self):
-        """Remove all config files (sound_definitions.json, item_texture.json, jukebox.block.json, musicDiscs.js)."""
+        """Remove all config files (sound_definitions.json, item_texture.json, jukebox.block.json, musicDiscs.js with shards)."""
         config_files = [
             self.sound_definitions_file,
             self.item_texture_file,
             self.jukebox_file,
-            self.music_discs_file
+            self.music_discs_file,
+            *sorted(self.music_discs_file.parent.glob("musicDiscShard_*.js"))
         ]
         for f in config_files:
             if f.exists():
@@ -684,18 +1858,60 @@ class MusicDiscGenerator:
                 except Exception as e:
                     print(ConsoleStyle.error(f"Error removing config file [{f.name}]: {e}"))
 
-    def _regenerate_config_files(self):
-        """Regenerate config files based on current MP3s."""
-        mp3_files = self._get_mp3_files()
-        disc_names = [self._to_snake_case(mp3.name) for mp3 in mp3_files]
+    def _remove_disc_from_config_files(self, disc_name: str):
+        """
+        Usuwa jedną płytę z plików zbiorczych na podstawie .disc_catalog.json - bez skanowania src/ i odczytu plików OGG.
+        Bez katalogu metadanych generuje pliki zbiorcze od nowa.
+        """
+        catalog = self._load_catalog()
+        if catalog is None or not all(self._exists(path) for path in (self.sound_definitions_file, self.item_texture_file)):
+            print(ConsoleStyle.info("No disc catalog from a previous run, regenerating config files"))
+            self._update_config_files(self._get_library_disc_names())
+            return
+        disc_names = [name for name in catalog if name != disc_name]
+
+        # Dźwięk wspólny z inną płytą (identyczne audio) zostaje w sound_definitions.json razem z plikiem OGG
+        removed_entries = []
+        sound = catalog.get(disc_name, {}).get("sound", disc_name)
+        if sound not in {catalog[name].get("sound", name) for name in disc_names}:
+            removed_entries.append((self.sound_definitions_file, "sound_definitions", f"record.{sound}"))
+            sound_file = self.sounds_dir / f"{sound}.ogg"
+            if self._exists(sound_file):
+                self._remove_output(sound_file)
+
+        # Ikona wspólna z inną płytą (tryb shared) zostaje w item_texture.json
+        icon = catalog.get(disc_name, {}).get("icon", f"music_disc_{disc_name}")
+        if icon not in {catalog[name].get("icon", f"music_disc_{name}") for name in disc_names}:
+            removed_entries.append((self.item_texture_file, "texture_data", f"{self.namespace}:{icon}"))
+            icon_file = self.textures_dir / f"{icon}.png"
+            if self._exists(icon_file):
+                self._remove_output(icon_file)
+
+        # Usuń wpisy płyty z sound_definitions.json i item_texture.json
+        for config_file, section, key in removed_entries:
+            with open(self._resolve(config_file), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data[section].pop(key, None) is not None:
+                print(ConsoleStyle.delete(f"Removed [{key}] from [{config_file.name}]"))
+                self._write_output(config_file, data)
+
+        # Stany bloku są przeliczane w pamięci; plik zmienia się tylko wtedy, gdy zmienia się układ sekcji
+        self._update_jukebox_json(disc_names)
+        self._update_music_discs_js(disc_names, catalog)
+        self._render_outputs()
+
+    def _update_config_files(self, disc_names: List[str]):
+        """Generuje wszystkie pliki zbiorcze dla podanych płyt."""
         self._update_sound_definitions(disc_names)
         self._update_item_texture(disc_names)
         self._update_jukebox_json(disc_names)
         self._update_music_discs_js(disc_names)
+        self._render_outputs()
 
     def _clear_specific_file(self, file_name: str) -> int:
         """Usuwa pliki dla konkretnego dysku muzycznego."""
         files_removed = 0
+        self.transaction = OutputTransaction(self.staging_dir)
         
         # Sprawdź czy to jest identyfikator (snake_case) czy nazwa pliku MP3
         if file_name.startswith("music_disc_"):
@@ -705,11 +1921,15 @@ class MusicDiscGenerator:
             # To jest nazwa pliku MP3 - konwertuj do snake_case
             disc_name = self._to_snake_case(file_name)
         
-        # Usuń plik dźwięku OGG
+        # Usuń plik dźwięku OGG (plik używany także przez inną płytę zostaje)
         ogg_file = self.sounds_dir / f"{disc_name}.ogg"
-        if ogg_file.exists():
+        sharing = [name for name, entry in (self._load_catalog() or {}).items()
+                   if name != disc_name and entry.get("sound", name) == disc_name]
+        if sharing:
+            print(ConsoleStyle.info(f"Kept sound file [{ogg_file.name}] used by {ConsoleStyle.format_list(sharing)}"))
+        elif ogg_file.exists():
             try:
-                ogg_file.unlink()
+                self._remove_output(ogg_file)
                 print(ConsoleStyle.delete(f"Removed sound file [{ogg_file.name}]"))
                 files_removed += 1
             except Exception as e:
@@ -719,7 +1939,7 @@ class MusicDiscGenerator:
         texture_file = self.textures_dir / f"music_disc_{disc_name}.png"
         if texture_file.exists():
             try:
-                texture_file.unlink()
+                self._remove_output(texture_file)
                 print(ConsoleStyle.delete(f"Removed texture [{texture_file.name}]"))
                 files_removed += 1
             except Exception as e:
@@ -729,7 +1949,7 @@ class MusicDiscGenerator:
         item_file = self.items_dir / f"music_disc_{disc_name}.item.json"
         if item_file.exists():
             try:
-                item_file.unlink()
+                self._remove_output(item_file)
                 print(ConsoleStyle.delete(f"Removed item file [{item_file.name}]"))
                 files_removed += 1
             except Exception as e:
@@ -739,8 +1959,15 @@ class MusicDiscGenerator:
             print(ConsoleStyle.success(f"Removed [{files_removed}] files for [{file_name}]"))
         else:
             print(ConsoleStyle.info(f"No files found for [{file_name}]"))
-        # Regenerate config files after single removal
-        self._regenerate_config_files()
+        # Usuń płytę z plików zbiorczych i zapisz wszystkie zmiany razem
+        try:
+            self._remove_disc_from_config_files(disc_name)
+            self.transaction.commit()
+        except BaseException:
+            self.transaction.rollback()
+            raise
+        finally:
+            self.transaction = None
         return files_removed
     
     def _clear_all_files(self) -> int:
@@ -777,15 +2004,15 @@ class MusicDiscGenerator:
                 except Exception as e:
                     print(ConsoleStyle.error(f"Error removing [{item_file.name}]: {e}"))
         
-        # Usuń plik sum kontrolnych
-        checksums_file = self.project_root / ".ogg_checksums.json"
-        if checksums_file.exists():
-            try:
-                checksums_file.unlink()
-                print(ConsoleStyle.delete(f"Removed checksums file [{checksums_file.name}]"))
-                files_removed += 1
-            except Exception as e:
-                print(ConsoleStyle.error(f"Error removing [{checksums_file.name}]: {e}"))
+        # Usuń pliki sum kontrolnych i pomiarów głośności
+        for checksums_file in (self.checksums_file, self.loudness_file, self.durations_file, self.catalog_file):
+            if checksums_file.exists():
+                try:
+                    checksums_file.unlink()
+                    print(ConsoleStyle.delete(f"Removed checksums file [{checksums_file.name}]"))
+                    files_removed += 1
+                except Exception as e:
+                    print(ConsoleStyle.error(f"Error removing [{checksums_file.name}]: {e}"))
         
         if files_removed > 0:
             print(ConsoleStyle.success(f"Removed [{files_removed}] files"))
@@ -796,7 +2023,7 @@ class MusicDiscGenerator:
         return files_removed
 
     def process_mp3_files(self, specific_file: Optional[str] = None):
-        """Główna funkcja przetwarzająca pliki MP3."""
+        """Główna funkcja przetwarzająca pliki audio z src/ (MP3, FLAC, WAV, M4A/AAC, Opus, OGG)."""
         ConsoleStyle.print_section("Minecraft Music Disc Generator")
         
         # Sprawdź, czy ffmpeg jest dostępny
@@ -807,95 +2034,207 @@ class MusicDiscGenerator:
             print(ConsoleStyle.info("Install ffmpeg: https://ffmpeg.org/download.html"))
             sys.exit(1)
         
-        mp3_files = self._get_mp3_files(specific_file)
-        if not mp3_files:
-            print(ConsoleStyle.error("No MP3 files found to process!"))
+        source_files = self._get_source_files(specific_file)
+        if not source_files:
+            print(ConsoleStyle.error("No audio files found to process!"))
             return
         
+        self.metrics = RunMetrics(len(source_files))
+
+        # Wszystkie pliki są zapisywane w jednej transakcji - przerwany przebieg nie zmienia niczego w BP/ i RP/
+        self.transaction = OutputTransaction(self.staging_dir)
+        try:
+            processed_disc_names, errors, commit_errors = self._generate_disc_files(source_files, specific_file)
+            if commit_errors:
+                self.transaction.rollback()
+                errors.extend(commit_errors)
+                print(ConsoleStyle.error("Generated files were not saved - BP/ and RP/ are unchanged"))
+            else:
+                with self.metrics.stage("write"):
+                    committed = self.transaction.commit()
+                print(ConsoleStyle.success(f"Saved [{len(committed)}] changed files"))
+        except BaseException:
+            self.transaction.rollback()
+            raise
+        finally:
+            self.transaction = None
+
+        # Podsumowanie
+        self._print_run_report()
+        ConsoleStyle.print_summary(len(processed_disc_names), len(source_files), errors)
+        
+        if processed_disc_names:
+            print(ConsoleStyle.info(f"New discs: {', '.join(processed_disc_names)}"))
+    
+    def _track_progress(self, source_files: List[Path]) -> Iterator[Path]:
+        """Zwraca kolejne pliki źródłowe, mierząc czas każdej płyty; po płycie wypisuje postęp, ETA i krotność czasu rzeczywistego."""
+        for source_file in source_files:
+            disc_name = self._to_snake_case(source_file.name)
+            self.metrics.start_track(disc_name)
+            yield source_file
+            print(ConsoleStyle.process(self.metrics.finish_track(disc_name)))
+
+    def _print_run_report(self):
+        """Wypisuje czasy etapów i najwolniejsze płyty oraz zapisuje raport JSON przebiegu (ustawienie runReport)."""
+        limit = self.settings["runReportSlowestTracks"]
+        report = self.metrics.report(limit)
+        table = [
+            Stat("Wall time", f"[{report['wall_seconds']:.1f}] s"),
+            Stat("CPU time", f"[{report['cpu_seconds']['total']:.1f}] s (generator [{report['cpu_seconds']['process']:.1f}] s, "
+                             f"ffmpeg [{report['cpu_seconds']['children']:.1f}] s, [{report['cpu_utilization']:.2f}]x wall)"),
+            Stat("Audio", f"[{AudioUtils.format_duration(report['audio_seconds'])}] "
+                          f"([{report['realtime_factor']:.1f}]x realtime)"),
+            Stat("Stages", ", ".join(f"{stage} [{seconds:.2f}] s" for stage, seconds in report['stages'].items())),
+        ]
+        for timing in report['slowest_tracks'][:3]:
+            table.append(Stat(f"Slow: {timing['track']}", f"[{timing['seconds']:.2f}] s (" + ", ".join(
+                f"{stage} [{seconds:.2f}] s" for stage, seconds in timing['stages'].items()) + ")"))
+        ConsoleStyle.print_stats(table, "Run timings")
+
+        if self.settings["runReport"]:
+            report_file = self.project_root / self.settings["runReport"]
+            try:
+                self.metrics.write_report(str(report_file), limit)
+                print(ConsoleStyle.info(f"Saved run report [{report_file.name}]"))
+            except OSError as e:
+                print(ConsoleStyle.warning(f"Cannot save run report [{report_file}]: {e}"))
+
+    def _generate_disc_files(self, source_files: List[Path],
+                             specific_file: Optional[str] = None) -> Tuple[List[str], List[str], List[str]]:
+        """Generuje pliki płyt i pliki zbiorcze; zwraca przetworzone płyty, błędy płyt i błędy plików zbiorczych."""
         processed_disc_names = []
         errors = []
-        
-        for i, mp3_file in enumerate(mp3_files, 1):
+        # Błędy plików zbiorczych - transakcja nie jest zatwierdzana
+        commit_errors = []
+        # Klucz dźwięku -> płyta z plikiem OGG; z --file także pozostałe płyty biblioteki z poprzedniego przebiegu
+        audio_owners = {}
+        if specific_file:
+            processed_names = {self._to_snake_case(source_file.name) for source_file in source_files}
+            for name, entry in (self._load_catalog() or {}).items():
+                if name not in processed_names and entry.get("audio"):
+                    audio_owners.setdefault(entry["audio"], entry.get("sound", name))
+
+        for i, source_file in enumerate(self._track_progress(source_files), 1):
             print(ConsoleStyle.divider('-'))
-            print(ConsoleStyle.process(f"Processing [{mp3_file.name}] ({i}/{len(mp3_files)})"))
+            print(ConsoleStyle.process(f"Processing [{source_file.name}] ({i}/{len(source_files)})"))
             
             # Konwertuj nazwę pliku do snake_case
-            disc_name = self._to_snake_case(mp3_file.name)
-            display_name = mp3_file.stem  # Oryginalna nazwa bez rozszerzenia
+            disc_name = self._to_snake_case(source_file.name)
+            display_name = source_file.stem  # Oryginalna nazwa bez rozszerzenia
             
             print(ConsoleStyle.info(f"Disc name: {disc_name}"))
             print(ConsoleStyle.info(f"Display name: {display_name}"))
+
+            # Format rozpoznany z nagłówka pliku
+            source_format = self._get_source_format(source_file)
+            if source_format is None:
+                error_msg = f"Unsupported audio format of {source_file.name}"
+                print(ConsoleStyle.error(error_msg))
+                errors.append(error_msg)
+                continue
+            print(ConsoleStyle.info(f"Source format: {source_format}"))
             
             try:
+                # Wyciągnij artwork (przed plikiem itemu, który wskazuje teksturę ikony)
+                with self.metrics.stage("artwork", disc_name):
+                    self._extract_artwork(source_file, disc_name)
+
                 # Utwórz plik itemu
                 item_file = self.items_dir / f"music_disc_{disc_name}.item.json"
                 item_data = self._create_item_json(disc_name, display_name)
                 
-                with open(item_file, 'w', encoding='utf-8') as f:
-                    json.dump(item_data, f, indent=4, ensure_ascii=False)
+                self._write_text(item_file, json.dumps(item_data, indent=4, ensure_ascii=False))
                 print(ConsoleStyle.success(f"Created item: {item_file.name}"))
                 
-                # Konwertuj MP3 do OGG
+                # Płyta z tym samym dźwiękiem co wcześniejsza korzysta z jej pliku OGG i wpisu w sound_definitions.json
+                audio_key = self._get_audio_key(source_file, disc_name)
+                track = self._get_track(disc_name)
+                track.audio_key = audio_key
+                owner = audio_owners.get(audio_key)
+                if owner is not None:
+                    track.sound = owner
+                    print(ConsoleStyle.info(f"Same audio as [{owner}], sharing [{owner}.ogg]"))
+                    processed_disc_names.append(disc_name)
+                    continue
+
+                # Konwertuj plik źródłowy do OGG
                 ogg_file = self.sounds_dir / f"{disc_name}.ogg"
-                if self._convert_mp3_to_ogg(mp3_file, ogg_file):
+                track.sound = disc_name
+                if self._convert_to_ogg(source_file, ogg_file):
+                    audio_owners[audio_key] = disc_name
                     processed_disc_names.append(disc_name)
                 
-                # Wyciągnij artwork
-                texture_file = self.textures_dir / f"music_disc_{disc_name}.png"
-                self._extract_artwork(mp3_file, texture_file)
-                
             except Exception as e:
-                error_msg = f"Error processing {mp3_file.name}: {e}"
+                error_msg = f"Error processing {source_file.name}: {e}"
                 print(ConsoleStyle.error(error_msg))
                 errors.append(error_msg)
-        
+
+        # Raport rozmiarów i czasów kodowania według profili
+        self._print_encoding_report()
+
+        # Z --file pozostałe płyty biblioteki zostają bez zmian - pliki zbiorcze obejmują całą bibliotekę
+        disc_names = self._get_library_disc_names(processed_disc_names) if specific_file else processed_disc_names
+        self._print_deduplication_report(disc_names)
+
         # Aktualizuj pliki konfiguracyjne
         if processed_disc_names:
 
             # Aktualizuj sound_definitions.json
-            self._update_sound_definitions(processed_disc_names)
+            if not self._update_sound_definitions(disc_names):
+                commit_errors.append(f"Cannot update [{self.sound_definitions_file.name}]")
 
             # Aktualizuj item_texture.json
-            self._update_item_texture(processed_disc_names)
+            if not self._update_item_texture(disc_names):
+                commit_errors.append(f"Cannot update [{self.item_texture_file.name}]")
 
             # Aktualizuj jukebox.json
-            self._update_jukebox_json(processed_disc_names)
+            if not self._update_jukebox_json(disc_names):
+                commit_errors.append(f"Cannot update [{self.jukebox_file.name}]")
 
         # Czyszczenie starych plików
-        self._cleanup_old_files(processed_disc_names)
+        self._cleanup_old_files(disc_names)
 
         # Aktualizuj musicDiscs.js
-        self._update_music_discs_js(processed_disc_names)
+        if not self._update_music_discs_js(disc_names):
+            commit_errors.append(f"Cannot update [{self.music_discs_file.name}]")
 
-        # Podsumowanie
-        ConsoleStyle.print_summary(len(processed_disc_names), len(mp3_files), errors)
-        
-        if processed_disc_names:
-            print(ConsoleStyle.info(f"New discs: {', '.join(processed_disc_names)}"))
-    
-    def _get_artist_and_title_from_mp3(self, disc_name: str) -> Tuple[str, str]:
-        """Wyciąga artystę i tytuł z pliku MP3 na podstawie nazwy płyty."""
-        mp3_files = list(self.src_dir.glob("*.mp3"))
+        # Wyrenderuj jukeboxManager.js i musicDiscs.js
+        if not self._render_outputs():
+            commit_errors.append("Cannot render templates")
+
+        return processed_disc_names, errors, commit_errors
+
+    def _get_artist_and_title(self, disc_name: str) -> Tuple[str, str]:
+        """Wyciąga artystę i tytuł z nazwy pliku źródłowego płyty."""
         artist = "Unknown_Artist"
         title = disc_name.replace("_", " ").title()
         
-        for mp3_file in mp3_files:
-            if self._to_snake_case(mp3_file.name) == disc_name:
-                # Wyciągnij artystę i tytuł z nazwy pliku
-                file_name = mp3_file.stem
-                if " - " in file_name:
-                    artist_part, title_part = file_name.split(" - ", 1)
-                    artist = artist_part.strip()
-                    title = title_part.strip()
-                break
+        source_file = self._find_source_files().get(disc_name)
+        if source_file:
+            # Wyciągnij artystę i tytuł z nazwy pliku
+            file_name = source_file.stem
+            if " - " in file_name:
+                artist_part, title_part = file_name.split(" - ", 1)
+                artist = artist_part.strip()
+                title = title_part.strip()
         
         return artist, title
 
 def main():
     """Główna funkcja skryptu."""
     parser = argparse.ArgumentParser(description="Generator Płyt Muzycznych dla Minecraft")
-    parser.add_argument("--file", "-f", help="Konwertuj konkretny plik MP3 z katalogu src/")
+    parser.add_argument("--file", "-f", help="Konwertuj konkretny plik audio z katalogu src/")
     parser.add_argument("--clear", "-c", action="store_true", help="Clean all generated files")
+    parser.add_argument("--encoding", choices=MusicDiscGenerator.BLOCK_STATE_ENCODINGS,
+                        help="Block state encoding of the jukebox disc (overrides config.json)")
+    parser.add_argument("--tick-mode", choices=MusicDiscGenerator.JUKEBOX_TICK_MODES,
+                        help="Player proximity pass of jukebox ticks (overrides config.json)")
+    parser.add_argument("--tick-budget", type=int,
+                        help="Maximum jukeboxes handled per game tick, 0 = unlimited (overrides config.json)")
+    parser.add_argument("--profile",
+                        help="Encoding profile of all discs from encodingProfiles (overrides config.json)")
+    parser.add_argument("--report",
+                        help="Path of the JSON run report with stage timings, empty to disable (overrides config.json)")
     args = parser.parse_args()
     
     # Sprawdź, czy jesteśmy w katalogu projektu
@@ -905,7 +2244,13 @@ def main():
         print(ConsoleStyle.error("BP and RP directories not found! Make sure you are in the project directory."))
         return
 
-    generator = MusicDiscGenerator(project_root)
+    generator = MusicDiscGenerator(project_root, {
+        "blockStateEncoding": args.encoding,
+        "jukeboxTickMode": args.tick_mode,
+        "jukeboxTickBudget": args.tick_budget,
+        "encodingProfile": args.profile,
+        "runReport": args.report,
+    })
 
     if args.clear:
         # Usuń wskazany plik lubwszystkie pliki
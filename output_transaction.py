@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Transakcyjny zapis wygenerowanych plików: pliki są przygotowywane w katalogu tymczasowym, a przy zatwierdzeniu
+synchronizowane na dysk (fsync) i atomowo podmieniane (os.replace). Usunięcia nieaktualnych plików są częścią
+tej samej transakcji, więc przerwany przebieg nie zostawia obciętych ani częściowo zapisanych plików.
+"""
+import filecmp
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, TextIO
+
+
+class OutputTransaction:
+    """Zbiór plików przygotowanych do atomowej podmiany w BP/ i RP/"""
+
+    def __init__(self, staging_root: Path):
+        # Katalog tymczasowy musi leżeć na tym samym systemie plików co pliki docelowe (os.replace)
+        staging_root.mkdir(parents=True, exist_ok=True)
+        self.staging_dir = Path(tempfile.mkdtemp(prefix="run-", dir=staging_root))
+        self.staged: Dict[Path, Path] = {}
+        self.stream_count = 0
+        # Słownik zamiast listy: sprawdzenie przynależności w O(1) przy zachowaniu kolejności usuwania
+        self.removed: Dict[Path, None] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def target(self, path: Path) -> Path:
+        """Ścieżka pliku tymczasowego, do którego należy zapisać nową wersję `path` (z zachowaniem rozszerzenia)"""
+        path = Path(path)
+        if path not in self.staged:
+            self.staged[path] = self.staging_dir / f"{len(self.staged)}-{path.name}"
+        self.removed.pop(path, None)
+        return self.staged[path]
+
+    def resolve(self, path: Path) -> Path:
+        """Ścieżka do odczytu: wersja przygotowana w transakcji lub plik docelowy"""
+        staged = self.staged.get(Path(path))
+        return staged if staged is not None and staged.exists() else Path(path)
+
+    def exists(self, path: Path) -> bool:
+        """Czy plik będzie istniał po zatwierdzeniu transakcji"""
+        return Path(path) not in self.removed and self.resolve(path).exists()
+
+    def write_text(self, path: Path, content: str) -> bool:
+        """Przygotowuje nową treść pliku; zwraca False, jeśli jest taka sama jak obecna"""
+        try:
+            with open(self.resolve(path), 'r', encoding='utf-8', newline='') as f:
+                if f.read() == content and Path(path) not in self.removed:
+                    return False
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+        with open(self.target(path), 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return True
+
+    def write_bytes(self, path: Path, content: bytes) -> bool:
+        """Przygotowuje nową treść pliku binarnego; zwraca False, jeśli jest taka sama jak obecna"""
+        try:
+            with open(self.resolve(path), 'rb') as f:
+                if f.read() == content and Path(path) not in self.removed:
+                    return False
+        except FileNotFoundError:
+            pass
+        with open(self.target(path), 'wb') as f:
+            f.write(content)
+        return True
+
+    def write_stream(self, path: Path, produce: Callable[[TextIO], None]) -> bool:
+        """
+        Przygotowuje plik tekstowy zapisywany fragmentami przez `produce(f)` - treść nie jest składana w pamięci.
+        Zwraca False, jeśli jest taka sama jak obecna (porównanie plików blokami).
+        """
+        path = Path(path)
+        current = self.resolve(path)
+        # Osobny plik - bieżąca wersja może być już przygotowana w tej transakcji. Zwykłe open() zamiast mkstemp
+        # (tryb 0600), aby podmieniony plik miał uprawnienia wg umask, jak pliki z write_text i write_bytes
+        self.stream_count += 1
+        stream_file = self.staging_dir / f"stream-{self.stream_count}-{path.name}"
+        try:
+            with open(stream_file, 'x', encoding='utf-8', newline='') as f:
+                produce(f)
+            if path not in self.removed and current.exists() and filecmp.cmp(stream_file, current, shallow=False):
+                stream_file.unlink()
+                return False
+            os.replace(stream_file, self.target(path))
+        except BaseException:
+            if stream_file.exists():
+                stream_file.unlink()
+            raise
+        return True
+
+    def remove(self, path: Path):
+        """Usuwa plik przy zatwierdzeniu transakcji"""
+        path = Path(path)
+        staged = self.staged.pop(path, None)
+        if staged is not None and staged.exists():
+            staged.unlink()
+        self.removed[path] = None
+
+    @staticmethod
+    def _fsync_directory(directory: Path):
+        """Synchronizuje wpis katalogu (POSIX); na systemach bez tej możliwości pomija"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def commit(self) -> List[Path]:
+        """Zapisuje przygotowane pliki na dysk, podmienia je atomowo i usuwa nieaktualne; zwraca zmienione ścieżki"""
+        staged = [(path, staged) for path, staged in self.staged.items() if staged.exists()]
+        for path, staged_file in staged:
+            with open(staged_file, 'rb') as f:
+                os.fsync(f.fileno())
+        directories = set()
+        for path, staged_file in staged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_file, path)
+            directories.add(path.parent)
+        removed = []
+        for path in self.removed:
+            if path.exists():
+                path.unlink()
+                removed.append(path)
+                directories.add(path.parent)
+        for directory in directories:
+            self._fsync_directory(directory)
+        self.rollback()
+        return [path for path, _ in staged] + removed
+
+    def rollback(self):
+        """Porzuca wszystkie przygotowane pliki"""
+        self.staged = {}
+        self.removed = {}
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
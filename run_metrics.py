@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Pomiary przebiegu generatora: czasy etapów (hash, convert, artwork, probe, write) dla każdego utworu, linia postępu
+z szacowanym czasem do końca (ETA) i krotnością czasu rzeczywistego oraz raport JSON z najwolniejszymi utworami
+i czasem CPU względem czasu rzeczywistego.
+
+Metody `stage`, `record` i `finish_track` są bezpieczne wątkowo - wykonawcy równolegli (ThreadPoolExecutor, asyncio
+z run_in_executor) mogą zgłaszać do jednego obiektu czasy mierzone w wątkach roboczych.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from audio_utils import AudioUtils
+
+
+class TrackTiming:
+    """Czasy jednego utworu"""
+
+    __slots__ = ('name', 'stages', 'audio_seconds', 'started', 'wall_seconds')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: Dict[str, float] = {}
+        self.audio_seconds = 0.0
+        self.started = time.perf_counter()
+        self.wall_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'track': self.name,
+            'seconds': round(self.wall_seconds, 3),
+            'audio_seconds': round(self.audio_seconds, 3),
+            'stages': {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+        }
+
+
+class RunMetrics:
+    """Liczniki czasu przebiegu generatora"""
+
+    STAGES = ('hash', 'convert', 'artwork', 'probe', 'write')
+
+    def __init__(self, total_tracks: int = 0):
+        self.total_tracks = total_tracks
+        self.tracks: Dict[str, TrackTiming] = {}
+        # Etapy niezwiązane z jednym utworem (pliki zbiorcze, zatwierdzenie transakcji)
+        self.run_stages: Dict[str, float] = {}
+        self.finished = 0
+        self.audio_seconds = 0.0
+        # Utwór przetwarzany w pętli głównej (etapy bez jawnie podanego utworu w wątku głównym)
+        self.current_track: Optional[str] = None
+        self.listeners: List[Callable[[Optional[str], str, float], None]] = []
+        self._lock = threading.Lock()
+        # Stos zagnieżdżonych etapów wątku - etap nadrzędny liczy tylko własny czas
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._children_started = self._children_cpu()
+
+    @staticmethod
+    def _children_cpu() -> float:
+        """Czas CPU zakończonych procesów potomnych (ffmpeg)"""
+        times = os.times()
+        return times.children_user + times.children_system
+
+    def add_listener(self, listener: Callable[[Optional[str], str, float], None]):
+        """Dodaje odbiorcę każdego pomiaru etapu (utwór lub None, etap, sekundy), np. dla zewnętrznego wykonawcy"""
+        self.listeners.append(listener)
+
+    def start_track(self, track: str) -> TrackTiming:
+        """Rozpoczyna pomiar czasu utworu"""
+        with self._lock:
+            timing = self.tracks[track] = TrackTiming(track)
+        self.current_track = track
+        return timing
+
+    def record(self, stage: str, seconds: float, track: Optional[str] = None):
+        """Dodaje zmierzony czas etapu utworu (lub całego przebiegu, gdy `track` to None)"""
+        with self._lock:
+            if track is None:
+                stages = self.run_stages
+            else:
+                timing = self.tracks.get(track)
+                if timing is None:
+                    timing = self.tracks[track] = TrackTiming(track)
+                stages = timing.stages
+            stages[stage] = stages.get(stage, 0.0) + seconds
+        for listener in self.listeners:
+            listener(track, stage, seconds)
+
+    @contextmanager
+    def stage(self, stage: str, track: Optional[str] = None) -> Iterator[None]:
+        """
+        Mierzy czas bloku kodu jako etap utworu. Czas etapów zagnieżdżonych (np. zapis pliku podczas artwork)
+        jest odejmowany od etapu nadrzędnego, więc suma etapów nie liczy niczego dwa razy.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.record(stage, elapsed - nested, track)
+
+    def add_audio(self, track: str, seconds: float):
+        """Zapisuje długość dźwięku utworu (do krotności czasu rzeczywistego)"""
+        with self._lock:
+            timing = self.tracks.get(track)
+            if timing is not None:
+                timing.audio_seconds += seconds
+            self.audio_seconds += seconds
+
+    def finish_track(self, track: str) -> str:
+        """Kończy pomiar utworu; zwraca linię postępu"""
+        with self._lock:
+            timing = self.tracks.get(track)
+            if timing is not None:
+                timing.wall_seconds = time.perf_counter() - timing.started
+            self.finished += 1
+        if self.current_track == track:
+            self.current_track = None
+        return self.progress_line()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def progress_line(self) -> str:
+        """Linia postępu: utwory, procent, czas, ETA i krotność czasu rzeczywistego"""
+        elapsed = self.elapsed()
+        total = max(self.total_tracks, self.finished)
+        line = f"Progress [{self.finished}/{total}]"
+        if total:
+            line += f" [{self.finished * 100 // total}]%"
+        line += f", elapsed [{AudioUtils.format_duration(elapsed)}]"
+        if self.finished and total > self.finished:
+            remaining = elapsed / self.finished * (total - self.finished)
+            line += f", ETA [{AudioUtils.format_duration(remaining)}]"
+        if self.audio_seconds and elapsed:
+            line += f", [{self.audio_seconds / elapsed:.1f}]x realtime"
+        return line
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Łączne czasy etapów (utwory i cały przebieg); etapy z wątków roboczych są sumowane jak czas CPU"""
+        totals = dict.fromkeys(self.STAGES, 0.0)
+        with self._lock:
+            for stages in [timing.stages for timing in self.tracks.values()] + [self.run_stages]:
+                for stage, seconds in stages.items():
+                    totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def slowest_tracks(self, limit: int = 10) -> List[TrackTiming]:
+        with self._lock:
+            timings = list(self.tracks.values())
+        return sorted(timings, key=lambda timing: timing.wall_seconds, reverse=True)[:limit]
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Raport przebiegu: czas rzeczywisty i CPU (proces i ffmpeg), etapy oraz najwolniejsze utwory"""
+        wall = self.elapsed()
+        process_cpu = time.process_time() - self._cpu_started
+        children_cpu = self._children_cpu() - self._children_started
+        return {
+            'tracks': self.total_tracks,
+            'finished': self.finished,
+            'wall_seconds': round(wall, 3),
+            'cpu_seconds': {
+                'process': round(process_cpu, 3),
+                'children': round(children_cpu, 3),
+                'total': round(process_cpu + children_cpu, 3),
+            },
+            'cpu_utilization': round((process_cpu + children_cpu) / wall, 3) if wall else 0.0,
+            'audio_seconds': round(self.audio_seconds, 3),
+            'realtime_factor': round(self.audio_seconds / wall, 3) if wall else 0.0,
+            'stages': {stage: round(seconds, 3) for stage, seconds in self.stage_totals().items()},
+            'run_stages': {stage: round(seconds, 3) for stage, seconds in self.run_stages.items()},
+            'slowest_tracks': [timing.to_dict() for timing in self.slowest_tracks(limit)],
+        }
+
+    def write_report(self, path: str, limit: int = 10) -> Dict[str, Any]:
+        """Zapisuje raport JSON przebiegu"""
+        report = self.report(limit)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        return report
@@ -1,18 +1,21 @@
-import { EquipmentSlot, EntityEquippableComponent, GameMode, system, ItemStack, BlockInventoryComponent } from '@minecraft/server';
-import { musicDiscs } from '../musicDisc/musicDiscs';
+import { EquipmentSlot, EntityEquippableComponent, GameMode, system, world, ItemStack, BlockInventoryComponent } from '@minecraft/server';
+import { {{#each MUSIC_DISC_LOOKUPS separator=", "}}{{.}}{{/each}} } from '../musicDisc/musicDiscs';
 import { randomNum, randomWholeNum } from '../math/randomNumbers';
 
 var JukeboxStates;
 (function (JukeboxStates) {
     JukeboxStates["Playing_Disc"] = "personal_music_compilation:playing_disc";
-    JukeboxStates["Vanilla_Disc_1"] = "personal_music_compilation:vanilla_disc_1";
-    JukeboxStates["Vanilla_Disc_2"] = "personal_music_compilation:vanilla_disc_2";
-{{CUSTOM_DISC_STATES}}
+{{#each DISC_STATES}}
+    JukeboxStates[{{enumName|js}}] = {{state|js}};
+{{/each}}
 })(JukeboxStates || (JukeboxStates = {}));
 
+const DENSE_ENCODING = {{DENSE_ENCODING|js}};
+const SHARED_PLAYER_PASS = {{SHARED_PLAYER_PASS|js}};
+const JUKEBOX_TICK_BUDGET = {{JUKEBOX_TICK_BUDGET|js}};
+
 const states = [
-    JukeboxStates.Vanilla_Disc_1,
-    JukeboxStates.Vanilla_Disc_2{{CUSTOM_DISC_STATES_ARRAY}}
+{{#each DISC_STATES_ARRAY separator=",\n"}}    JukeboxStates.{{.}}{{/each}}
 ];
 
 var HopperLocations;
@@ -28,19 +31,105 @@ function debug(message){
 	console.log(`[DEBUG] ${message}`);
 }
 
-const playingJukeboxes = {};
+// dimension.id -> Map(packed location -> disc id) of jukeboxes with a playing disc
+const activeJukeboxes = new Map();
+
+function getActiveJukeboxes(dimension) {
+    let registry = activeJukeboxes.get(dimension.id);
+    if (!registry) {
+        registry = new Map();
+        activeJukeboxes.set(dimension.id, registry);
+    }
+    return registry;
+}
+
+// x and z in [-2^21, 2^21) and y in [-64, 448) pack into one safe integer (44 + 9 bits)
+function packLocation(location) {
+    const x = location.x + 2097152;
+    const z = location.z + 2097152;
+    const y = location.y + 64;
+    if (x < 0 || x >= 4194304 || z < 0 || z >= 4194304 || y < 0 || y >= 512)
+        return `${location.x},${location.y},${location.z}`;
+    return (x * 4194304 + z) * 512 + y;
+}
+
+// Per game tick: one player pass shared by all jukeboxes and the number of jukebox ticks already run
+let currentTick = -1;
+let playersByDimension = new Map();
+let jukeboxTicks = 0;
+// Keys of jukeboxes already run in this game tick (a deferred jukebox must not run again from its own onTick)
+let ranJukeboxes = new Set();
+
+// Jukeboxes over JUKEBOX_TICK_BUDGET wait here in arrival order ("dimension|packed location" -> block position)
+// and are run first in the next game ticks, so a stable tick order cannot starve the same jukeboxes
+const deferredJukeboxes = new Map();
+
+function refreshTickState() {
+    if (currentTick === system.currentTick)
+        return;
+    currentTick = system.currentTick;
+    jukeboxTicks = 0;
+    ranJukeboxes = new Set();
+    playersByDimension = new Map();
+    if (!SHARED_PLAYER_PASS)
+        return;
+    for (const player of world.getAllPlayers()) {
+        let players = playersByDimension.get(player.dimension.id);
+        if (!players) {
+            players = [];
+            playersByDimension.set(player.dimension.id, players);
+        }
+        players.push({ player: player, location: player.location });
+    }
+}
 
 export class jukeboxManager {
     static jukeboxID = 'personal_music_compilation:jukebox';
     
     static tick(block, dimension) {
+        refreshTickState();
+        if (JUKEBOX_TICK_BUDGET > 0) {
+            this.runDeferredTicks();
+            const key = `${dimension.id}|${packLocation(block.location)}`;
+            if (ranJukeboxes.has(key))
+                return;
+            if (jukeboxTicks >= JUKEBOX_TICK_BUDGET) {
+                if (!deferredJukeboxes.has(key))
+                    deferredJukeboxes.set(key, { dimension: dimension, location: block.location });
+                return;
+            }
+            deferredJukeboxes.delete(key);
+            ranJukeboxes.add(key);
+            jukeboxTicks++;
+        }
+        this.runTick(block, dimension);
+    }
+    
+    static runDeferredTicks() {
+        for (const [key, entry] of deferredJukeboxes) {
+            if (jukeboxTicks >= JUKEBOX_TICK_BUDGET)
+                return;
+            deferredJukeboxes.delete(key);
+            ranJukeboxes.add(key);
+            jukeboxTicks++;
+            let block = undefined;
+            try {
+                block = entry.dimension.getBlock(entry.location);
+            }
+            catch { }
+            if (block && block.typeId == this.jukeboxID)
+                this.runTick(block, entry.dimension);
+        }
+    }
+    
+    static runTick(block, dimension) {
         const center = block.center();
         const players = this.getPlayersInRadius(center, dimension, 40);
         if (!players[0])
             return;
         const isPlayingDisc = block.permutation.getState(JukeboxStates.Playing_Disc);
         if (isPlayingDisc) {
-            if (!playingJukeboxes[`${block.dimension.id}.${JSON.stringify(block.location)}`]) {
+            if (!getActiveJukeboxes(block.dimension).has(packLocation(block.location))) {
                 block.setPermutation(block.permutation.withState(JukeboxStates.Playing_Disc, false));
                 const discData = this.getPlayingDisc(block.permutation);
                 if (discData && discData.data && discData.data.sound) {
@@ -86,7 +175,7 @@ export class jukeboxManager {
                     const item = inv.container.getItem(i);
                     if (!item)
                         continue;
-                    const disc = musicDiscs[item.typeId];
+                    const disc = getMusicDisc(item.typeId);
                     if (!disc)
                         continue;
                     this.playDisc(block, dimension, disc, item.typeId);
@@ -118,7 +207,7 @@ export class jukeboxManager {
                 debug('interactWithJukebox: !disc && !item')
                 return;
             }
-            const discData = musicDiscs[item.typeId];
+            const discData = getMusicDisc(item.typeId);
             if (!discData){
                 debug('interactWithJukebox: !disc && !discData')
                 return;
@@ -139,7 +228,7 @@ export class jukeboxManager {
                 debug(disc.id)
             }
             this.clearDisc(block);
-            delete playingJukeboxes[`${block.dimension.id}.${JSON.stringify(block.location)}`];
+            getActiveJukeboxes(block.dimension).delete(packLocation(block.location));
         }
     }
     
@@ -225,7 +314,7 @@ export class jukeboxManager {
         debug(`playDisc called for: ${discName}`);
         const center = block.center();
         const location = block.location;
-        playingJukeboxes[`${block.dimension.id}.${JSON.stringify(block.location)}`] = true;
+        getActiveJukeboxes(block.dimension).set(packLocation(location), discName);
         
         dimension.playSound(discData.sound.id, center, { volume: discData.sound.volume });
         this.setDisc(block, discName);
@@ -250,20 +339,13 @@ export class jukeboxManager {
                 return;
             if (newBlock.typeId != this.jukeboxID)
                 return;
-            const newDiscData = this.getPlayingDisc(newBlock.permutation);
-            if (!newDiscData){
-                debug('playDisc runTimeout: !newDiscData');
-                return;
-            }
-            if (newDiscData.id != discName){
-                debug('playDisc runTimeout: newDiscData.id != discName');
+            if (!this.isDiscInserted(newBlock.permutation, discName)){
+                debug('playDisc runTimeout: disc changed');
                 return;
             }
             newBlock.setPermutation(newBlock.permutation.withState(JukeboxStates.Playing_Disc, false));
-            delete playingJukeboxes[`${block.dimension.id}.${JSON.stringify(block.location)}`];
-            if (newDiscData.data && newDiscData.data.sound) {
-                this.stopSoundInRadius(newDiscData.data.sound.id, center, dimension, 100);
-            }
+            getActiveJukeboxes(dimension).delete(packLocation(location));
+            this.stopSoundInRadius(discData.sound.id, center, dimension, 100);
         }, discData.sound.tickLength);
     }
     
@@ -275,6 +357,7 @@ export class jukeboxManager {
             debug('breakJukebox: !playingDisc');
             return;
         }
+        getActiveJukeboxes(block.dimension).delete(packLocation(block.location));
         const center = block.center();
         if (playingDisc.id && typeof playingDisc.id === 'string') {
             const item = new ItemStack(playingDisc.id, 1);
@@ -298,18 +381,55 @@ export class jukeboxManager {
 
     
     static getPlayingDisc(permutation) {
+        if (DENSE_ENCODING) {
+            const id = discIdsByStateIndex[this.getDiscIndex(permutation)];
+            return id ? { id: id, data: getMusicDisc(id) } : undefined;
+        }
         let disc = undefined;
         for (const state of states) {
             const data = permutation.getState(state);
             if (data != "none") {
-                disc = { id: data, data: musicDiscs[data] };
+                disc = { id: data, data: getMusicDisc(data) };
                 break;
             }
         }
         return disc;
     }
     
+    static getDiscIndex(permutation) {
+        const section = permutation.getState(JukeboxStates.Disc_Section);
+        if (!section)
+            return -1;
+        const bank = discStateLayout.banks > 1 ? permutation.getState(JukeboxStates.Disc_Bank) : 0;
+        const slot = permutation.getState(JukeboxStates.Disc_Slot);
+        return (bank * discStateLayout.sectionsPerBank + section - 1) * discStateLayout.slotsPerSection + slot;
+    }
+    
+    static isDiscInserted(permutation, id) {
+        const discState = discStates[discIndex[id]];
+        if (!discState)
+            return false;
+        for (const state in discState) {
+            if (permutation.getState(state) !== discState[state])
+                return false;
+        }
+        return true;
+    }
+    
     static getPlayersInRadius(location, dimension, radius) {
+        if (SHARED_PLAYER_PASS) {
+            refreshTickState();
+            const radiusSquared = radius * radius;
+            const players = [];
+            for (const entry of playersByDimension.get(dimension.id) || []) {
+                const dx = entry.location.x - location.x;
+                const dy = entry.location.y - location.y;
+                const dz = entry.location.z - location.z;
+                if (dx * dx + dy * dy + dz * dz <= radiusSquared)
+                    players.push(entry.player);
+            }
+            return players;
+        }
         let players = [];
         players = dimension.getEntities({ location: location, maxDistance: radius, type: "minecraft:player" });
         return players;
@@ -323,6 +443,16 @@ export class jukeboxManager {
     
     static clearDisc(block) {
         debug(`clearDisc for ${block.typeId}[${block.dimension.id}.${JSON.stringify(block.location)}] block`);
+        if (DENSE_ENCODING) {
+            let permutation = block.permutation
+                .withState(JukeboxStates.Playing_Disc, false)
+                .withState(JukeboxStates.Disc_Section, 0)
+                .withState(JukeboxStates.Disc_Slot, 0);
+            if (discStateLayout.banks > 1)
+                permutation = permutation.withState(JukeboxStates.Disc_Bank, 0);
+            block.setPermutation(permutation);
+            return;
+        }
         block.setPermutation(block.permutation.withState("personal_music_compilation:playing_disc", false));
         for (const state of states) {
             block.setPermutation(block.permutation.withState(state, "none"));
@@ -331,13 +461,13 @@ export class jukeboxManager {
     
     static setDisc(block, id) {
         debug(`setDisc: ${id}`);
-        for (const state of states) {
-            block.setPermutation(block.permutation.withState("personal_music_compilation:playing_disc", true));
-            try {
-                block.setPermutation(block.permutation.withState(state, id));
-            }
-            catch { }
-        }
+        const discState = discStates[discIndex[id]];
+        if (!discState)
+            return;
+        let permutation = block.permutation.withState(JukeboxStates.Playing_Disc, true);
+        for (const state in discState)
+            permutation = permutation.withState(state, discState[state]);
+        block.setPermutation(permutation);
     }
     
     static playNotes(location, dimension, playingID) {
@@ -356,10 +486,7 @@ export class jukeboxManager {
                     return;
                 if (block.typeId != jukeboxManager.jukeboxID)
                     return;
-                const playingDisc = jukeboxManager.getPlayingDisc(block.permutation);
-                if (!playingDisc)
-                    return;
-                if (playingDisc.id != playingID)
+                if (!jukeboxManager.isDiscInserted(block.permutation, playingID))
                     return;
                 const center = block.center();
                 try {
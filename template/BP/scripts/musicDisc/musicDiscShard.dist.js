@@ -0,0 +1,2 @@
+// Generated by music_disc_generator.py - metadata of discs {{FIRST_INDEX}}-{{LAST_INDEX}} as a JSON string, parsed on first use
+export const shard = {{COLUMNS|js}};
@@ -0,0 +1,65 @@
+// Generated by music_disc_generator.py - disc index; metadata lives in shard modules parsed on first use
+{{#each SHARDS}}
+import { shard as shard{{@index}} } from './{{module}}';
+{{/each}}
+
+const stateNames = {{STATE_NAMES|js}};
+const discIdColumn = {{DISC_IDS|js}};
+const discStateColumn = {{DISC_STATE_PAIRS|js}};
+const discStateIndexColumn = {{DISC_STATE_INDICES|js}};
+const shardSources = [{{#each SHARDS separator=", "}}shard{{@index}}{{/each}}];
+const shardSize = {{SHARD_SIZE|js}};
+const shardColumns = [];
+const discCache = [];
+
+export const discStateLayout = Object.freeze({{DISC_STATE_LAYOUT|js}});
+export const discIds = Object.freeze(discIdColumn);
+export const discIndex = {};
+export const discStates = [];
+// dense: permanent block state index -> id (indices of removed discs stay unused)
+export const discIdsByStateIndex = {};
+
+for (let index = 0; index < discIds.length; index++) {
+    const id = discIds[index];
+    discIndex[id] = index;
+    if (discStateIndexColumn)
+        discIdsByStateIndex[discStateIndexColumn[index]] = id;
+    const state = {};
+    const pairs = discStateColumn[index];
+    for (let i = 0; i < pairs.length; i += 2)
+        state[stateNames[pairs[i]]] = pairs[i + 1];
+    discStates.push(Object.freeze(state));
+}
+
+Object.freeze(discIndex);
+Object.freeze(discStates);
+Object.freeze(discIdsByStateIndex);
+
+export function getMusicDisc(id) {
+    const index = discIndex[id];
+    if (index === undefined)
+        return undefined;
+    let disc = discCache[index];
+    if (disc)
+        return disc;
+    const shard = Math.floor(index / shardSize);
+    let columns = shardColumns[shard];
+    if (!columns)
+        columns = shardColumns[shard] = JSON.parse(shardSources[shard]);
+    const row = index - shard * shardSize;
+    disc = discCache[index] = Object.freeze({
+        musicName: columns.musicName[row],
+        artist: columns.artists[columns.artist[row]],
+        sound: Object.freeze({
+            volume: columns.volume[row],
+            id: `record.${(columns.sound && columns.sound[row]) || id.slice(id.indexOf(':music_disc_') + 12)}`,
+            tickLength: columns.tickLength[row]
+        })
+    });
+    return disc;
+}
+
+export const musicDiscs = new Proxy({}, {
+    get: (target, id) => getMusicDisc(id),
+    has: (target, id) => discIndex[id] !== undefined
+});
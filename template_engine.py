@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Prosty silnik szablonów dla generowanych plików JS i JSON (pliki `.dist.*` w katalogu template/).
+
+Składnia:
+- `{{NAME}}` - wartość ze słownika kontekstu, `{{NAME|js}}` - wartość jako bezpieczny literał JS/JSON
+- `{{a.b}}` - pole obiektu, `{{.}}` - bieżący element pętli, `{{@index}}` - numer elementu pętli
+- `{{#each NAME}}...{{/each}}` - pętla (opcjonalnie `{{#each NAME separator=", "}}`, separator jako literał JSON)
+- `{{#if NAME}}...{{else}}...{{/if}}` - warunek
+Znaczniki bloków stojące samodzielnie w linii są usuwane razem z tą linią.
+"""
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+
+class TemplateError(ValueError):
+    """Błąd składni szablonu lub brakująca wartość w kontekście"""
+
+
+class TemplateEngine:
+    """Klasa z funkcjami kompilacji i renderowania szablonów"""
+
+    TAG_PATTERN = re.compile(r'\{\{(.*?)\}\}', re.DOTALL)
+    STANDALONE_TAG_PATTERN = re.compile(r'^[ \t]*(\{\{(?:[#/][^}]*|else)\}\})[ \t]*\r?\n', re.MULTILINE)
+    EACH_PATTERN = re.compile(r'#each\s+(\S+)(?:\s+separator=("(?:[^"\\]|\\.)*"))?\s*$')
+    FILTERS = ('raw', 'js')
+    JS_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    # Skompilowane szablony: ścieżka -> (mtime_ns, drzewo węzłów)
+    _cache: Dict[str, Tuple[int, list]] = {}
+
+    @staticmethod
+    def to_js_literal(value: Any) -> str:
+        """Zamienia wartość na bezpieczny literał JS (zwarty JSON z escapowaniem U+2028/U+2029)."""
+        literal = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        return literal.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+    @staticmethod
+    def iter_js_literal(value: Any) -> Iterator[str]:
+        """Jak to_js_literal, ale fragmentami - duże tablice nie są składane w jeden napis."""
+        for chunk in TemplateEngine.JS_ENCODER.iterencode(value):
+            yield chunk.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+    @staticmethod
+    def compile(source: str, name: str = "<template>") -> list:
+        """Parsuje szablon do drzewa węzłów: ('text', s), ('var', ścieżka, filtr), ('each', ...), ('if', ...)"""
+        source = TemplateEngine.STANDALONE_TAG_PATTERN.sub(r'\1', source)
+        root = []
+        stack = [('root', root, None)]
+        position = 0
+        for match in TemplateEngine.TAG_PATTERN.finditer(source):
+            if match.start() > position:
+                stack[-1][1].append(('text', source[position:match.start()]))
+            position = match.end()
+            tag = match.group(1).strip()
+
+            if tag.startswith('#each'):
+                each = TemplateEngine.EACH_PATTERN.match(tag)
+                if not each:
+                    raise TemplateError(f"Invalid loop tag [{tag}] in [{name}]")
+                separator = json.loads(each.group(2)) if each.group(2) else ''
+                node = ('each', each.group(1), separator, [])
+                stack[-1][1].append(node)
+                stack.append(('each', node[3], tag))
+            elif tag.startswith('#if'):
+                node = ('if', tag[3:].strip(), [], [])
+                stack[-1][1].append(node)
+                stack.append(('if', node[2], node))
+            elif tag == 'else':
+                if stack[-1][0] != 'if':
+                    raise TemplateError(f"Unexpected [else] in [{name}]")
+                node = stack.pop()[2]
+                stack.append(('else', node[3], node))
+            elif tag in ('/each', '/if'):
+                if stack[-1][0] not in (('each',) if tag == '/each' else ('if', 'else')):
+                    raise TemplateError(f"Unexpected [{tag}] in [{name}]")
+                stack.pop()
+            else:
+                path, _, filter_name = tag.partition('|')
+                filter_name = filter_name.strip() or 'raw'
+                if filter_name not in TemplateEngine.FILTERS:
+                    raise TemplateError(f"Unknown filter [{filter_name}] in [{name}]")
+                stack[-1][1].append(('var', path.strip(), filter_name))
+        if len(stack) > 1:
+            raise TemplateError(f"Unclosed block [{stack[-1][0]}] in [{name}]")
+        if position < len(source):
+            root.append(('text', source[position:]))
+        return root
+
+    @staticmethod
+    def load(template_path: Union[str, os.PathLike]) -> list:
+        """Zwraca skompilowany szablon z pliku (ponowne parsowanie tylko po zmianie mtime)"""
+        key = os.fspath(template_path)
+        mtime = os.stat(key).st_mtime_ns
+        cached = TemplateEngine._cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(key, 'r', encoding='utf-8') as f:
+            compiled = TemplateEngine.compile(f.read(), key)
+        TemplateEngine._cache[key] = (mtime, compiled)
+        return compiled
+
+    @staticmethod
+    def _resolve(path: str, scopes: List[Dict[str, Any]]) -> Any:
+        """Znajdź wartość ścieżki `a.b` w zakresach (od najbardziej wewnętrznego)"""
+        if path == '.':
+            return scopes[-1]['.']
+        if path.startswith('.'):
+            name, fields = '.', path[1:].split('.')
+        else:
+            name, *fields = path.split('.')
+        for scope in reversed(scopes):
+            if name in scope:
+                value = scope[name]
+                break
+        else:
+            raise TemplateError(f"Missing template value [{path}]")
+        for field in fields:
+            try:
+                value = value[field] if isinstance(value, dict) else getattr(value, field)
+            except (KeyError, AttributeError):
+                raise TemplateError(f"Missing template value [{path}]")
+        return value
+
+    @staticmethod
+    def _render_nodes(nodes: list, scopes: List[Dict[str, Any]], write: Callable[[str], Any], stream: bool = False):
+        for node in nodes:
+            kind = node[0]
+            if kind == 'text':
+                write(node[1])
+            elif kind == 'var':
+                value = TemplateEngine._resolve(node[1], scopes)
+                if node[2] != 'js':
+                    write(str(value))
+                elif stream:
+                    for chunk in TemplateEngine.iter_js_literal(value):
+                        write(chunk)
+                else:
+                    write(TemplateEngine.to_js_literal(value))
+            elif kind == 'each':
+                for index, item in enumerate(TemplateEngine._resolve(node[1], scopes)):
+                    if index and node[2]:
+                        write(node[2])
+                    scope = dict(item) if isinstance(item, dict) else {}
+                    scope['.'] = item
+                    scope['@index'] = index
+                    TemplateEngine._render_nodes(node[3], scopes + [scope], write, stream)
+            elif kind == 'if':
+                branch = node[2] if TemplateEngine._resolve(node[1], scopes) else node[3]
+                TemplateEngine._render_nodes(branch, scopes, write, stream)
+
+    @staticmethod
+    def render_to(template_path: Union[str, os.PathLike], context: Dict[str, Any], write: Callable[[str], Any]):
+        """Renderuje szablon fragmentami do funkcji `write` (np. `f.write`) bez składania całego pliku w pamięci"""
+        TemplateEngine._render_nodes(TemplateEngine.load(template_path), [context], write, stream=True)
+
+    @staticmethod
+    def write_if_changed(output_path: Union[str, os.PathLike], content: str) -> bool:
+        """Zapisuje plik tylko wtedy, gdy treść się zmieniła; zwraca True, jeśli plik został zapisany"""
+        try:
+            with open(output_path, 'r', encoding='utf-8', newline='') as f:
+                if f.read() == content:
+                    return False
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return True
@@ -3,11 +3,19 @@
 Comprehensive verification script for Minecraft Bedrock Addon
 Verifies project structure, files, textures, and build readiness
 """
+import argparse
+
 from minecraft_check import MinecraftUtils
 
 
 def main():
     """Main verification function"""
+    parser = argparse.ArgumentParser(description="Verify Minecraft Bedrock Addon project")
+    parser.add_argument("--format", choices=MinecraftUtils.OUTPUT_FORMATS, default="text",
+                        help="output format (json and junit print a machine-readable report with timings)")
+    parser.add_argument("--fail-fast", action="store_true", help="stop after the first check with errors")
+    args = parser.parse_args()
+
     MinecraftUtils.verification_summary([
         MinecraftUtils.verify_config,
         MinecraftUtils.verify_manifests,
@@ -16,7 +24,8 @@ def main():
         MinecraftUtils.verify_translations,
         MinecraftUtils.verify_blocks,
         MinecraftUtils.verify_textures,
-    ])
+        MinecraftUtils.verify_sounds,
+    ], output_format=args.format, fail_fast=args.fail_fast)
 
 if __name__ == "__main__":
     main()